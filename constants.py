@@ -1,11 +1,18 @@
 # Game Constants
-import pygame
+from optional_pygame import pygame
 
 # Screen dimensions
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Simulation runs at a fixed tick rate; rendering interpolates between ticks
+SIM_TICK_RATE = 60
+MAX_FRAME_TIME = 0.25  # Seconds of backlog simulated after a slow frame before dropping time
+# Fast-forward speeds cycled with G; 0 runs ticks as fast as the CPU allows
+FAST_FORWARD_LEVELS = (1, 4, 16, 64, 0)
+FAST_FORWARD_SLICE = 0.05  # Seconds of uncapped ticking between event polls
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -29,6 +36,17 @@ GHOST_SPEED = 1.0
 # Ghost AI state
 GHOST_AI_STATES = {"CHASE": "CHASE", "FRIGHTENED": "FRIGHTENED", "EATEN": "EATEN", "SCATTER": "SCATTER", "ENRAGED": "ENRAGED"}
 
+# MCTS behavior: simulations per decision, an optional wall-clock budget that replaces them (0: off,
+# which keeps seeded games and replays reproducible) and extra processes searching the same root (0: none)
+MCTS_TIME_BUDGET_MS = 0
+MCTS_ITERATIONS = 50
+MCTS_ROOT_PROCESSES = 0
+
+# Ghost escape search (entities/ai/escape_planner.py): nodes per decision, which keeps seeded games
+# and replays reproducible, and an optional wall-clock cap on top (0: none)
+ESCAPE_NODE_BUDGET = 3000
+ESCAPE_TIME_BUDGET_MS = 0
+
 # Game objects
 PELLET_SIZE = 8
 POWER_PELLET_SIZE = 28  # Adjusted for 40px cells
@@ -39,6 +57,10 @@ POWER_PELLET_POINTS = 32
 DIRECTIONS = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
 
 # Key mappings for two players
-PLAYER1_KEYS = {pygame.K_w: "UP", pygame.K_s: "DOWN", pygame.K_a: "LEFT", pygame.K_d: "RIGHT"}
+if pygame is not None:
+    PLAYER1_KEYS = {pygame.K_w: "UP", pygame.K_s: "DOWN", pygame.K_a: "LEFT", pygame.K_d: "RIGHT"}
 
-PLAYER2_KEYS = {pygame.K_UP: "UP", pygame.K_DOWN: "DOWN", pygame.K_LEFT: "LEFT", pygame.K_RIGHT: "RIGHT"}
+    PLAYER2_KEYS = {pygame.K_UP: "UP", pygame.K_DOWN: "DOWN", pygame.K_LEFT: "LEFT", pygame.K_RIGHT: "RIGHT"}
+else:
+    PLAYER1_KEYS = {}
+    PLAYER2_KEYS = {}
@@ -5,7 +5,9 @@ from constants import *
 
 
 class StarryBackground:
-    def __init__(self, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, num_stars=100):
+    def __init__(self, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, num_stars=100, rng=None):
+        # Separate from the simulation's RNG so the background never changes a game's outcome
+        self.rng = rng if rng is not None else random.Random()
         # Handle if a pygame surface is passed instead of dimensions
         if isinstance(screen_width, pygame.Surface):
             surface = screen_width
@@ -18,7 +20,7 @@ class StarryBackground:
         self.stars = []
         self.shooting_stars = []
         self.shooting_star_timer = 0
-        self.shooting_star_spawn_time = random.randint(20, 60)  # Much more frequent: 0.3-1 second at 60fps
+        self.shooting_star_spawn_time = self.rng.randint(20, 60)  # Much more frequent: 0.3-1 second at 60fps
 
         # Create gradient surface for background
         self.gradient_surface = pygame.Surface((self.screen_width, self.screen_height))
@@ -27,12 +29,12 @@ class StarryBackground:
         # Create regular stars
         for _ in range(num_stars):
             star = {
-                "x": random.randint(0, self.screen_width),
-                "y": random.randint(0, self.screen_height),
-                "size": random.randint(2, 4),
-                "brightness": random.uniform(0.4, 1.0),
-                "twinkle_speed": random.uniform(0.01, 0.05),
-                "twinkle_phase": random.uniform(0, 2 * math.pi),
+                "x": self.rng.randint(0, self.screen_width),
+                "y": self.rng.randint(0, self.screen_height),
+                "size": self.rng.randint(2, 4),
+                "brightness": self.rng.uniform(0.4, 1.0),
+                "twinkle_speed": self.rng.uniform(0.01, 0.05),
+                "twinkle_phase": self.rng.uniform(0, 2 * math.pi),
             }
             self.stars.append(star)
 
@@ -57,23 +59,23 @@ class StarryBackground:
     def create_shooting_star(self):
         """Create a new shooting star"""
         # Start from random edge of screen
-        side = random.randint(0, 3)
+        side = self.rng.randint(0, 3)
         if side == 0:  # Top
-            start_x = random.randint(0, self.screen_width)
+            start_x = self.rng.randint(0, self.screen_width)
             start_y = 0
         elif side == 1:  # Right
             start_x = self.screen_width
-            start_y = random.randint(0, self.screen_height)
+            start_y = self.rng.randint(0, self.screen_height)
         elif side == 2:  # Bottom
-            start_x = random.randint(0, self.screen_width)
+            start_x = self.rng.randint(0, self.screen_width)
             start_y = self.screen_height
         else:  # Left
             start_x = 0
-            start_y = random.randint(0, self.screen_height)
+            start_y = self.rng.randint(0, self.screen_height)
 
         # Random direction and speed (faster shooting stars)
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(4, 12)  # Increased speed range
+        angle = self.rng.uniform(0, 2 * math.pi)
+        speed = self.rng.uniform(4, 12)  # Increased speed range
 
         shooting_star = {
             "x": start_x,
@@ -81,9 +83,9 @@ class StarryBackground:
             "dx": math.cos(angle) * speed,
             "dy": math.sin(angle) * speed,
             "trail": [],  # Store trail positions
-            "life": random.randint(40, 80),  # Shorter lifetime for more frequent stars
-            "max_life": random.randint(40, 80),
-            "size": random.randint(2, 8),  # Slightly larger shooting stars
+            "life": self.rng.randint(40, 80),  # Shorter lifetime for more frequent stars
+            "max_life": self.rng.randint(40, 80),
+            "size": self.rng.randint(2, 8),  # Slightly larger shooting stars
         }
 
         return shooting_star
@@ -100,7 +102,7 @@ class StarryBackground:
         if self.shooting_star_timer >= self.shooting_star_spawn_time:
             self.shooting_stars.append(self.create_shooting_star())
             self.shooting_star_timer = 0
-            self.shooting_star_spawn_time = random.randint(20, 60)  # 0.3-1 second
+            self.shooting_star_spawn_time = self.rng.randint(20, 60)  # 0.3-1 second
 
         # Update shooting stars
         for shooting_star in self.shooting_stars[:]:
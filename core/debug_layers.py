@@ -0,0 +1,45 @@
+from optional_pygame import pygame
+from constants import *
+
+_debug_fonts = {}
+
+
+def get_debug_font(size=24):
+    """Default pygame font at the given size, created once and reused by every debug overlay."""
+    font = _debug_fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _debug_fonts[size] = font
+    return font
+
+
+class DebugLayerCache:
+    """Maze-sized overlay surfaces that only change when the maze layout does."""
+
+    def __init__(self):
+        self.layers = {}  # name -> (maze key, surface)
+
+    def _maze_key(self, maze):
+        return (id(maze.layout), maze.layout_version, maze.width, maze.height)
+
+    def get(self, name, maze, draw_layer, size=None):
+        """Return the cached layer, rebuilding it with draw_layer(surface, maze) if the layout changed.
+
+        size defaults to the maze in pixels; pass a larger one for markers that sit outside the grid.
+        """
+        key = self._maze_key(maze)
+        cached = self.layers.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if size is None:
+            size = (maze.width * CELL_SIZE, maze.height * CELL_SIZE)
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        draw_layer(surface, maze)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.layers[name] = (key, surface)
+        return surface
+
+    def clear(self):
+        self.layers.clear()
@@ -0,0 +1,25 @@
+"""Gameplay event messages: ghosts caught, deaths, behavior changes and the like.
+
+The windowed game prints them. Headless runs hide them with show_events(False) instead of
+swapping sys.stdout, which would also swallow every other thread's output while a game runs.
+"""
+import contextlib
+
+enabled = True
+
+
+def log_event(message):
+    if enabled:
+        print(message)
+
+
+@contextlib.contextmanager
+def show_events(show):
+    """Show or hide event messages for the duration of the with block."""
+    global enabled
+    previous = enabled
+    enabled = show
+    try:
+        yield
+    finally:
+        enabled = previous
@@ -0,0 +1,185 @@
+from optional_pygame import pygame
+import bisect
+import time
+from collections import deque
+from core.debug_layers import get_debug_font
+
+# Upper edges (ms) of the rolling histogram buckets; the last bucket catches everything slower
+HISTOGRAM_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3)
+
+# Stages in drawing order, bottom of the stacked graph first
+STAGE_COLORS = {
+    "events": (120, 120, 120),
+    "player1": (90, 170, 255),
+    "ai_player": (255, 200, 60),
+    "ghost": (255, 90, 90),
+    "collisions": (200, 120, 255),
+    "background": (60, 90, 160),
+    "maze": (70, 200, 120),
+    "entities": (255, 140, 40),
+    "compose": (150, 210, 210),
+    "ui": (230, 230, 230),
+    "flip": (90, 90, 90),
+}
+OTHER_STAGE_COLOR = (180, 60, 180)
+
+
+class StageHistogram:
+    """Per-frame times (ms) of one stage over the last `window` frames, bucketed as they arrive."""
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = deque()
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, ms)] += 1
+        if len(self.samples) > self.window:
+            old = self.samples.popleft()
+            self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, old)] -= 1
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def mean(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+
+class FrameProfiler:
+    """perf_counter_ns scopes summed per stage per frame, with a scrolling stacked graph overlay.
+
+    Call sites do `started = profiler.begin()` ... `profiler.end("stage", started)`. While disabled
+    both are a single attribute check, so the hooks can stay in the hot path.
+    """
+
+    def __init__(self, window=240, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.current = {}  # stage -> ns spent in this frame so far
+        self.histograms = {}
+        self.frames = deque(maxlen=window)  # {stage: ms} per finished frame
+        self.frame_count = 0
+
+        # Overlay state, created on first draw
+        self.graph_surface = None
+        self.graph_drawn_frames = 0
+        self.legend_surface = None
+        self.legend_frame = -1
+
+    def begin(self):
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def end(self, stage, started):
+        if not self.enabled or not started:
+            return
+        self.current[stage] = self.current.get(stage, 0) + time.perf_counter_ns() - started
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame = {}
+        for stage, ns in self.current.items():
+            ms = ns / 1e6
+            frame[stage] = ms
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = StageHistogram(self.window)
+            histogram.add(ms)
+        # Stages that did not run this frame still count as 0 ms so percentiles stay honest
+        for stage, histogram in self.histograms.items():
+            if stage not in frame:
+                histogram.add(0.0)
+        self.frames.append(frame)
+        self.frame_count += 1
+        self.current = {}
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.current = {}
+
+    def reset(self):
+        self.current = {}
+        self.histograms = {}
+        self.frames.clear()
+        self.frame_count = 0
+        self.graph_surface = None
+        self.legend_surface = None
+
+    def get_stats(self):
+        """{stage: (p50, p95, max) in ms} over the rolling window."""
+        return {stage: (h.percentile(50), h.percentile(95), max(h.samples, default=0.0)) for stage, h in self.histograms.items()}
+
+    def _ordered_stages(self):
+        known = [stage for stage in STAGE_COLORS if stage in self.histograms]
+        return known + sorted(stage for stage in self.histograms if stage not in STAGE_COLORS)
+
+    def _draw_column(self, x, frame, height, ms_per_pixel):
+        bottom = height
+        for stage in self._ordered_stages():
+            ms = frame.get(stage, 0.0)
+            if ms <= 0.0:
+                continue
+            pixels = max(1, int(ms / ms_per_pixel))
+            top = max(0, bottom - pixels)
+            pygame.draw.line(self.graph_surface, STAGE_COLORS.get(stage, OTHER_STAGE_COLOR), (x, top), (x, bottom - 1))
+            bottom = top
+            if bottom <= 0:
+                break
+
+    def _update_graph(self, width, height, ms_range):
+        if self.graph_surface is None or self.graph_surface.get_size() != (width, height):
+            self.graph_surface = pygame.Surface((width, height))
+            self.graph_surface.fill((15, 15, 25))
+            self.graph_drawn_frames = max(0, self.frame_count - min(len(self.frames), width))
+
+        # Scroll in only the frames finished since the last draw
+        new_frames = min(self.frame_count - self.graph_drawn_frames, width, len(self.frames))
+        if new_frames <= 0:
+            return
+        self.graph_surface.scroll(-new_frames, 0)
+        self.graph_surface.fill((15, 15, 25), (width - new_frames, 0, new_frames, height))
+        ms_per_pixel = ms_range / height
+        recent = list(self.frames)[-new_frames:]
+        for offset, frame in enumerate(recent):
+            self._draw_column(width - new_frames + offset, frame, height, ms_per_pixel)
+        self.graph_drawn_frames = self.frame_count
+
+    def _update_legend(self, width, refresh_every=30):
+        # Text is the expensive part; redraw it twice a second instead of every frame
+        if self.legend_surface is not None and self.frame_count - self.legend_frame < refresh_every:
+            return
+        font = get_debug_font(16)
+        stats = self.get_stats()
+        stages = self._ordered_stages()
+        line_height = 14
+        self.legend_surface = pygame.Surface((width, line_height * (len(stages) + 1) + 4), pygame.SRCALPHA)
+        self.legend_surface.fill((15, 15, 25, 220))
+        header = font.render("stage        p50    p95    max ms", True, (200, 200, 200))
+        self.legend_surface.blit(header, (4, 2))
+        for row, stage in enumerate(stages, start=1):
+            p50, p95, worst = stats[stage]
+            y = 2 + row * line_height
+            pygame.draw.rect(self.legend_surface, STAGE_COLORS.get(stage, OTHER_STAGE_COLOR), (4, y + 3, 8, 8))
+            text = font.render(f"{stage:<11} {p50:6.2f} {p95:6.2f} {worst:6.2f}", True, (230, 230, 230))
+            self.legend_surface.blit(text, (16, y))
+        self.legend_frame = self.frame_count
+
+    def draw(self, screen, x, y, width=240, height=90, ms_range=33.3):
+        """Stacked per-stage frame-time graph (newest frame on the right) with a p50/p95/max legend."""
+        if not self.enabled or not self.frames:
+            return
+        self._update_graph(width, height, ms_range)
+        self._update_legend(width)
+
+        screen.blit(self.graph_surface, (x, y))
+        # 60 FPS budget line
+        budget_y = y + height - int(1000.0 / 60 / ms_range * height)
+        pygame.draw.line(screen, (255, 255, 255), (x, budget_y), (x + width - 1, budget_y))
+        pygame.draw.rect(screen, (200, 200, 200), (x, y, width, height), 1)
+        screen.blit(self.legend_surface, (x, y + height + 2))
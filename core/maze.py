@@ -1,27 +1,28 @@
 import pygame
 from constants import *
 from core.bg import StarryBackground
-from maze_layout import MAZE_LAYOUT
+from core.maze_state import MazeState
 import math
 
 
-class Maze:
-    def __init__(self):
-        self.layout = MAZE_LAYOUT
-        self.width = len(self.layout[0])
-        self.height = len(self.layout)
-        self.pellets = set()
-        self.power_pellets = set()
-        self.total_pellets = 0
+class Maze(MazeState):
+    def __init__(self, sprite_manager=None, layout=None, rng=None):
+        super().__init__(layout)
         self.wall_image = pygame.image.load("assets/Dungeon_brick_wall_grey.png.png").convert_alpha()
         self.wall_image = pygame.transform.scale(self.wall_image, (CELL_SIZE, CELL_SIZE))
-        self.background = StarryBackground()
-        self.pellet_image = pygame.image.load("assets/rubber_duck.png").convert_alpha()
-        self.pellet_image = pygame.transform.scale(self.pellet_image, (32, 32))
-        self.power_pellet_image = pygame.image.load("assets/rubber_ducktopus.png").convert_alpha()
-        self.power_pellet_image = pygame.transform.scale(self.power_pellet_image, (32, 32))
-        self.initial_pellets_set = set()  # Mới
-        self.initial_power_pellets_set = set()
+        self.background = StarryBackground(rng=rng)
+        self.sprite_manager = sprite_manager
+        self.pellet_sprite_id = sprite_manager.sprite_ids.get("pellet") if sprite_manager else None
+        self.power_pellet_sprite_id = sprite_manager.sprite_ids.get("power_pellet") if sprite_manager else None
+        self._atlas_version = None
+        if self.pellet_sprite_id is not None and self.power_pellet_sprite_id is not None:
+            # Pellet images live in the sprite atlas; pulse sizes come from its scaled cache
+            self._refresh_atlas_images()
+        else:
+            self.pellet_image = pygame.image.load("assets/rubber_duck.png").convert_alpha()
+            self.pellet_image = pygame.transform.scale(self.pellet_image, (32, 32))
+            self.power_pellet_image = pygame.image.load("assets/rubber_ducktopus.png").convert_alpha()
+            self.power_pellet_image = pygame.transform.scale(self.power_pellet_image, (32, 32))
 
         # Animation variables
         self.animation_timer = 0
@@ -31,20 +32,6 @@ class Maze:
         self.power_pellet_glow_alpha = 0
         self.power_pellet_glow_direction = 1
 
-        self._initialize_collectibles()
-
-    def _initialize_collectibles(self):
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.layout[y][x] == 1:  # small food
-                    self.pellets.add((x, y))
-                elif self.layout[y][x] == 2:  # big food
-                    self.power_pellets.add((x, y))
-
-        self.total_pellets = len(self.pellets) + len(self.power_pellets)
-        self.initial_pellets_set = set(self.pellets)  # Mới
-        self.initial_power_pellets_set = set(self.power_pellets)
-
     def update_animations(self):
         self.animation_timer += 1
 
@@ -66,6 +53,18 @@ class Maze:
         rotated_image = pygame.transform.rotate(image, angle)
         return rotated_image
 
+    def _scaled_power_pellet(self):
+        if self.power_pellet_sprite_id is not None:
+            return self.sprite_manager.atlas.get_scaled(self.power_pellet_sprite_id, self.power_pellet_scale)
+        return self._scale_image(self.power_pellet_image, self.power_pellet_scale)
+
+    def _refresh_atlas_images(self):
+        """Re-fetch the pellet subsurfaces, which a repack of the atlas replaces."""
+        atlas = self.sprite_manager.atlas
+        self.pellet_image = atlas.get(self.pellet_sprite_id)
+        self.power_pellet_image = atlas.get(self.power_pellet_sprite_id)
+        self._atlas_version = atlas.version
+
     def _scale_image(self, image, scale):
         new_width = int(image.get_width() * scale)
         new_height = int(image.get_height() * scale)
@@ -89,68 +88,18 @@ class Maze:
         else:
             return image
 
-    def is_wall(self, x, y):
-        if x < 0 or x >= self.width or y < 0 or y >= self.height:
-            return True
-        # Walls are types 3, 4, 5, 6, 7, 8
-        return self.layout[y][x] in [3]
-
-    def is_valid_position(self, x, y):
-        return not self.is_wall(x, y)
-
-    def grid_to_pixel(self, grid_x, grid_y):
-        pixel_x = grid_x * CELL_SIZE
-        pixel_y = grid_y * CELL_SIZE
-        return pixel_x, pixel_y
-
-    def pixel_to_grid(self, pixel_x, pixel_y):
-        grid_x = pixel_x // CELL_SIZE
-        grid_y = pixel_y // CELL_SIZE
-        return grid_x, grid_y
-
-    def collect_pellet(self, x, y):
-        if (x, y) in self.pellets:
-            self.pellets.remove((x, y))
-            return PELLET_POINTS
-        elif (x, y) in self.power_pellets:
-            self.power_pellets.remove((x, y))
-            return POWER_PELLET_POINTS
-        return 0
-
-    def is_pellet(self, x, y):
-        return (x, y) in self.pellets or (x, y) in self.power_pellets
-
-    def all_pellets_collected(self):
-        return len(self.pellets) == 0 and len(self.power_pellets) == 0
-
-    def get_neighbors(self, x, y):
-        neighbors = []
-        for direction, (dx, dy) in DIRECTIONS.items():
-            new_x, new_y = x + dx, y + dy
-            if self.is_valid_position(new_x, new_y):
-                neighbors.append((new_x, new_y, direction))
-        return neighbors
-
-    def get_unexplored_positions(self, current_x, current_y):
-        unexplored = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if (
-                    self.is_valid_position(x, y)
-                    and (x, y) not in self.pellets
-                    and (x, y) not in self.power_pellets
-                    and (x, y) != (current_x, current_y)
-                ):
-                    unexplored.append((x, y))
-        return unexplored
-
     def render(self, screen):
-        self.update_animations()
+        self.render_background(screen)
+        self.render_layout(screen)
 
-        # Render the maze background
+    def render_background(self, screen):
         self.background.update()
         self.background.render(screen)
 
+    def render_layout(self, screen):
+        """Walls and pellets, without the starry background."""
+        self.update_animations()
+
         # Render the maze layout
         for y in range(self.height):
             for x in range(self.width):
@@ -162,6 +111,8 @@ class Maze:
                     screen.blit(self.wall_image, (pixel_x, pixel_y))
 
         # Render pellets
+        if self._atlas_version is not None and self._atlas_version != self.sprite_manager.atlas.version:
+            self._refresh_atlas_images()
         for px, py in self.pellets:
             pixel_x, pixel_y = self.grid_to_pixel(px, py)
             center_x = pixel_x + CELL_SIZE // 2
@@ -186,17 +137,8 @@ class Maze:
             self._draw_glow_effect(screen, center_x, center_y, 25, (55, 255, 255), self.power_pellet_glow_alpha)
 
             # Apply scaling animation
-            scaled_power_pellet = self._scale_image(self.power_pellet_image, self.power_pellet_scale)
+            scaled_power_pellet = self._scaled_power_pellet()
 
             # Center the scaled image
             scaled_rect = scaled_power_pellet.get_rect(center=(center_x, center_y))
             screen.blit(scaled_power_pellet, scaled_rect)
-
-    def get_remaining_food_count(self):
-        return len(self.pellets) + len(self.power_pellets)
-
-    def is_corner(self, x, y):
-        # Check if the position is a corner based on the layout
-        if (x, y) in [(0, 0), (self.width - 1, 0), (0, self.height - 1), (self.width - 1, self.height - 1)]:
-            return True
-        return False
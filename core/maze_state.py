@@ -0,0 +1,109 @@
+from constants import *
+from maze_layout import MAZE_LAYOUT
+
+
+class MazeState:
+    """Maze layout and collectibles with no rendering, so game rules can run without pygame."""
+
+    def __init__(self, layout=None):
+        self.layout = layout if layout is not None else MAZE_LAYOUT
+        self.layout_version = 0  # Bumped whenever the layout changes so cached overlays rebuild
+        self.width = len(self.layout[0])
+        self.height = len(self.layout)
+        self.pellets = set()
+        self.power_pellets = set()
+        self.total_pellets = 0
+        self.initial_pellets_set = set()  # Mới
+        self.initial_power_pellets_set = set()
+
+        self._initialize_collectibles()
+
+    def _initialize_collectibles(self):
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.layout[y][x] == 1:  # small food
+                    self.pellets.add((x, y))
+                elif self.layout[y][x] == 2:  # big food
+                    self.power_pellets.add((x, y))
+
+        self.total_pellets = len(self.pellets) + len(self.power_pellets)
+        self.initial_pellets_set = set(self.pellets)  # Mới
+        self.initial_power_pellets_set = set(self.power_pellets)
+
+    def set_layout(self, layout):
+        """Swap in a new layout and reset the collectibles placed on it."""
+        self.layout = layout
+        self.layout_version += 1
+        self.width = len(self.layout[0])
+        self.height = len(self.layout)
+        self.reset_collectibles()
+
+    def reset_collectibles(self):
+        """Put every pellet and power pellet of the current layout back."""
+        self.pellets = set()
+        self.power_pellets = set()
+        self._initialize_collectibles()
+
+    def is_wall(self, x, y):
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return True
+        # Walls are types 3, 4, 5, 6, 7, 8
+        return self.layout[y][x] in [3]
+
+    def is_valid_position(self, x, y):
+        return not self.is_wall(x, y)
+
+    def grid_to_pixel(self, grid_x, grid_y):
+        pixel_x = grid_x * CELL_SIZE
+        pixel_y = grid_y * CELL_SIZE
+        return pixel_x, pixel_y
+
+    def pixel_to_grid(self, pixel_x, pixel_y):
+        grid_x = pixel_x // CELL_SIZE
+        grid_y = pixel_y // CELL_SIZE
+        return grid_x, grid_y
+
+    def collect_pellet(self, x, y):
+        if (x, y) in self.pellets:
+            self.pellets.remove((x, y))
+            return PELLET_POINTS
+        elif (x, y) in self.power_pellets:
+            self.power_pellets.remove((x, y))
+            return POWER_PELLET_POINTS
+        return 0
+
+    def is_pellet(self, x, y):
+        return (x, y) in self.pellets or (x, y) in self.power_pellets
+
+    def all_pellets_collected(self):
+        return len(self.pellets) == 0 and len(self.power_pellets) == 0
+
+    def get_neighbors(self, x, y):
+        neighbors = []
+        for direction, (dx, dy) in DIRECTIONS.items():
+            new_x, new_y = x + dx, y + dy
+            if self.is_valid_position(new_x, new_y):
+                neighbors.append((new_x, new_y, direction))
+        return neighbors
+
+    def get_unexplored_positions(self, current_x, current_y):
+        unexplored = []
+        for y in range(self.height):
+            for x in range(self.width):
+                if (
+                    self.is_valid_position(x, y)
+                    and (x, y) not in self.pellets
+                    and (x, y) not in self.power_pellets
+                    and (x, y) != (current_x, current_y)
+                ):
+                    unexplored.append((x, y))
+        return unexplored
+
+    def get_remaining_food_count(self):
+        return len(self.pellets) + len(self.power_pellets)
+
+    def is_corner(self, x, y):
+        # Check if the position is a corner based on the layout
+        if (x, y) in [(0, 0), (self.width - 1, 0), (0, self.height - 1), (self.width - 1, self.height - 1)]:
+            return True
+        return False
@@ -0,0 +1,129 @@
+import gc
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+MEMORY_OUTPUT_DIR = "memory_reports"
+
+# Game classes whose live instance counts are reported with every snapshot; a count that keeps
+# climbing across restarts means something is holding on to old games
+TRACKED_TYPES = (
+    "Player", "AIPlayer", "AIState", "PathfindingManager", "BehaviorManager", "DecisionMaker",
+    "InkyGhost", "GhostAnimation", "Maze", "StarryBackground", "SimulationCore",
+    "dict", "list", "tuple",
+)
+
+# Allocations made by the diagnostics themselves or the import machinery are noise
+_IGNORED_FILES = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def count_objects(type_names=TRACKED_TYPES):
+    """Live objects per type name among the garbage collector's tracked objects."""
+    counts = dict.fromkeys(type_names, 0)
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in counts:
+            counts[name] += 1
+    return counts
+
+
+class MemoryTracker:
+    """tracemalloc snapshots at phase boundaries, diffed by file and line.
+
+    Call start() once, snapshot("game_start") etc. at phase changes and maybe_snapshot() once a
+    frame for the periodic snapshots. Each snapshot prints and saves the top growth sites since
+    the previous snapshot and since startup, plus instance counts of TRACKED_TYPES. tracemalloc
+    slows every allocation down, so none of this runs unless the tracker is started.
+    """
+
+    def __init__(self, interval_minutes=5.0, top=15, frames=1, output_dir=MEMORY_OUTPUT_DIR):
+        self.interval = interval_minutes * 60
+        self.top = top
+        self.frames = frames
+        self.output_dir = output_dir
+        self.enabled = False
+        self.started_tracing = False  # Whether start() turned tracemalloc on, and so stop() should turn it off
+        self.baseline = None  # (phase, snapshot, counts) taken at start()
+        self.previous = None
+        self.last_snapshot_time = 0.0
+        self.report_path = None
+
+    def start(self):
+        if self.enabled:
+            return
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(self.frames)
+        self.enabled = True
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        self.report_path = os.path.join(self.output_dir, f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        print(f"Memory diagnostics on, reports in {self.report_path}")
+        self.snapshot("startup")
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.snapshot("shutdown")
+        # Leave tracing on if someone else (e.g. python -X tracemalloc) started it
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.enabled = False
+        self.baseline = self.previous = None
+
+    def maybe_snapshot(self):
+        if self.enabled and time.perf_counter() - self.last_snapshot_time >= self.interval:
+            self.snapshot("periodic")
+
+    def _take(self):
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces([tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES])
+
+    def snapshot(self, phase):
+        """Take a snapshot for `phase`, then print and append the report. Returns the report text."""
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        gc.collect()  # Only report memory that is actually still reachable
+        current = (phase, self._take(), count_objects())
+        lines = self._report(current)
+        self.previous = current
+        if self.baseline is None:
+            self.baseline = current
+        self.last_snapshot_time = time.perf_counter()
+        lines.append(f"(snapshot took {(self.last_snapshot_time - started) * 1000:.0f} ms)")
+
+        text = "\n".join(lines) + "\n"
+        print(text)
+        with open(self.report_path, 'a') as f:
+            f.write(text + "\n")
+        return text
+
+    def _report(self, current):
+        phase, snapshot, counts = current
+        size, peak = tracemalloc.get_traced_memory()
+        lines = [f"=== Memory snapshot: {phase} at {datetime.now().strftime('%H:%M:%S')} "
+                 f"(traced {size / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB) ==="]
+
+        references = [("previous", self.previous)]
+        if self.baseline is not self.previous:
+            references.append(("startup", self.baseline))
+        for label, reference in references:
+            if reference is None:
+                continue
+            lines.append(f"Top growth since {label} ({reference[0]}):")
+            growth = [stat for stat in snapshot.compare_to(reference[1], 'lineno') if stat.size_diff > 0]
+            for stat in growth[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+            if not growth:
+                lines.append("  (none)")
+
+        lines.append("Live objects:")
+        previous_counts = self.previous[2] if self.previous else {}
+        for name, count in counts.items():
+            change = count - previous_counts.get(name, count)
+            lines.append(f"  {name:<20} {count:8d} ({change:+d})")
+        return lines
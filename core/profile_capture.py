@@ -0,0 +1,112 @@
+import cProfile
+import os
+import pstats
+import threading
+from datetime import datetime
+
+PROFILE_OUTPUT_DIR = "profiles"
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == '~':  # Built-ins have no file
+        return name.replace(';', ':')
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ':')
+
+
+def write_collapsed_stacks(stats, path):
+    """Write "root;caller;callee microseconds" lines for flamegraph.pl / speedscope.
+
+    cProfile only records caller -> callee edges, not whole stacks, so each function's own time
+    is split across its callers in proportion to the cumulative time each edge carries. Recursive
+    cycles are cut where a function reappears on the stack.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def walk(func, stack, share):
+        _, _, own_time, total_time, _ = stats.stats[func]
+        stack = stack + [_frame_label(func)]
+        own = own_time * share
+        if own > 0:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0.0) + own
+        # Past a microsecond the branch can't show up in a flame graph; stopping also keeps the walk
+        # from enumerating every path through a dense call graph
+        if len(stack) >= MAX_STACK_DEPTH or total_time * share < 1e-6:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            if _frame_label(callee) in stack or callee not in stats.stats:
+                continue
+            callee_total = stats.stats[callee][3]
+            if callee_total > 0 and edge_time > 0:
+                walk(callee, stack, share * edge_time / callee_total)
+
+    # Frames already running when profiling started show up only as callers, never as entries
+    roots = [func for func, (_, _, _, _, callers) in stats.stats.items() if not any(caller in stats.stats for caller in callers)]
+    for root in roots:
+        walk(root, [], 1.0)
+
+    with open(path, 'w') as f:
+        for stack, seconds in sorted(lines.items()):
+            microseconds = int(seconds * 1e6)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+
+class ProfileCapture:
+    """Profiles the next N frames with cProfile, then writes .pstats and collapsed stacks.
+
+    The game calls end_frame() once per loop iteration. Files are written on a background
+    thread so the frame that ends the capture doesn't hitch.
+    """
+
+    def __init__(self, frames=300, output_dir=PROFILE_OUTPUT_DIR):
+        self.frames = frames
+        self.output_dir = output_dir
+        self.profiler = None
+        self.frames_left = 0
+        self.last_output = None
+
+    def is_active(self):
+        return self.profiler is not None
+
+    def start(self, frames=None):
+        if self.is_active():
+            print(f"Profile capture already running ({self.frames_left} frames left)")
+            return
+        self.frames_left = frames or self.frames
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        print(f"Profiling the next {self.frames_left} frames...")
+
+    def end_frame(self):
+        if self.profiler is None:
+            return
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+
+    def stop(self):
+        if self.profiler is None:
+            return
+        profiler = self.profiler
+        profiler.disable()
+        self.profiler = None
+
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        base = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.last_output = base
+        threading.Thread(target=self._write, args=(profiler, base), daemon=True).start()
+
+    def _write(self, profiler, base):
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(base + ".pstats")
+        write_collapsed_stacks(stats, base + ".collapsed.txt")
+        print(f"Profile written to {base}.pstats and {base}.collapsed.txt")
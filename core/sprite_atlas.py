@@ -0,0 +1,100 @@
+import pygame
+
+
+class SpriteAtlas:
+    """Packs many small images into one converted surface and hands out integer handles."""
+
+    def __init__(self, max_width=1024, padding=1):
+        self.max_width = max_width
+        self.padding = padding
+        self.surface = None
+        self.version = 0  # Bumped by every pack(); holders of get() results re-fetch when it changes
+
+        self._sources = []  # Source surface per handle, kept so the atlas can be repacked
+        self._names = {}  # name -> handle
+        self._regions = []  # Rect inside the atlas surface per handle
+        self._subsurfaces = []
+        self._scaled_cache = {}  # (handle, width, height) -> scaled surface
+        self._packed = False
+
+    def add(self, name, surface):
+        """Register an image and return its handle. Re-adding a name replaces the image."""
+        if name in self._names:
+            handle = self._names[name]
+            self._sources[handle] = surface
+        else:
+            handle = len(self._sources)
+            self._sources.append(surface)
+            self._names[name] = handle
+        self._packed = False
+        return handle
+
+    def get_id(self, name):
+        return self._names.get(name)
+
+    def __len__(self):
+        return len(self._sources)
+
+    def pack(self):
+        """Shelf-pack every registered image into a single surface."""
+        if not self._sources:
+            return
+
+        # Place tallest images first so each shelf wastes as little height as possible
+        order = sorted(range(len(self._sources)), key=lambda h: self._sources[h].get_height(), reverse=True)
+        regions = [None] * len(self._sources)
+        x = y = shelf_height = 0
+        atlas_width = 0
+        for handle in order:
+            w, h = self._sources[handle].get_size()
+            if x > 0 and x + w > self.max_width:
+                x = 0
+                y += shelf_height + self.padding
+                shelf_height = 0
+            regions[handle] = pygame.Rect(x, y, w, h)
+            x += w + self.padding
+            shelf_height = max(shelf_height, h)
+            atlas_width = max(atlas_width, regions[handle].right)
+
+        atlas_height = y + shelf_height
+        surface = pygame.Surface((max(1, atlas_width), max(1, atlas_height)), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        for handle, rect in enumerate(regions):
+            surface.blit(self._sources[handle], rect.topleft)
+
+        # convert_alpha needs a display mode; headless tools keep the plain SRCALPHA surface
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self.surface = surface
+        self._regions = regions
+        self._subsurfaces = [surface.subsurface(rect) for rect in regions]
+        self._scaled_cache.clear()
+        self._packed = True
+        self.version += 1
+
+    def get(self, handle):
+        if handle is None:
+            return None
+        if self._packed:
+            return self._subsurfaces[handle]
+        return self._sources[handle]
+
+    def get_by_name(self, name):
+        return self.get(self._names.get(name))
+
+    def get_scaled(self, handle, scale):
+        """Return the image scaled by `scale`, cached per resulting pixel size."""
+        if handle is None:
+            return None
+        image = self.get(handle)
+        if scale == 1.0:
+            return image
+
+        size = (max(1, int(image.get_width() * scale)), max(1, int(image.get_height() * scale)))
+        key = (handle, size)
+        scaled = self._scaled_cache.get(key)
+        if scaled is None:
+            scaled = pygame.transform.scale(image, size)
+            self._scaled_cache[key] = scaled
+        return scaled
@@ -1,12 +1,34 @@
 import pygame
 import os
+import re
 from constants import *
+from core.sprite_atlas import SpriteAtlas
+
+# Frame folders shipped in "assets/round ghost", mapped to animation state names
+GHOST_ANIMATION_FOLDERS = {
+    "idle": "round ghost idle",
+    "walk": "round ghost walk",
+    "attack": "round ghost attack",
+    "dead": "round ghost dead",
+    "damage": "round ghost taking damage",
+}
+
+PELLET_SPRITES = {
+    "pellet": "rubber_duck.png",
+    "power_pellet": "rubber_ducktopus.png",
+}
+PELLET_SPRITE_SIZE = 32
 
 
 class SpriteManager:
     def __init__(self):
         self.sprites = {}
         self.default_sprites = {}
+        self.atlas = SpriteAtlas()
+        self.sprite_ids = {}  # "player1_up" -> atlas handle
+        self.default_sprite_ids = {}
+        self.animations = {}  # name -> state -> [atlas handles]
+        self.tinted_animations = {}  # (name, tint name) -> state -> [atlas handles]
         self._create_default_sprites()
 
     def _create_default_sprites(self):
@@ -28,6 +50,7 @@ class SpriteManager:
                 pygame.draw.polygon(surf, BLACK, [(size - 2, size // 2), (size // 2, size // 2 - 4), (size // 2, size // 2 + 4)])
 
             self.default_sprites[f"player1_{direction}"] = surf
+            self.default_sprite_ids[f"player1_{direction}"] = self.atlas.add(f"default_player1_{direction}", surf)
 
         # Player 2 default sprites (Red Pacman)
         for direction in ["up", "down", "left", "right"]:
@@ -45,23 +68,113 @@ class SpriteManager:
                 pygame.draw.polygon(surf, BLACK, [(size - 2, size // 2), (size // 2, size // 2 - 4), (size // 2, size // 2 + 4)])
 
             self.default_sprites[f"player2_{direction}"] = surf
+            self.default_sprite_ids[f"player2_{direction}"] = self.atlas.add(f"default_player2_{direction}", surf)
+
+    def _load_image(self, path):
+        image = pygame.image.load(path)
+        # convert_alpha needs a display mode; without one keep the decoded surface as-is
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def _fit_to_cell(self, image, size=CELL_SIZE):
+        """Scale an image to fit a size x size cell, keeping its aspect ratio and centering it."""
+        w, h = image.get_size()
+        factor = min(size / w, size / h)
+        scaled = pygame.transform.scale(image, (max(1, int(w * factor)), max(1, int(h * factor))))
+        cell = pygame.Surface((size, size), pygame.SRCALPHA)
+        cell.blit(scaled, scaled.get_rect(center=(size // 2, size // 2)))
+        return cell
 
     def load_custom_sprites(self, player_id, sprite_paths):
         for direction, path in sprite_paths.items():
             if os.path.exists(path):
                 try:
-                    sprite = pygame.image.load(path)
+                    sprite = self._load_image(path)
                     sprite = pygame.transform.scale(sprite, (CELL_SIZE, CELL_SIZE))
-                    self.sprites[f"{player_id}_{direction}"] = sprite
+                    key = f"{player_id}_{direction}"
+                    self.sprites[key] = sprite
+                    self.sprite_ids[key] = self.atlas.add(key, sprite)
                     print(f"Loaded custom sprite: {player_id}_{direction}")
                 except pygame.error as e:
                     print(f"Error loading sprite {path}: {e}")
             else:
                 print(f"Sprite file not found: {path}")
 
-    def get_sprite(self, player_id, direction):
+    def load_animation_frames(self, name, folders, base_path):
+        """Load numbered sprite_N.png frame folders into the atlas as name -> state -> [handles]."""
+        states = self.animations.setdefault(name, {})
+        for state, folder in folders.items():
+            folder_path = os.path.join(base_path, folder)
+            if not os.path.isdir(folder_path):
+                print(f"Animation folder not found: {folder_path}")
+                continue
+
+            frame_files = [f for f in os.listdir(folder_path) if re.fullmatch(r"sprite_\d+\.png", f)]
+            frame_files.sort(key=lambda f: int(re.search(r"\d+", f).group()))
+
+            handles = []
+            for index, frame_file in enumerate(frame_files):
+                try:
+                    frame = self._fit_to_cell(self._load_image(os.path.join(folder_path, frame_file)))
+                    handles.append(self.atlas.add(f"{name}_{state}_{index}", frame))
+                except pygame.error as e:
+                    print(f"Error loading frame {frame_file}: {e}")
+            states[state] = handles
+            print(f"Loaded {len(handles)} frames for {name}_{state}")
+
+    def load_pellet_sprites(self, assets_path="assets"):
+        for name, filename in PELLET_SPRITES.items():
+            path = os.path.join(assets_path, filename)
+            if os.path.exists(path):
+                try:
+                    image = pygame.transform.scale(self._load_image(path), (PELLET_SPRITE_SIZE, PELLET_SPRITE_SIZE))
+                    self.sprite_ids[name] = self.atlas.add(name, image)
+                except pygame.error as e:
+                    print(f"Error loading sprite {path}: {e}")
+            else:
+                print(f"Sprite file not found: {path}")
+
+    def get_sprite_id(self, player_id, direction):
+        """Resolve the atlas handle for a sprite once so render loops can skip the key lookup."""
         key = f"{player_id}_{direction}"
-        return self.sprites.get(key, self.default_sprites.get(key))
+        return self.sprite_ids.get(key, self.default_sprite_ids.get(key))
+
+    def get_sprite_ids(self, player_id):
+        """Atlas handles for every movement direction, keyed like DIRECTIONS ("UP", "DOWN", ...)."""
+        return {direction: self.get_sprite_id(player_id, direction.lower()) for direction in DIRECTIONS}
+
+    def get_sprite_by_id(self, sprite_id):
+        return self.atlas.get(sprite_id)
+
+    def get_animation_ids(self, name, state):
+        return self.animations.get(name, {}).get(state, [])
+
+    def bake_animation_tints(self, name, tints):
+        """Add multiply-tinted copies of every frame of an animation to the atlas, once per tint name."""
+        added = False
+        for tint_name, tint_color in tints.items():
+            if (name, tint_name) in self.tinted_animations:
+                continue
+            states = self.tinted_animations[(name, tint_name)] = {}
+            for state, frame_ids in self.animations.get(name, {}).items():
+                tinted_ids = []
+                for index, frame_id in enumerate(frame_ids):
+                    tinted = self.atlas.get(frame_id).copy()
+                    tinted.fill(tint_color, special_flags=pygame.BLEND_RGB_MULT)
+                    tinted_ids.append(self.atlas.add(f"{name}_{state}_{index}_{tint_name.lower()}", tinted))
+                    added = True
+                states[state] = tinted_ids
+
+        # Tinted copies join the shared atlas so they blit from the same converted surface
+        if added:
+            self.atlas.pack()
+
+    def get_tinted_animation_ids(self, name, state, tint_name):
+        return self.tinted_animations.get((name, tint_name), {}).get(state, [])
+
+    def get_sprite(self, player_id, direction):
+        return self.atlas.get(self.get_sprite_id(player_id, direction))
 
     def auto_load_from_assets(self):
         assets_path = "assets"
@@ -87,6 +200,12 @@ class SpriteManager:
         self.load_custom_sprites("ai1", mizuki_sprites)
         self.load_custom_sprites("test_ai", mizuki_sprites)
 
+        self.load_animation_frames("ghost", GHOST_ANIMATION_FOLDERS, os.path.join(assets_path, "round ghost"))
+        self.load_pellet_sprites(assets_path)
+
+        # Pack everything loaded above into one converted surface
+        self.atlas.pack()
+
         # Look for other sprite patterns
         files = os.listdir(assets_path)
         for file in files:
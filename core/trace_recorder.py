@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from array import array
+from datetime import datetime
+
+TRACE_OUTPUT_DIR = "traces"
+
+
+class TraceRecorder:
+    """Fixed-size ring buffer of timed spans, exported as Chrome Trace Event JSON.
+
+    Every slot is allocated up front and the oldest spans are overwritten, so recording can stay
+    on for a whole session. Open the export in chrome://tracing or ui.perfetto.dev.
+
+        started = tracer.begin()
+        ...
+        if started:
+            tracer.end("find_path", started, "ai", {"algorithm": "bfs"})
+
+    begin() returns 0 while disabled, so callers can skip building args entirely.
+    """
+
+    def __init__(self, capacity=65536, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.names = [None] * capacity
+        self.categories = [None] * capacity
+        self.args = [None] * capacity
+        self.starts = array('q', bytes(8 * capacity))
+        self.durations = array('q', bytes(8 * capacity))
+        self.next_index = 0
+        self.count = 0
+
+    def begin(self):
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def end(self, name, started, category="game", args=None):
+        if not started:
+            return
+        index = self.next_index
+        self.names[index] = name
+        self.categories[index] = category
+        self.args[index] = args
+        self.starts[index] = started
+        self.durations[index] = time.perf_counter_ns() - started
+        self.next_index = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def clear(self):
+        self.next_index = 0
+        self.count = 0
+
+    def _ordered_indices(self):
+        first = (self.next_index - self.count) % self.capacity
+        return ((first + offset) % self.capacity for offset in range(self.count))
+
+    def get_events(self, pid=1, tid=1):
+        """The buffered spans, oldest first, as Chrome "complete" (ph X) events in microseconds."""
+        events = []
+        for index in self._ordered_indices():
+            event = {
+                'name': self.names[index],
+                'cat': self.categories[index],
+                'ph': 'X',
+                'ts': self.starts[index] / 1000.0,
+                'dur': self.durations[index] / 1000.0,
+                'pid': pid,
+                'tid': tid,
+            }
+            if self.args[index]:
+                event['args'] = self.args[index]
+            events.append(event)
+        return events
+
+    def export(self, path=None):
+        """Write the buffer to a Chrome trace file and return its path."""
+        if path is None:
+            if not os.path.exists(TRACE_OUTPUT_DIR):
+                os.makedirs(TRACE_OUTPUT_DIR)
+            path = os.path.join(TRACE_OUTPUT_DIR, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        events = self.get_events()
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Trace with {len(events)} spans written to {path}")
+        return path
+
+
+# Shared recorder for the game loop and the AI; off until the game turns it on
+tracer = TraceRecorder()
@@ -1,22 +1,34 @@
-import pygame
+from optional_pygame import pygame
 import random
 import math
+import time
 from constants import *
 from entities.player_base import PlayerBase
 from entities.ai.ai_state import AIState
 from entities.ai.behaviors.behavior_manager import BehaviorManager
 from entities.ai.pathfinding import PathfindingManager
 from entities.ai.decision_making import DecisionMaker
+from entities.ai.escape_planner import EscapePlanner
+from entities.ai.behavior_params import DEFAULT_PARAMS
+from core.debug_layers import get_debug_font
+from core.event_log import log_event
 
 
 class AIPlayer(PlayerBase):
-    def __init__(self, player_id, start_x, start_y, sprite_manager, ai_type="simple_bfs"):
+    def __init__(self, player_id, start_x, start_y, sprite_manager, ai_type="simple_bfs", rng=None, params=None):
         super().__init__(player_id, start_x, start_y, sprite_manager)
+        # Every random choice the AI makes goes through here; SimulationCore hands in its seeded per-game RNG
+        self.rng = rng if rng is not None else random.Random()
+        # Heuristic weights read by the behaviors and pathfinding; shared defaults unless tuned ones are given
+        self.params = params if params is not None else DEFAULT_PARAMS
+        # Live ghost entities, handed in by SimulationCore for planners that run the ghost's own rules
+        self.ghosts = []
 
         # Core AI components
         self.ai_state = AIState(ai_type, start_x, start_y)
         self.pathfinding = PathfindingManager(self)
         self.decision_maker = DecisionMaker(self)
+        self.escape_planner = EscapePlanner(self)
         self.behavior_manager = BehaviorManager(self)
 
         # Movement properties
@@ -25,6 +37,12 @@ class AIPlayer(PlayerBase):
         self.speed = AI_SPEED if 'AI_SPEED' in globals() else PLAYER_SPEED
 
         self.total_moves_made = 0
+        self.pellets_collected = 0
+        self.power_pellets_collected = 0
+        self.decisions_made = 0
+        self.decision_time_ns = 0
+        self.max_decision_time_ns = 0
+        self.last_decision_time_ns = 0
 
     def update(self, maze, player_position=None, ghosts_positions=None):
         # Use base class methods
@@ -53,13 +71,23 @@ class AIPlayer(PlayerBase):
 
         # Make decisions periodically
         if self.ai_state.decision_timer >= 8:
+            decision_start = time.perf_counter_ns()
             situation = self.decision_maker.analyze_situation(maze, player_position, ghosts_positions)
             self.behavior_manager.execute_behavior(maze, situation)
             self.ai_state.decision_timer = 0
+            self._record_decision_time(time.perf_counter_ns() - decision_start)
 
         # Handle movement
         self._handle_movement(maze)
 
+    def _record_decision_time(self, elapsed_ns):
+        # Read by AIBenchmark; decision latency is heavy-tailed so the worst case is kept too
+        self.decisions_made += 1
+        self.last_decision_time_ns = elapsed_ns
+        self.decision_time_ns += elapsed_ns
+        if elapsed_ns > self.max_decision_time_ns:
+            self.max_decision_time_ns = elapsed_ns
+
     def _handle_stuck_situation(self, maze):
         """Handle when AI is stuck"""
         valid_directions = []
@@ -70,7 +98,7 @@ class AIPlayer(PlayerBase):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.next_direction = random.choice(valid_directions)
+            self.next_direction = self.rng.choice(valid_directions)
             self.ai_state.stuck_counter = 0
 
     def _handle_movement(self, maze):
@@ -105,11 +133,13 @@ class AIPlayer(PlayerBase):
                 points = maze.collect_pellet(self.grid_x, self.grid_y)
                 if points > 0:
                     if points == POWER_PELLET_POINTS:
+                        self.power_pellets_collected += 1
                         self.is_invincible = True
                         self.invincibility_timer = self.invincibility_duration
                         self.invincibility_blink_timer = 0.0
                         self.power_timer = self.power_up_duration
                     else:
+                        self.pellets_collected += 1
                         self.invincibility_blink_timer = 0.0
                     self.ai_state.pellet_eaten((self.grid_x, self.grid_y))
                 self.score += points
@@ -120,11 +150,12 @@ class AIPlayer(PlayerBase):
         # Update pixel position
         self._update_pixel_position()
 
-    def render(self, screen, debug=False):
+    def render(self, screen, debug=False, alpha=1.0):
         """Render the AI player with debug info if needed"""
         if self.is_dead():
             return
 
+        pixel_x, pixel_y = self.get_interpolated_position(alpha)
         # Render debug path if available
         if debug and hasattr(self.ai_state, 'path') and self.ai_state.path:
             path_points = []
@@ -135,7 +166,7 @@ class AIPlayer(PlayerBase):
                 pygame.draw.lines(screen, (0, 255, 0), False, path_points, 2)
 
         # Get sprite and render
-        sprite = self.sprite_manager.get_sprite(self.player_id, self.direction.lower())
+        sprite = self.sprite_manager.get_sprite_by_id(self.sprite_ids[self.direction])
         should_render = True
 
         if self.is_invincible and self.power_timer <= 0:
@@ -145,19 +176,24 @@ class AIPlayer(PlayerBase):
 
         if should_render:
             if sprite:
-                render_y = self.pixel_y + self.bob_offset
+                render_y = pixel_y + self.bob_offset
 
                 if debug:
                     # Draw debug grid position
-                    pygame.draw.rect(screen, (255, 0, 0), (self.pixel_x, render_y, CELL_SIZE, CELL_SIZE), 1)
+                    pygame.draw.rect(screen, (255, 0, 0), (pixel_x, render_y, CELL_SIZE, CELL_SIZE), 1)
                     # Draw debug pixel position
-                    pygame.draw.circle(screen, (0, 0, 255), (int(self.pixel_x + CELL_SIZE // 2), int(self.pixel_y + CELL_SIZE // 2)), 3)
+                    pygame.draw.circle(screen, (0, 0, 255), (int(pixel_x + CELL_SIZE // 2), int(pixel_y + CELL_SIZE // 2)), 3)
                     # Draw Algorithm name and Power Timer above the player
-                    font = pygame.font.Font(None, 24)
+                    font = get_debug_font(24)
                     algorithm_text = font.render(f"AI: {self.get_current_algorithm()}", True, (255, 255, 255))
                     power_text = font.render(f"Power: {self.power_timer}", True, (255, 255, 0))
-                    screen.blit(algorithm_text, (self.pixel_x, render_y - 20))
-                    screen.blit(power_text, (self.pixel_x, render_y - 40))
+                    screen.blit(algorithm_text, (pixel_x, render_y - 20))
+                    screen.blit(power_text, (pixel_x, render_y - 40))
+                    # Behaviors with live search stats (e.g. MCTS sims/s) report them through debug_text()
+                    behavior = self.behavior_manager.behaviors.get(self.ai_state.ai_type)
+                    if hasattr(behavior, "debug_text"):
+                        stats_text = font.render(behavior.debug_text(), True, (0, 255, 255))
+                        screen.blit(stats_text, (pixel_x, render_y - 60))
 
                 # Add power mode visual effect
                 if self.power_timer > 0:
@@ -165,19 +201,19 @@ class AIPlayer(PlayerBase):
                     glow_surface.set_alpha(100)
                     glow_color = YELLOW if self.power_timer > 60 else RED
                     pygame.draw.circle(glow_surface, glow_color, (CELL_SIZE // 2 + 2, CELL_SIZE // 2 + 2), CELL_SIZE // 2 + 2)
-                    screen.blit(glow_surface, (self.pixel_x - 2, render_y - 2))
+                    screen.blit(glow_surface, (pixel_x - 2, render_y - 2))
 
-                screen.blit(sprite, (self.pixel_x, render_y))
+                screen.blit(sprite, (pixel_x, render_y))
             else:
                 color = GREEN if self.player_id == "ai1" else ORANGE
                 if self.is_invincible:
                     color = tuple(min(255, c + 100) for c in color)
-                pygame.draw.circle(screen, color, (int(self.pixel_x + CELL_SIZE // 2), int(self.pixel_y + CELL_SIZE // 2)), CELL_SIZE // 2 - 2)
+                pygame.draw.circle(screen, color, (int(pixel_x + CELL_SIZE // 2), int(pixel_y + CELL_SIZE // 2)), CELL_SIZE // 2 - 2)
 
     def change_algorithm(self, new_algorithm):
         if new_algorithm in self.behavior_manager.behaviors:
             self.ai_state.ai_type = new_algorithm
-            print(f"AI Player {self.player_id} algorithm changed to: {new_algorithm}")
+            log_event(f"AI Player {self.player_id} algorithm changed to: {new_algorithm}")
         else:
             available_algorithms = list(self.behavior_manager.behaviors.keys())
             print(f"Invalid algorithm: {new_algorithm}")
@@ -189,6 +225,24 @@ class AIPlayer(PlayerBase):
     def get_available_algorithms(self):
         return list(self.behavior_manager.behaviors.keys())
 
+    def reset_ai(self):
+        """Drop everything the AI learned last match so a restart plays exactly like a fresh game."""
+        self.ai_state = AIState(self.ai_state.ai_type, self.grid_x, self.grid_y)
+        self.pathfinding = PathfindingManager(self)
+        self.decision_maker = DecisionMaker(self)
+        self.escape_planner = EscapePlanner(self)
+        self.behavior_manager = BehaviorManager(self)
+        self.power_timer = 0.0
+        self.animation_timer = 0.0
+        self.bob_offset = 0.0
+        self.total_moves_made = 0
+        self.pellets_collected = 0
+        self.power_pellets_collected = 0
+        self.decisions_made = 0
+        self.decision_time_ns = 0
+        self.max_decision_time_ns = 0
+        self.last_decision_time_ns = 0
+
     def reset_position(self, x, y):
         """Reset AI player position"""
         self.grid_x = x
@@ -1,5 +1,6 @@
 from collections import deque
 from constants import *
+from core.event_log import log_event
 
 
 class AIState:
@@ -78,4 +79,4 @@ class AIState:
         self.corner_been_through.add(corner)
         if len(self.corner_been_through) == 4:
             self.is_through_four_corners = True
-            print("AI has been through all four corners of the maze.")
\ No newline at end of file
+            log_event("AI has been through all four corners of the maze.")
\ No newline at end of file
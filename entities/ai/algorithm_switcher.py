@@ -3,13 +3,107 @@ import os
 from datetime import datetime
 from collections import defaultdict
 import json
+from entities.ai.behaviors.q_learning import has_trained_tables
 
+BENCHMARK_OUTPUT_DIR = "benchmark_results"
+RESULTS_FILENAME = "benchmark_results.jsonl"
 
-import time
-import os
-from datetime import datetime
-from collections import defaultdict
-import json
+
+def _results_path(filename):
+    # Bare file names live in benchmark_results/, anything with a directory is used as given
+    if os.path.dirname(filename):
+        return filename
+    return os.path.join(BENCHMARK_OUTPUT_DIR, filename)
+
+
+def _json_default(value):
+    # Corner/pellet sets end up in records now and then; JSON only knows lists
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_results(filename=RESULTS_FILENAME):
+    """Yield run records from a results file one at a time.
+
+    JSON lines files are streamed, so memory stays flat however many runs they hold. A torn last
+    line from a crash is skipped. Older indented .json dumps ({algorithm: [runs]}) still load,
+    but are read whole.
+    """
+    full_path = _results_path(filename)
+    if not os.path.exists(full_path):
+        print(f"No benchmark results file found at {full_path}")
+        return
+
+    with open(full_path, 'r') as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == '{' and not full_path.endswith('.jsonl'):
+            for runs in json.load(f).values():
+                yield from runs
+            return
+
+        skipped = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+        if skipped:
+            print(f"Skipped {skipped} unreadable line(s) in {full_path}")
+
+
+class BenchmarkResultSink:
+    """Appends one compact JSON line per finished run and flushes them to disk in batches.
+
+    Everything up to the last flush survives a crash; at most flush_every runs are lost.
+    """
+
+    def __init__(self, filename=RESULTS_FILENAME, flush_every=50):
+        self.path = _results_path(filename)
+        self.flush_every = max(1, flush_every)
+        self.pending = []
+        self.written = 0
+
+        output_dir = os.path.dirname(self.path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        self.file = open(self.path, 'a')
+        # A crash mid-write leaves a line without its newline; start ours on a fresh line
+        if self.file.tell() > 0:
+            with open(self.path, 'rb') as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    self.file.write("\n")
+
+    def append(self, record):
+        self.pending.append(json.dumps(record, separators=(',', ':'), default=_json_default))
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write("\n".join(self.pending) + "\n")
+            self.written += len(self.pending)
+            self.pending = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 class AIBenchmark:
@@ -48,6 +142,9 @@ class AIBenchmark:
                 'pathfinding_dfs_nodes_expanded': 0,
                 'pathfinding_astar_nodes_expanded': 0,
                 'pathfinding_ucs_nodes_expanded': 0,
+                'decisions': 0,
+                'mean_decision_ms': 0.0,
+                'max_decision_ms': 0.0,
             },
         }
 
@@ -67,12 +164,11 @@ class AIBenchmark:
         stats['total_moves'] = ai_player.total_moves_made
 
         # Pellets and Power Pellets eaten
-        initial_pellets = len(maze.initial_pellets_set)  # Cần maze lưu trữ tổng số chấm ban đầu
-        current_pellets_left = len(ai_player.ai_state.uncollected_pellets)
-        current_power_pellets_left = len(ai_player.ai_state.power_pellets_remaining)
-
-        stats['pellets_eaten'] = initial_pellets - current_pellets_left
-        stats['power_pellets_eaten'] = len(maze.initial_power_pellets_set) - current_power_pellets_left  # Cần maze lưu trữ ban đầu
+        # Counted on the player itself: ai_state only tracks uncollected pellets for all_food_collector
+        self.current_test['initial_pellet_count'] = len(maze.initial_pellets_set)
+        self.current_test['initial_power_pellet_count'] = len(maze.initial_power_pellets_set)
+        stats['pellets_eaten'] = ai_player.pellets_collected
+        stats['power_pellets_eaten'] = ai_player.power_pellets_collected
 
         # Ghost stats from AIState
         stats['ghosts_eaten'] = ai_player.ai_state.algorithm_stats['ghosts_eaten']
@@ -83,12 +179,17 @@ class AIBenchmark:
         stats['corners_visited_count'] = len(ai_player.ai_state.corner_been_through)
         stats['all_corners_visited'] = ai_player.ai_state.is_through_four_corners
 
-        # Pathfinding stats (nodes expanded)
-        # Assuming PathfindingManager accumulates these and AIState has access
-        stats['pathfinding_bfs_nodes_expanded'] = ai_player.pathfinding.total_nodes_expanded.get("bfs", 0)
-        stats['pathfinding_dfs_nodes_expanded'] = ai_player.pathfinding.total_nodes_expanded.get("dfs", 0)
-        stats['pathfinding_astar_nodes_expanded'] = ai_player.pathfinding.total_nodes_expanded.get("astar", 0)
-        stats['pathfinding_ucs_nodes_expanded'] = ai_player.pathfinding.total_nodes_expanded.get("ucs", 0)
+        # Pathfinding stats: nodes expanded over every search this game (PathfindingManager is rebuilt per game)
+        stats['pathfinding_bfs_nodes_expanded'] = ai_player.pathfinding.cumulative_nodes_expanded.get("bfs", 0)
+        stats['pathfinding_dfs_nodes_expanded'] = ai_player.pathfinding.cumulative_nodes_expanded.get("dfs", 0)
+        stats['pathfinding_astar_nodes_expanded'] = ai_player.pathfinding.cumulative_nodes_expanded.get("astar", 0)
+        stats['pathfinding_ucs_nodes_expanded'] = ai_player.pathfinding.cumulative_nodes_expanded.get("ucs", 0)
+
+        # Decision latency (analyze_situation + execute_behavior)
+        decisions = ai_player.decisions_made
+        stats['decisions'] = decisions
+        stats['mean_decision_ms'] = ai_player.decision_time_ns / decisions / 1e6 if decisions else 0.0
+        stats['max_decision_ms'] = ai_player.max_decision_time_ns / 1e6
 
     def end_benchmark(self, game_result, final_duration):
         """
@@ -109,68 +210,68 @@ class AIBenchmark:
         # Clear current test
         self.current_test = None
 
-    def save_results(self, filename="benchmark_results.json"):
-        """Save all collected benchmark results to a JSON file."""
-        output_dir = "benchmark_results"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+    def save_results(self, filename=RESULTS_FILENAME):
+        """Append all collected benchmark results to a JSON lines file."""
+        with BenchmarkResultSink(filename) as sink:
+            for algo_results in self.results.values():
+                for test_run in algo_results:
+                    sink.append(test_run)
+        print(f"Benchmark results saved to {sink.path}")
+
+    def load_results(self, filename=RESULTS_FILENAME):
+        """Return a lazy iterator over the saved run records; see iter_results()."""
+        return iter_results(filename)
+
+    def _iter_records(self, records_source=None):
+        # None -> runs collected in memory, a str -> a saved results file, anything else -> an iterable of records
+        if records_source is None:
+            return (run for runs in self.results.values() for run in runs)
+        if isinstance(records_source, str):
+            return iter_results(records_source)
+        return iter(records_source)
+
+    def summarize_results(self, records_source=None, metrics=("win", "moves_to_win", "nodes_expanded", "mean_decision_ms", "wall_time_seconds")):
+        """Print win/loss counts and p50/p90/p99, std and a 95% bootstrap CI per algorithm."""
+        from entities.ai import benchmark_stats
+
+        rows = benchmark_stats.summarize_records(self._iter_records(records_source), group_by=("algorithm",), metrics=list(metrics) + ["deaths"])
+        if not rows:
+            print("\nNo benchmark runs to summarize.")
+            return rows
 
-        full_path = os.path.join(output_dir, filename)
-
-        # Convert defaultdict to dict for JSON serialization
-        results_to_save = dict(self.results)
-
-        # Make sets JSON serializable by converting them to lists or tuples
-        for algo_results in results_to_save.values():
-            for test_run in algo_results:
-                if 'stats' in test_run and 'all_corners_visited' in test_run['stats']:
-                    # Remove the specific stats that might cause issues if not needed in saved data
-                    # Or convert them to a serializable format if needed
-                    pass
-                # Ensure tuples/sets are converted to lists
-                if 'corner_been_through' in test_run['ai_state']:  # Assuming ai_state is directly in test_run
-                    test_run['ai_state']['corner_been_through'] = list(test_run['ai_state']['corner_been_through'])
-
-        with open(full_path, 'w') as f:
-            json.dump(results_to_save, f, indent=4)
-        print(f"Benchmark results saved to {full_path}")
-
-    def load_results(self, filename="benchmark_results.json"):
-        """Load benchmark results from a JSON file."""
-        full_path = os.path.join("benchmark_results", filename)
-        if os.path.exists(full_path):
-            with open(full_path, 'r') as f:
-                loaded_results = json.load(f)
-                self.results = defaultdict(list, loaded_results)
-            print(f"Benchmark results loaded from {full_path}")
-        else:
-            print(f"No benchmark results file found at {full_path}")
-
-    def summarize_results(self):
-        """Prints a summary of the collected benchmark results."""
         print("\n--- AI Benchmark Summary ---")
-        for algo, runs in self.results.items():
-            print(f"\nAlgorithm: {algo}")
-            total_duration = sum(r['stats']['duration_seconds'] for r in runs if r['stats']['game_result'] == 'WIN')
-            total_moves = sum(r['stats']['total_moves'] for r in runs)
-            total_pellets = sum(r['stats']['pellets_eaten'] for r in runs)
-            total_ghosts_eaten = sum(r['stats']['ghosts_eaten'] for r in runs)
-            total_deaths = sum(r['stats']['deaths'] for r in runs)
-            wins = sum(1 for r in runs if r['stats']['game_result'] == 'WIN')
-            losses = sum(1 for r in runs if r['stats']['game_result'] == 'LOSS')
-            total_runs = len(runs)
-
-            avg_duration = total_duration / wins if wins > 0 else 0
-            avg_moves = total_moves / total_runs if total_runs > 0 else 0
-
-            print(f"  Total Runs: {total_runs}")
-            print(f"  Wins: {wins} ({wins/total_runs*100:.2f}%)")
-            print(f"  Losses: {losses} ({losses/total_runs*100:.2f}%)")
-            print(f"  Avg. Duration (Wins): {avg_duration:.2f} s")
-            print(f"  Avg. Total Moves: {avg_moves:.0f}")
-            print(f"  Total Pellets Eaten: {total_pellets}")
-            print(f"  Total Ghosts Eaten: {total_ghosts_eaten}")
-            print(f"  Total Deaths: {total_deaths}")
+        current_algorithm = None
+        for row in rows:
+            if row['algorithm'] != current_algorithm:
+                current_algorithm = row['algorithm']
+                print(f"\nAlgorithm: {current_algorithm}")
+            if row['metric'] == 'win':
+                print(f"  Runs: {row['n']}  Win rate: {row['mean'] * 100:.1f}% (95% CI {row['ci_low'] * 100:.1f}-{row['ci_high'] * 100:.1f}%)")
+            elif row['metric'] == 'deaths':
+                print(f"  Total Deaths: {row['mean'] * row['n']:.0f}")
+            else:
+                print(
+                    f"  {row['metric']}: p50 {row['p50']:.4g}  p90 {row['p90']:.4g}  p99 {row['p99']:.4g}  "
+                    f"mean {row['mean']:.4g} ± {row['std']:.3g}  CI [{row['ci_low']:.4g}, {row['ci_high']:.4g}]  (n={row['n']})"
+                )
+        return rows
+
+    def export_summary(self, basename="benchmark_summary", records_source=None):
+        """Write per-algorithm and per-algorithm-and-maze summary tables as CSV and Markdown."""
+        from entities.ai import benchmark_stats
+
+        if records_source is not None and not isinstance(records_source, str):
+            records_source = list(records_source)  # Read twice below
+        written = []
+        for suffix, group_by in (("by_algorithm", ("algorithm",)), ("by_maze", ("algorithm", "maze"))):
+            rows = benchmark_stats.summarize_records(self._iter_records(records_source), group_by=group_by)
+            csv_path = _results_path(f"{basename}_{suffix}.csv")
+            md_path = _results_path(f"{basename}_{suffix}.md")
+            benchmark_stats.write_csv(rows, csv_path)
+            benchmark_stats.write_markdown(rows, md_path, title=f"Benchmark summary ({suffix.replace('_', ' ')})")
+            written.extend([csv_path, md_path])
+        print(f"Benchmark summary written to {', '.join(written)}")
+        return written
 
 
 class AlgorithmSwitcher:
@@ -185,7 +286,12 @@ class AlgorithmSwitcher:
             "competitive",
             "all_food_collector",
             "four_corner_problem",
+            "q_learning",
+            "mcts",
         ]
+        if not has_trained_tables():
+            # Without a table q_learning only replays simple_bfs, which would just duplicate it in sweeps
+            self.available_algorithms.remove("q_learning")
         self.current_algorithm_index = 0
         self.current_algorithm = self.available_algorithms[0]
 
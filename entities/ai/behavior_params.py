@@ -0,0 +1,69 @@
+import json
+import os
+
+# name: (default, low, high, integer). Defaults are the hand-picked numbers the behaviors always
+# used; low/high bound the search in game/tuning.py.
+PARAMETERS = {
+    # PathfindingManager get_cost (A* and UCS)
+    'ghost_detect_distance': (3, 1, 6, True),
+    'ghost_proximity_penalty': (10, 0, 40, False),  # Per cell closer than ghost_detect_distance
+    'visited_cell_penalty': (0.5, 0, 3, False),
+    'pellet_reward': (5, 0, 15, False),
+    # EscapePlanner: search depth in AI moves, and leaf scoring
+    'escape_lookahead': (8, 3, 12, True),
+    'escape_ghost_distance_weight': (4, 0, 12, False),
+    'escape_power_bonus': (20, 0, 60, False),
+    'escape_power_distance_weight': (2, 0, 8, False),
+    'escape_pellet_bonus': (15, 0, 40, False),
+    # SmartHunterBehavior target values, divided by (distance + 1)
+    'hunter_ghost_value': (100, 0, 300, False),
+    'hunter_pellet_value': (10, 1, 50, False),
+    'hunter_power_value': (50, 0, 200, False),
+}
+
+
+class BehaviorParams:
+    """The weights behind the AI's heuristics, as one object the behaviors read through their AIPlayer."""
+
+    def __init__(self, **values):
+        for name, (default, _, _, _) in PARAMETERS.items():
+            setattr(self, name, default)
+        self.update(values)
+
+    def update(self, values):
+        for name, value in values.items():
+            if name not in PARAMETERS:
+                # Weights files outlive parameters that get retired; the rest of the file still applies
+                print(f"Skipping unknown behavior parameter: {name}")
+                continue
+            setattr(self, name, int(round(value)) if PARAMETERS[name][3] else value)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in PARAMETERS}
+
+    def save(self, path, **extra):
+        """Write the weights as JSON, with any extra fields (fitness, ai_type...) alongside."""
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        with open(path, 'w') as f:
+            json.dump(dict(extra, params=self.to_dict()), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(**data.get('params', data))
+
+
+# Every AIPlayer created without explicit params reads these, so loading weights at startup
+# (main.py --weights) changes the AI everywhere
+DEFAULT_PARAMS = BehaviorParams()
+
+
+def load_default_params(path):
+    """Replace the shared default weights, in place, with the ones saved at path."""
+    loaded = BehaviorParams.load(path)
+    DEFAULT_PARAMS.update(loaded.to_dict())
+    print(f"Loaded behavior weights from {path}")
+    return DEFAULT_PARAMS
@@ -1,5 +1,4 @@
 from .base_behavior import BaseBehavior
-import random
 from constants import DIRECTIONS
 
 
@@ -203,6 +202,6 @@ class AllFoodCollectionBehavior(BaseBehavior):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.ai_player.next_direction = random.choice(valid_directions)
+            self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
         else:
             self.ai_player.next_direction = self.ai_player.direction  # Stay put if no valid moves
@@ -4,6 +4,9 @@ from .competitive import CompetitiveBehavior
 from .simple import SimpleBFSBehavior, SimpleDFSBehavior, SimpleUCSBehavior, SimpleAStarBehavior
 from .all_food_collecter import AllFoodCollectionBehavior
 from .four_corner_problem import FourCornerProblemBehavior
+from .q_learning import QLearningBehavior
+from .mcts import MCTSBehavior
+from core.trace_recorder import tracer
 
 
 class BehaviorManager:
@@ -19,10 +22,15 @@ class BehaviorManager:
             "simple_astar": SimpleAStarBehavior(ai_player),
             "all_food_collector": AllFoodCollectionBehavior(ai_player),
             "four_corner_problem": FourCornerProblemBehavior(ai_player),
+            "q_learning": QLearningBehavior(ai_player),
+            "mcts": MCTSBehavior(ai_player),
         }
 
     def execute_behavior(self, maze, situation):
         """Execute the appropriate AI behavior"""
         behavior_type = self.ai_player.ai_state.ai_type
         behavior = self.behaviors.get(behavior_type, self.behaviors["simple_bfs"])
+        started = tracer.begin()
         behavior.execute(maze, situation)
+        if started:
+            tracer.end("execute_behavior", started, "ai", {'behavior': behavior_type, 'player': self.ai_player.player_id})
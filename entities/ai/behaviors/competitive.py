@@ -1,13 +1,12 @@
 from .base_behavior import BaseBehavior
 from constants import DIRECTIONS
-import random
 
 
 class CompetitiveBehavior(BaseBehavior):
     def execute(self, maze, situation):
         """Competitive behavior that tries to outperform the human player"""
         # Check if we should compete directly with player
-        if not situation.get('has_power'):
+        if not situation.get('has_power') and situation['ghost_distances']:
             min_ghost_distance = min(dist for _, dist in situation['ghost_distances'])
             if min_ghost_distance <= 4 and not self.ai_player.is_invincible:
                 self._escape_from_ghosts(maze, situation['ghost_distances'])  # Now uses base class method
@@ -1,6 +1,6 @@
 from .base_behavior import BaseBehavior
-import random
 from constants import DIRECTIONS
+from core.event_log import log_event
 
 
 class FourCornerProblemBehavior(BaseBehavior):
@@ -41,15 +41,15 @@ class FourCornerProblemBehavior(BaseBehavior):
                     self._set_direction_to_position(next_pos)
                 else:
                     # If pathfinding fails, fallback to basic movement
-                    print("Pathfinding failed, falling back to basic movement.")
+                    log_event("Pathfinding failed, falling back to basic movement.")
                     self._fallback_behavior(maze, situation)
             else:
                 # If no corners are reachable, fallback to basic movement
-                print("No reachable corners, falling back to basic movement.")
+                log_event("No reachable corners, falling back to basic movement.")
                 self._fallback_behavior(maze, situation)
         else:
             # If no corners left, fallback to basic movement
-            print("No corners left, falling back to basic movement.")
+            log_event("No corners left, falling back to basic movement.")
             self._fallback_behavior(maze, situation)
 
     def _find_corners(self, maze):
@@ -136,9 +136,7 @@ class FourCornerProblemBehavior(BaseBehavior):
             if self.ai_player.direction in valid_directions:
                 self.ai_player.next_direction = self.ai_player.direction
             else:
-                import random
-
-                self.ai_player.next_direction = random.choice(valid_directions)
+                self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
 
     def _get_best_direction_for_target(self, maze, target):
         current_pos = (self.ai_player.grid_x, self.ai_player.grid_y)
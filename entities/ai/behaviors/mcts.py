@@ -0,0 +1,487 @@
+import atexit
+import math
+import multiprocessing
+import random
+import time
+from .base_behavior import BaseBehavior
+from constants import DIRECTIONS, CELL_SIZE, AI_SPEED, PELLET_POINTS, POWER_PELLET_POINTS, MCTS_TIME_BUDGET_MS, MCTS_ITERATIONS, MCTS_ROOT_PROCESSES
+from entities.ghosts.inky_ghost import InkyGhost
+
+AI_CELL_TICKS = CELL_SIZE / AI_SPEED
+TURN_WINDOW = 0.3  # AIPlayer only takes a new direction while movement_progress is at most this
+HORIZON = 12  # AI moves per simulated future, tree and rollout together
+DISCOUNT = 0.97  # Per AI move, so the same pellet is worth more sooner
+EXPLORATION = 40.0  # UCT constant, in score points
+GHOST_POINTS = 200
+HIT_PENALTY = 300
+CLEAR_BONUS = 500
+REVERSE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+_root_pool = None
+_root_pool_size = 0
+
+
+class _Walls:
+    """The one MazeState method the ghost's movement code calls, over a set small enough to send to workers."""
+
+    def __init__(self, open_cells):
+        self.open_cells = open_cells
+
+    def is_valid_position(self, x, y):
+        return (x, y) in self.open_cells
+
+
+class _GhostModel(InkyGhost):
+    """InkyGhost's own rules (moving_algorithm, choose_greedy_direction, a_star_pathfind,
+    state_change) on a bare copy of its state: no sprites, pixels or animation.
+    """
+
+    FIELDS = (
+        "grid_x", "grid_y", "direction", "next_direction", "target_grid", "ai_mode", "mode_timer", "first_frightened", "is_enraged",
+        "current_path", "path_recalculation_timer", "path_recalculation_interval", "behavior_switch_interval", "base_speed", "speed",
+        "enraged_speed_multiplier", "positions",
+    )
+
+    def __init__(self, fields, rng):
+        # Deliberately skips InkyGhost.__init__: only the movement state is needed
+        self.__dict__.update(fields)
+        self.current_path = list(self.current_path)
+        self.rng = rng
+
+    @classmethod
+    def fields_of(cls, ghost):
+        fields = {name: getattr(ghost, name, None) for name in cls.FIELDS}
+        fields['current_path'] = list(ghost.current_path)
+        if fields['target_grid'] is None:
+            fields['target_grid'] = (ghost.grid_x, ghost.grid_y)  # Not set until the ghost's first move
+        return fields
+
+    def clone(self):
+        copy = _GhostModel.__new__(_GhostModel)
+        copy.__dict__.update(self.__dict__)
+        copy.current_path = list(self.current_path)
+        return copy
+
+
+class _PlanState:
+    """Grid-level game state for planning, advanced one AI move at a time.
+
+    Time runs in ticks between events (the AI or the ghost reaching a cell), with the ghost moving
+    by its real rules. Pellet sets are frozen once per decision and shared by every simulated state;
+    a state copies its set of eaten cells only when it first eats something.
+    """
+
+    __slots__ = (
+        "walls", "ai", "direction", "progress", "opponent", "ghost", "ghost_wait", "power", "invincible", "health",
+        "durations", "pellets", "power_pellets", "eaten", "eaten_owned", "pellets_left", "over",
+    )
+
+    @classmethod
+    def from_snapshot(cls, snapshot, rng):
+        state = cls()
+        state.walls = _Walls(snapshot['open_cells'])
+        state.ai = snapshot['ai']
+        state.direction = snapshot['direction']
+        state.progress = snapshot['progress']
+        state.opponent = snapshot['opponent']
+        state.ghost = _GhostModel(snapshot['ghost'], rng) if snapshot['ghost'] is not None else None
+        state.ghost_wait = snapshot['ghost_wait']
+        state.power = snapshot['power']
+        state.invincible = snapshot['invincible']
+        state.health = snapshot['health']
+        state.durations = snapshot['durations']
+        state.pellets = snapshot['pellets']
+        state.power_pellets = snapshot['power_pellets']
+        state.eaten = ()
+        state.eaten_owned = False
+        state.pellets_left = len(state.pellets) + len(state.power_pellets)
+        state.over = False
+        return state
+
+    def clone(self):
+        copy = _PlanState.__new__(_PlanState)
+        for name in _PlanState.__slots__:
+            setattr(copy, name, getattr(self, name))
+        if self.ghost is not None:
+            copy.ghost = self.ghost.clone()
+        copy.eaten_owned = False
+        return copy
+
+    def valid_actions(self):
+        x, y = self.ai
+        return [direction for direction, (dx, dy) in DIRECTIONS.items() if (x + dx, y + dy) in self.walls.open_cells]
+
+    def has_pellet(self, cell):
+        return (cell in self.pellets or cell in self.power_pellets) and cell not in self.eaten
+
+    def step(self, action=None):
+        """Head in `action` (None: keep going) until the AI reaches the next cell. Returns the reward on the way."""
+        if action is not None:
+            self.direction = action
+        dx, dy = DIRECTIONS[self.direction]
+        target = (self.ai[0] + dx, self.ai[1] + dy)
+        ai_wait = AI_CELL_TICKS * (1 - self.progress)
+        self.progress = 0.0
+        moving = target in self.walls.open_cells
+        reward = 0
+
+        while True:
+            ghost = self.ghost
+            if ghost is not None and self.ghost_wait < ai_wait:
+                elapsed = self.ghost_wait
+                self._elapse(elapsed)
+                ai_wait -= elapsed
+                reward += self._ghost_arrives()
+                if self.over:
+                    return reward
+            else:
+                self._elapse(ai_wait)
+                if ghost is not None:
+                    self.ghost_wait -= ai_wait
+                if moving:
+                    self.ai = target
+                    reward += self._eat(target)
+                return reward + self._collide()
+
+    def leaf_value(self):
+        """Small pull towards the nearest remaining pellet, so futures without any food still differ."""
+        if self.over:
+            return 0
+        x, y = self.ai
+        remaining = [p for p in self.pellets if p not in self.eaten] or [p for p in self.power_pellets if p not in self.eaten]
+        if not remaining:
+            return 0
+        return -min(abs(px - x) + abs(py - y) for px, py in remaining)
+
+    def _elapse(self, ticks):
+        if self.power > 0:
+            self.power -= ticks
+        if self.invincible > 0:
+            self.invincible -= ticks
+
+        # The mode switches InkyGhost.update makes, minus enraging (too rare to matter within the horizon)
+        ghost = self.ghost
+        if ghost is None:
+            return
+        if self.power > 0:
+            if ghost.ai_mode != "FRIGHTENED":
+                ghost.state_change("FRIGHTENED")
+                ghost.mode_timer = 0
+        elif ghost.ai_mode == "FRIGHTENED":
+            ghost.state_change("ENRAGED" if ghost.is_enraged else "CHASE")
+            ghost.mode_timer = 0
+        elif ghost.ai_mode in ("CHASE", "SCATTER"):
+            ghost.mode_timer += ticks
+            if ghost.mode_timer >= ghost.behavior_switch_interval:
+                ghost.state_change("SCATTER" if ghost.ai_mode == "CHASE" else "CHASE")
+                ghost.mode_timer = 0
+
+    def _ghost_arrives(self):
+        ghost = self.ghost
+        ghost.grid_x, ghost.grid_y = ghost.target_grid
+        reward = self._collide()
+        if self.ghost is None or self.over:
+            return reward
+
+        players = [self.opponent, self.ai]
+        ghost.moving_algorithm(self.walls, players)
+        if ghost.target_grid == (ghost.grid_x, ghost.grid_y):
+            # Reached a path waypoint: the real ghost picks its next step on the following tick
+            ghost.moving_algorithm(self.walls, players)
+        if ghost.target_grid == (ghost.grid_x, ghost.grid_y):
+            self.ghost_wait = 1.0
+        else:
+            self.ghost_wait = CELL_SIZE / ghost.speed
+        return reward
+
+    def _eat(self, cell):
+        if cell in self.eaten:
+            return 0
+        if cell in self.pellets:
+            points = PELLET_POINTS
+        elif cell in self.power_pellets:
+            points = POWER_PELLET_POINTS
+            self.power, self.invincible = self.durations
+        else:
+            return 0
+
+        if not self.eaten_owned:
+            self.eaten = set(self.eaten)
+            self.eaten_owned = True
+        self.eaten.add(cell)
+        self.pellets_left -= 1
+        if self.pellets_left == 0:
+            self.over = True
+            points += CLEAR_BONUS
+        return points
+
+    def _collide(self):
+        ghost = self.ghost
+        if ghost is None or (ghost.grid_x, ghost.grid_y) != self.ai:
+            return 0
+        if self.power > 0:
+            self.ghost = None  # Eaten; it stays in the pen longer than the horizon
+            return GHOST_POINTS
+        if self.invincible > 0:
+            return 0
+        self.health -= 1
+        if self.health <= 0:
+            self.over = True
+        else:
+            self.invincible = self.durations[1]
+        return -HIT_PENALTY
+
+
+class _Node:
+    """Open-loop tree node: statistics for an action sequence from the root, not for one exact state."""
+
+    __slots__ = ("cell", "visits", "value", "children", "untried")
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+        self.untried = None
+
+
+def _rollout_action(state, rng):
+    """Default policy: no reversing, avoid the ghost's cells unless powered, prefer food."""
+    actions = state.valid_actions()
+    forward = [action for action in actions if action != REVERSE[state.direction]] or actions
+    ghost = state.ghost
+    if ghost is not None and state.power <= 0:
+        danger = ((ghost.grid_x, ghost.grid_y), ghost.target_grid)
+        forward = [action for action in forward if _next_cell(state.ai, action) not in danger] or forward
+    food = [action for action in forward if state.has_pellet(_next_cell(state.ai, action))]
+    return rng.choice(food or forward)
+
+
+def _next_cell(cell, action):
+    dx, dy = DIRECTIONS[action]
+    return (cell[0] + dx, cell[1] + dy)
+
+
+def _iterate(root, root_state, rng):
+    state = root_state.clone()
+    node = root
+    path = [root]
+    total = 0.0
+    discount = 1.0
+    depth = 0
+
+    # Selection and expansion (UCT), then a default-policy rollout to the horizon
+    while not state.over and depth < HORIZON:
+        if node.untried is None:
+            node.untried = state.valid_actions()
+        expanding = bool(node.untried)
+        if expanding:
+            action = node.untried.pop()
+        else:
+            log_visits = math.log(node.visits)
+            action = max(
+                node.children,
+                key=lambda a: node.children[a].value / node.children[a].visits + EXPLORATION * math.sqrt(log_visits / node.children[a].visits),
+            )
+        total += discount * state.step(action)
+        discount *= DISCOUNT
+        depth += 1
+        child = node.children.get(action)
+        if child is None:
+            child = node.children[action] = _Node(state.ai)
+        node = child
+        path.append(node)
+        if expanding:
+            break
+
+    while not state.over and depth < HORIZON:
+        total += discount * state.step(_rollout_action(state, rng))
+        discount *= DISCOUNT
+        depth += 1
+    total += discount * state.leaf_value()
+
+    for node in path:
+        node.visits += 1
+        node.value += total
+
+
+def _search(root, root_state, rng, budget, iterations):
+    """Run iterations until `budget` seconds pass (or `iterations` of them when budget is 0). Returns how many ran."""
+    done = 0
+    if budget > 0:
+        deadline = time.perf_counter() + budget
+        while True:
+            _iterate(root, root_state, rng)
+            done += 1
+            if time.perf_counter() >= deadline:
+                break
+    else:
+        for _ in range(iterations):
+            _iterate(root, root_state, rng)
+        done = iterations
+    return done
+
+
+def _root_state(snapshot, rng):
+    state = _PlanState.from_snapshot(snapshot, rng)
+    if snapshot['committed']:
+        # Past the turn window the AI finishes this move whatever we decide; plan from the next cell
+        state.step()
+    return state
+
+
+def search_root(job):
+    """Root-parallel worker: an independent search from the same snapshot. Top level so multiprocessing can pickle it.
+
+    job is (snapshot, budget, iterations, seed); returns ({action: (visits, value)}, iterations run).
+    """
+    snapshot, budget, iterations, seed = job
+    rng = random.Random(seed)
+    state = _root_state(snapshot, rng)
+    root = _Node(state.ai)
+    if state.over:
+        return {}, 0
+    done = _search(root, state, rng, budget, iterations)
+    return {action: (child.visits, child.value) for action, child in root.children.items()}, done
+
+
+def _get_root_pool(processes):
+    global _root_pool, _root_pool_size
+    if _root_pool is None or _root_pool_size != processes:
+        if _root_pool is not None:
+            _root_pool.terminate()
+        else:
+            atexit.register(_close_root_pool)
+        # Spawned workers start clean instead of inheriting the parent's pygame/SDL state
+        _root_pool = multiprocessing.get_context("spawn").Pool(processes)
+        _root_pool_size = processes
+    return _root_pool
+
+
+def _close_root_pool():
+    global _root_pool
+    if _root_pool is not None:
+        _root_pool.terminate()
+        _root_pool = None
+
+
+class MCTSBehavior(BaseBehavior):
+    """Monte Carlo Tree Search over the AI's next moves, with the ghost simulated by its own code.
+
+    Each decision runs MCTS_ITERATIONS simulations, so seeded games and replays are reproducible.
+    A wall-clock budget (default_time_budget_ms, main.py --mcts-think-ms) is opt-in for
+    interactive play, where a steady frame time matters more than repeatability. The tree
+    is kept between decisions: while the AI is still deciding for the same cell the search goes
+    on from the same root, and once it reaches the cell it chose the root moves to that child.
+    With MCTS_ROOT_PROCESSES workers, each also searches the root from scratch and their root
+    statistics are added to ours before the most visited move is taken.
+    """
+
+    default_time_budget_ms = MCTS_TIME_BUDGET_MS
+
+    def __init__(self, ai_player):
+        super().__init__(ai_player)
+        self.time_budget_ms = self.default_time_budget_ms
+        self.iterations = MCTS_ITERATIONS
+        self.processes = MCTS_ROOT_PROCESSES
+        self.rng = random.Random()
+        self.root = None
+        self.last_action = None
+        self.last_simulations = 0
+        self.sims_per_second = 0.0
+        self.open_cells = None
+        self.open_cells_key = None
+        self.stand_in_ghost = None
+
+    def execute(self, maze, situation):
+        snapshot = self._snapshot(maze, situation)
+        # Seeded off the match RNG so fixed-iteration searches replay exactly
+        seed = self.ai_player.rng.getrandbits(32)
+        self.rng.seed(seed)
+        state = _root_state(snapshot, self.rng)
+        if state.over:
+            return
+
+        started = time.perf_counter()
+        budget = self.time_budget_ms / 1000
+        pending = None
+        if self.processes > 0:
+            jobs = [(snapshot, budget, self.iterations, seed + worker + 1) for worker in range(self.processes)]
+            pending = _get_root_pool(self.processes).map_async(search_root, jobs)
+
+        root = self._reuse_root(state.ai)
+        simulations = _search(root, state, self.rng, budget, self.iterations)
+
+        totals = {action: [child.visits, child.value] for action, child in root.children.items()}
+        if pending is not None:
+            for stats, done in pending.get():
+                simulations += done
+                for action, (visits, value) in stats.items():
+                    total = totals.setdefault(action, [0, 0.0])
+                    total[0] += visits
+                    total[1] += value
+
+        elapsed = time.perf_counter() - started
+        self.last_simulations = simulations
+        self.sims_per_second = simulations / elapsed if elapsed > 0 else 0.0
+        if not totals:
+            return
+        action = max(totals, key=lambda a: (totals[a][0], totals[a][1] / max(1, totals[a][0])))
+        self.root = root
+        self.last_action = action
+        self.ai_player.next_direction = action
+
+    def debug_text(self):
+        return f"MCTS {self.sims_per_second:.0f} sims/s ({self.last_simulations}/decision)"
+
+    def _reuse_root(self, cell):
+        root = self.root
+        if root is not None:
+            if root.cell == cell:
+                return root
+            child = root.children.get(self.last_action)
+            if child is not None and child.cell == cell:
+                return child
+        return _Node(cell)
+
+    def _snapshot(self, maze, situation):
+        """Everything the search needs, as plain picklable values."""
+        player = self.ai_player
+        key = (id(maze.layout), maze.layout_version)
+        if key != self.open_cells_key:
+            self.open_cells_key = key
+            self.open_cells = frozenset((x, y) for y in range(maze.height) for x in range(maze.width) if maze.is_valid_position(x, y))
+
+        ghost = next((g for g in player.ghosts if not g.is_dead()), None)
+        if ghost is None and situation.get('ghost_distances'):
+            # Only positions to go on: a fresh InkyGhost at the nearest one stands in
+            position = min(situation['ghost_distances'], key=lambda item: item[1])[0]
+            if self.stand_in_ghost is None:
+                self.stand_in_ghost = InkyGhost("inky", position[0], position[1], None)
+            ghost = self.stand_in_ghost
+            ghost.reset_position(position[0], position[1])
+            ghost.target_grid = position
+
+        ghost_fields, ghost_wait = None, 0.0
+        if ghost is not None:
+            ghost_fields = _GhostModel.fields_of(ghost)
+            tx, ty = ghost_fields['target_grid']
+            ghost_wait = math.hypot(tx * CELL_SIZE - ghost.pixel_x, ty * CELL_SIZE - ghost.pixel_y) / ghost.speed
+
+        progress = player.movement_progress if player.moving else 0.0
+        return {
+            'open_cells': self.open_cells,
+            'ai': (player.grid_x, player.grid_y),
+            'direction': player.direction,
+            'progress': progress,
+            'committed': progress > TURN_WINDOW,
+            'opponent': situation.get('player_position'),
+            'ghost': ghost_fields,
+            'ghost_wait': ghost_wait,
+            'power': player.power_timer,
+            'invincible': player.invincibility_timer if player.is_invincible else 0,
+            'health': player.health,
+            'durations': (player.power_up_duration, player.invincibility_duration),
+            'pellets': frozenset(maze.pellets),
+            'power_pellets': frozenset(maze.power_pellets),
+        }
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import numpy as np
+from .base_behavior import BaseBehavior
+from constants import DIRECTIONS
+
+Q_TABLE_DIR = "qtables"
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+# 0 means "none" (no live ghost / no pellet left), then one slot per action
+RELATIVE_DIRECTIONS = 1 + len(ACTIONS)
+GHOST_DISTANCE_BUCKETS = (2, 4, 8)  # Manhattan upper bounds; anything further shares the last bucket
+# Per cell: ghost direction, ghost distance bucket, power flag, nearest-pellet direction
+STATE_SHAPE = (RELATIVE_DIRECTIONS, len(GHOST_DISTANCE_BUCKETS) + 1, 2, RELATIVE_DIRECTIONS)
+
+_mapped_tables = {}  # path -> read-only memmap, shared by every AIPlayer in the process
+_missing_tables_reported = set()
+_table_dir = Q_TABLE_DIR  # Where games look for tables; main.py --q-table-dir changes it
+
+
+def layout_fingerprint(maze):
+    """Short hash of the maze's walls. Cell ids only mean something for one wall layout, so each gets its own table."""
+    walls = bytes(1 if maze.is_wall(x, y) else 0 for y in range(maze.height) for x in range(maze.width))
+    return hashlib.sha1(bytes([maze.width, maze.height]) + walls).hexdigest()[:12]
+
+
+def set_table_dir(table_dir):
+    """Read tables from table_dir instead of qtables/, e.g. ones trained with q_training --table-dir."""
+    global _table_dir
+    _table_dir = table_dir
+
+
+def q_table_path(maze, table_dir=None):
+    return os.path.join(table_dir or _table_dir, f"q_learning_{layout_fingerprint(maze)}.npy")
+
+
+def has_trained_tables(table_dir=None):
+    """True once python -m game.q_training has written at least one table."""
+    table_dir = table_dir or _table_dir
+    return os.path.isdir(table_dir) and any(name.startswith("q_learning_") and name.endswith(".npy") for name in os.listdir(table_dir))
+
+
+def new_q_table(maze):
+    return np.zeros((maze.width * maze.height,) + STATE_SHAPE + (len(ACTIONS),), dtype=np.float32)
+
+
+def relative_direction(origin, target):
+    """Index into (none,) + ACTIONS of the dominant axis from origin towards target."""
+    dx = target[0] - origin[0]
+    dy = target[1] - origin[1]
+    if dx == 0 and dy == 0:
+        return 0
+    if abs(dx) >= abs(dy):
+        return 4 if dx > 0 else 3
+    return 2 if dy > 0 else 1
+
+
+def distance_bucket(distance):
+    for bucket, limit in enumerate(GHOST_DISTANCE_BUCKETS):
+        if distance <= limit:
+            return bucket
+    return len(GHOST_DISTANCE_BUCKETS)
+
+
+class QLearningBehavior(BaseBehavior):
+    """Acts from a Q-table trained offline with python -m game.q_training.
+
+    The state is the AI's cell plus a few coarse features of the situation DecisionMaker already
+    built, so a decision is one table row lookup instead of a search. Tables are per wall layout
+    and memory-mapped read-only, so every AIPlayer shares the OS page cache instead of a copy.
+
+    While self.learner is set (only during training) it picks the actions and updates the table.
+    """
+
+    def __init__(self, ai_player):
+        super().__init__(ai_player)
+        self.table = None
+        self.table_key = None
+        self.learner = None
+
+    def execute(self, maze, situation):
+        table = self._table_for(maze)
+        valid = self.valid_actions(maze)
+        if not valid:
+            return
+
+        state = self.encode_state(maze, situation)
+        if self.learner is not None:
+            action = self.learner.decide(self.ai_player, table, state, valid)
+        elif table is None:
+            # No trained table for this maze: plain BFS towards the nearest pellet instead
+            self.ai_player.behavior_manager.behaviors["simple_bfs"].execute(maze, situation)
+            return
+        else:
+            values = table[state]
+            if values.any():
+                action = max(valid, key=lambda index: values[index])
+            else:
+                # Never visited in training: head for the nearest pellet, else keep going
+                pellet_action = state[-1] - 1
+                current_action = ACTIONS.index(self.ai_player.direction)
+                action = pellet_action if pellet_action in valid else current_action if current_action in valid else valid[0]
+        self.ai_player.next_direction = ACTIONS[action]
+
+    def valid_actions(self, maze):
+        x, y = self.ai_player.grid_x, self.ai_player.grid_y
+        return [index for index, action in enumerate(ACTIONS) if maze.is_valid_position(x + DIRECTIONS[action][0], y + DIRECTIONS[action][1])]
+
+    def encode_state(self, maze, situation):
+        """Index tuple (cell, ghost direction, ghost distance bucket, power, pellet direction) into the table."""
+        position = (self.ai_player.grid_x, self.ai_player.grid_y)
+        cell = position[1] * maze.width + position[0]
+
+        ghost_direction, ghost_bucket = 0, len(GHOST_DISTANCE_BUCKETS)
+        if situation.get('ghost_distances'):
+            ghost_pos, distance = min(situation['ghost_distances'], key=lambda item: item[1])
+            ghost_direction = relative_direction(position, ghost_pos)
+            ghost_bucket = distance_bucket(distance)
+
+        pellet = situation.get('nearest_pellet') or situation.get('nearest_power_pellet')
+        pellet_direction = relative_direction(position, pellet) if pellet else 0
+        return (cell, ghost_direction, ghost_bucket, 1 if situation.get('has_power') else 0, pellet_direction)
+
+    def _table_for(self, maze):
+        """The maze's Q-table: the learner's writable one while training, else the memory-mapped file (or None)."""
+        if self.learner is not None:
+            return self.learner.table_for(maze)
+        key = (id(maze.layout), maze.layout_version)
+        if key != self.table_key:
+            self.table_key = key
+            path = q_table_path(maze)
+            if path in _mapped_tables:
+                self.table = _mapped_tables[path]
+            elif os.path.exists(path):
+                self.table = _mapped_tables[path] = np.load(path, mmap_mode='r')
+            else:
+                self.table = None
+                if path not in _missing_tables_reported:
+                    _missing_tables_reported.add(path)
+                    print(f"No Q-table for this maze at {path}; q_learning is playing simple_bfs instead. Train one with: python -m game.q_training")
+        return self.table
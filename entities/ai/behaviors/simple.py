@@ -1,5 +1,4 @@
 from .base_behavior import BaseBehavior
-import random
 from constants import DIRECTIONS
 
 
@@ -34,7 +33,7 @@ class SimpleBFSBehavior(BaseBehavior):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.ai_player.next_direction = random.choice(valid_directions)
+            self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
 
 
 class SimpleDFSBehavior(BaseBehavior):
@@ -68,7 +67,7 @@ class SimpleDFSBehavior(BaseBehavior):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.ai_player.next_direction = random.choice(valid_directions)
+            self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
 
 
 class SimpleAStarBehavior(BaseBehavior):
@@ -102,7 +101,7 @@ class SimpleAStarBehavior(BaseBehavior):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.ai_player.next_direction = random.choice(valid_directions)
+            self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
 
 
 class SimpleUCSBehavior(BaseBehavior):
@@ -136,4 +135,4 @@ class SimpleUCSBehavior(BaseBehavior):
                 valid_directions.append(direction)
 
         if valid_directions:
-            self.ai_player.next_direction = random.choice(valid_directions)
+            self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
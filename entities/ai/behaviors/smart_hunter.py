@@ -32,6 +32,7 @@ class SmartHunterBehavior(BaseBehavior):
             self._fallback_behavior(maze, situation)
 
     def _select_optimal_target(self, maze, situation):
+        params = self.ai_player.params
         targets = []
 
         # Add ghost targets with priority
@@ -40,19 +41,19 @@ class SmartHunterBehavior(BaseBehavior):
                 # Prioritize ghosts when in power mode
                 for ghost_pos, _ in situation['ghost_distances']:
                     distance = self._manhattan_distance((self.ai_player.grid_x, self.ai_player.grid_y), ghost_pos)
-                    value = 100 / (distance + 1)
+                    value = params.hunter_ghost_value / (distance + 1)
                     targets.append((ghost_pos, value, 'ghost'))
 
         # Add regular pellets
         for pellet_pos in maze.pellets:
             distance = self._manhattan_distance((self.ai_player.grid_x, self.ai_player.grid_y), pellet_pos)
-            value = 10 / (distance + 1)  # Closer = higher value
+            value = params.hunter_pellet_value / (distance + 1)  # Closer = higher value
             targets.append((pellet_pos, value, 'pellet'))
 
         # Add power pellets with higher priority
         for pellet_pos in maze.power_pellets:
             distance = self._manhattan_distance((self.ai_player.grid_x, self.ai_player.grid_y), pellet_pos)
-            value = 50 / (distance + 1)  # Much higher value
+            value = params.hunter_power_value / (distance + 1)  # Much higher value
             targets.append((pellet_pos, value, 'power'))
 
         # Add exploration bonuses
@@ -94,9 +95,7 @@ class SmartHunterBehavior(BaseBehavior):
             if self.ai_player.direction in valid_directions:
                 self.ai_player.next_direction = self.ai_player.direction
             else:
-                import random
-
-                self.ai_player.next_direction = random.choice(valid_directions)
+                self.ai_player.next_direction = self.ai_player.rng.choice(valid_directions)
 
     def _get_best_direction_for_target(self, maze, target):
         current_pos = (self.ai_player.grid_x, self.ai_player.grid_y)
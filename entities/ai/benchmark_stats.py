@@ -0,0 +1,203 @@
+import argparse
+import csv
+import os
+from collections import defaultdict
+import numpy as np
+
+
+def _nodes_expanded(record):
+    """Search nodes expanded over the whole run, summed across pathfinding algorithms."""
+    stats = record['stats']
+    return sum(stats.get(f'pathfinding_{name}_nodes_expanded', 0) for name in ("bfs", "dfs", "astar", "ucs"))
+
+
+def _moves_to_win(record):
+    stats = record['stats']
+    return stats['total_moves'] if stats['game_result'] == 'WIN' else None
+
+
+# Metric name -> value for one run record (None leaves the run out of that metric)
+BENCHMARK_METRICS = {
+    'win': lambda r: 1.0 if r['stats']['game_result'] == 'WIN' else 0.0,
+    'score': lambda r: r.get('score'),
+    'ticks': lambda r: r.get('ticks'),
+    'wall_time_seconds': lambda r: r.get('wall_time_seconds'),
+    'total_moves': lambda r: r['stats']['total_moves'],
+    'moves_to_win': _moves_to_win,
+    'pellets_eaten': lambda r: r['stats']['pellets_eaten'],
+    'deaths': lambda r: r['stats']['deaths'],
+    'nodes_expanded': _nodes_expanded,
+    'mean_decision_ms': lambda r: r['stats'].get('mean_decision_ms'),
+    'max_decision_ms': lambda r: r['stats'].get('max_decision_ms'),
+}
+
+
+def collect_metric_values(records, group_by=("algorithm",), metrics=None):
+    """Group runs by the given record keys and gather each metric into a float array.
+
+    records may be any iterable (e.g. AIBenchmark.load_results()); only the numbers are kept.
+    """
+    metrics = metrics or list(BENCHMARK_METRICS.keys())
+    values = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        group = tuple(record.get(key) for key in group_by)
+        for metric in metrics:
+            value = BENCHMARK_METRICS[metric](record)
+            if value is not None:
+                values[group][metric].append(value)
+    return {group: {metric: np.asarray(v, dtype=np.float64) for metric, v in by_metric.items()} for group, by_metric in values.items()}
+
+
+def bootstrap_ci(values, confidence=0.95, resamples=2000, rng=None, batch_size=200):
+    """Percentile bootstrap confidence interval for the mean of values."""
+    n = len(values)
+    if n == 0:
+        return float('nan'), float('nan')
+    if n == 1:
+        return float(values[0]), float(values[0])
+
+    rng = rng if rng is not None else np.random.default_rng(0)
+    means = np.empty(resamples)
+    # Resample in batches so a big sweep does not need a resamples x n index matrix at once
+    for start in range(0, resamples, batch_size):
+        count = min(batch_size, resamples - start)
+        indices = rng.integers(0, n, size=(count, n))
+        means[start:start + count] = values[indices].mean(axis=1)
+
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    low, high = np.percentile(means, [tail, 100.0 - tail])
+    return float(low), float(high)
+
+
+def describe(values, confidence=0.95, resamples=2000, rng=None):
+    """n, mean, std, p50/p90/p99 and a bootstrap CI of the mean for one metric."""
+    n = len(values)
+    if n == 0:
+        return {'n': 0, 'mean': float('nan'), 'std': float('nan'), 'p50': float('nan'), 'p90': float('nan'), 'p99': float('nan'), 'ci_low': float('nan'), 'ci_high': float('nan')}
+
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    ci_low, ci_high = bootstrap_ci(values, confidence, resamples, rng)
+    return {
+        'n': n,
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if n > 1 else 0.0,
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+    }
+
+
+def summarize_records(records, group_by=("algorithm",), metrics=None, confidence=0.95, resamples=2000, seed=0):
+    """One summary row per (group, metric), sorted by group then metric order."""
+    metrics = metrics or list(BENCHMARK_METRICS.keys())
+    grouped = collect_metric_values(records, group_by, metrics)
+    rng = np.random.default_rng(seed)
+
+    rows = []
+    for group in sorted(grouped, key=lambda g: tuple(str(part) for part in g)):
+        for metric in metrics:
+            values = grouped[group].get(metric)
+            if values is None:
+                continue
+            row = dict(zip(group_by, group))
+            row['metric'] = metric
+            row.update(describe(values, confidence, resamples, rng))
+            rows.append(row)
+    return rows
+
+
+def compare_samples(baseline, current, statistic=np.mean, relative=True, paired=False, confidence=0.95, resamples=2000, rng=None, batch_size=200):
+    """Change in statistic from baseline to current, with a bootstrap CI of that change.
+
+    relative=True gives (current - baseline) / baseline, otherwise the plain difference.
+    paired=True resamples both sides with the same indices, for runs matched one to one
+    (same algorithm, layout and seed), which removes the run-to-run spread from the CI.
+    """
+    baseline = np.asarray(baseline, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng(0)
+
+    def change(base_value, current_value):
+        if not relative:
+            return current_value - base_value
+        # A zero baseline only happens for counts; treat any growth from zero as +100%
+        return np.where(base_value != 0, (current_value - base_value) / np.where(base_value != 0, base_value, 1), np.sign(current_value))
+
+    paired = paired and len(baseline) == len(current)
+    base_stat = statistic(baseline)
+    current_stat = statistic(current)
+    changes = np.empty(resamples)
+    for start in range(0, resamples, batch_size):
+        count = min(batch_size, resamples - start)
+        base_indices = rng.integers(0, len(baseline), size=(count, len(baseline)))
+        current_indices = base_indices if paired else rng.integers(0, len(current), size=(count, len(current)))
+        base_samples = baseline[base_indices]
+        current_samples = current[current_indices]
+        changes[start:start + count] = change(statistic(base_samples, axis=1), statistic(current_samples, axis=1))
+
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    ci_low, ci_high = np.percentile(changes, [tail, 100.0 - tail])
+    return {
+        'baseline': float(base_stat),
+        'current': float(current_stat),
+        'change': float(change(base_stat, current_stat)),
+        'ci_low': float(ci_low),
+        'ci_high': float(ci_high),
+    }
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return "-"
+        return f"{value:.4g}"
+    return str(value)
+
+
+def write_csv(rows, path):
+    if not rows:
+        return
+    output_dir = os.path.dirname(path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def to_markdown(rows):
+    if not rows:
+        return ""
+    columns = list(rows[0].keys())
+    lines = ["| " + " | ".join(columns) + " |", "| " + " | ".join("---" for _ in columns) + " |"]
+    for row in rows:
+        lines.append("| " + " | ".join(_format_value(row[column]) for column in columns) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def write_markdown(rows, path, title=None):
+    output_dir = os.path.dirname(path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(path, 'w') as f:
+        if title:
+            f.write(f"# {title}\n\n")
+        f.write(to_markdown(rows))
+
+
+def main():
+    from entities.ai.algorithm_switcher import AIBenchmark
+
+    parser = argparse.ArgumentParser(description="Percentile and bootstrap CI summaries of saved benchmark runs.")
+    parser.add_argument("results", help="JSON lines results file")
+    parser.add_argument("--output", default="benchmark_summary", help="Base name for the .csv/.md files")
+    args = parser.parse_args()
+
+    AIBenchmark().export_summary(args.output, records_source=args.results)
+
+
+if __name__ == "__main__":
+    main()
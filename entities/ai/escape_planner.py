@@ -0,0 +1,299 @@
+import random
+import time
+from collections import deque
+from constants import DIRECTIONS, CELL_SIZE, AI_SPEED, ESCAPE_NODE_BUDGET, ESCAPE_TIME_BUDGET_MS
+
+CAUGHT_VALUE = -10000
+GHOST_EATEN_VALUE = 500
+DISTANCE_CAP = 12  # Beyond this many cells the ghost is simply "far"
+MAX_TABLE_ENTRIES = 200000  # Transposition table is dropped when it grows past this
+ACTION_NAMES = tuple(DIRECTIONS)
+REVERSE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+REVERSE_INDEX = tuple(ACTION_NAMES.index(REVERSE[name]) for name in ACTION_NAMES)
+NO_DIRECTION = len(ACTION_NAMES)  # Ghost direction unknown: any move allowed
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+_layouts = {}  # (width, height, open cells) -> _LayoutTables, shared by every planner in the process
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+class _LayoutTables:
+    """Neighbour lists, ghost moves, all-pairs maze distances and Zobrist keys for one wall layout."""
+
+    def __init__(self, maze):
+        width = maze.width
+        self.neighbors = {}
+        for y in range(maze.height):
+            for x in range(width):
+                if not maze.is_valid_position(x, y):
+                    continue
+                self.neighbors[y * width + x] = [
+                    (index, (y + dy) * width + x + dx)
+                    for index, (dx, dy) in enumerate(DIRECTIONS.values())
+                    if maze.is_valid_position(x + dx, y + dy)
+                ]
+        # Ghost moves per (cell, heading): no reversing, unless a dead end leaves nothing else
+        self.ghost_moves = {}
+        for cell, moves in self.neighbors.items():
+            by_direction = [[move for move in moves if move[0] != REVERSE_INDEX[direction]] or moves for direction in range(NO_DIRECTION)]
+            self.ghost_moves[cell] = by_direction + [moves]
+        self.distances = {cell: _bfs(self.neighbors, [cell]) for cell in self.neighbors}
+
+        # Fixed seed: the keys only need to be distinct, and this keeps the search reproducible
+        rng = random.Random(0)
+        cells = width * maze.height
+        self.ai_keys = [rng.getrandbits(64) for _ in range(cells)]
+        self.ghost_keys = [rng.getrandbits(64) for _ in range(cells)]
+        self.direction_keys = [rng.getrandbits(64) for _ in range(NO_DIRECTION + 1)]
+
+
+def _layout_tables(maze):
+    open_cells = frozenset((x, y) for y in range(maze.height) for x in range(maze.width) if maze.is_valid_position(x, y))
+    key = (maze.width, maze.height, open_cells)
+    if key not in _layouts:
+        _layouts[key] = _LayoutTables(maze)
+    return _layouts[key]
+
+
+def _bfs(neighbors, sources):
+    """Maze distance from the nearest of `sources` to every open cell (None where unreachable)."""
+    distance = {cell: None for cell in neighbors}
+    queue = deque()
+    for cell in sources:
+        if cell in distance and distance[cell] is None:
+            distance[cell] = 0
+            queue.append(cell)
+    while queue:
+        cell = queue.popleft()
+        for _, neighbor in neighbors[cell]:
+            if distance[neighbor] is None:
+                distance[neighbor] = distance[cell] + 1
+                queue.append(neighbor)
+    return distance
+
+
+class EscapePlanner:
+    """Adversarial search for escaping the nearest ghost, over (AI cell, ghost cell, ghost direction, power left).
+
+    The AI maximises and the ghost minimises, moving without reversing like InkyGhost does; while
+    the AI is powered up the ghost is frightened and its move becomes a uniform chance node
+    (expectiminimax). Both move one cell per ply, which is pessimistic since the ghost is
+    usually slower. Leaves are scored with the escape weights in BehaviorParams.
+
+    Search is iterative deepening up to params.escape_lookahead AI moves, stopped by
+    ESCAPE_NODE_BUDGET nodes (deterministic, so seeded games and replays hold) and optionally
+    ESCAPE_TIME_BUDGET_MS. Positions go through a Zobrist-hashed transposition table kept for
+    the whole game: values are reused while the pellets and leaf scoring are unchanged, best moves always.
+    """
+
+    def __init__(self, ai_player):
+        self.ai_player = ai_player
+        self.node_budget = ESCAPE_NODE_BUDGET
+        self.time_budget_ms = ESCAPE_TIME_BUDGET_MS
+        self.layout_key = None
+        self.table = {}
+        self.generation = 0
+        self.pellets_seen = None
+        self.scoring_seen = None
+        self.last_ghost_cell = None
+        self.last_depth = 0
+        self.last_nodes = 0
+
+    def plan(self, maze, ghost_distances, chase_pellets=True):
+        """Next (x, y) for the AI to step to, or None when it has nowhere to go."""
+        self._prepare_layout(maze)
+        width = maze.width
+        ai = self.ai_player.grid_y * width + self.ai_player.grid_x
+        if ai not in self.neighbors:
+            return None
+        (gx, gy), _ = min(ghost_distances, key=lambda item: item[1])
+        ghost = gy * width + gx
+        if ghost not in self.neighbors:
+            return None
+        ghost_direction = self._ghost_direction(maze, ghost)
+
+        params = self.ai_player.params
+        self.power_moves = int(self.ai_player.power_up_duration / (CELL_SIZE / AI_SPEED)) + 1
+        power = int(self.ai_player.power_timer / (CELL_SIZE / AI_SPEED)) + 1 if self.ai_player.power_timer > 0 else 0
+        power = min(power, self.power_moves)
+        self.chase_pellets = chase_pellets
+        self.weights = (params.escape_ghost_distance_weight, params.escape_power_bonus, params.escape_power_distance_weight, params.escape_pellet_bonus)
+        if (chase_pellets, self.weights) != self.scoring_seen:
+            # Behaviors score leaves differently (reflex_agent ignores pellets until the endgame), and the
+            # table outlives an algorithm switch, so values stored under other scoring are stale
+            self.scoring_seen = (chase_pellets, self.weights)
+            self.generation += 1
+        self._prepare_pellets(maze)
+
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_budget_ms / 1000 if self.time_budget_ms > 0 else None
+        best_move = None
+        for depth in range(1, params.escape_lookahead + 1):
+            try:
+                _, move = self._max_node(ai, ghost, ghost_direction, power, depth, -float('inf'), float('inf'), root=True)
+            except _BudgetExhausted:
+                break
+            best_move = move
+            self.last_depth = depth
+        self.last_nodes = self.nodes
+
+        if len(self.table) > MAX_TABLE_ENTRIES:
+            self.table = {}
+        if best_move is None:
+            return None
+        return (best_move % width, best_move // width)
+
+    def _max_node(self, ai, ghost, ghost_direction, power, depth, alpha, beta, root=False):
+        self.nodes += 1
+        if self.nodes > self.node_budget or (self.deadline is not None and time.perf_counter() > self.deadline):
+            raise _BudgetExhausted()
+        if depth == 0:
+            return self._evaluate(ai, ghost, power)
+
+        key = self.ai_keys[ai] ^ self.ghost_keys[ghost] ^ self.direction_keys[ghost_direction] ^ self.power_keys[power]
+        entry = self.table.get(key)
+        hint = None
+        if entry is not None:
+            generation, entry_depth, value, flag, hint = entry
+            if not root and generation == self.generation and entry_depth >= depth:
+                if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                    return value
+
+        moves = self.neighbors[ai]
+        if hint is not None and moves[0][1] != hint:
+            # Last search's best move first, for earlier cutoffs
+            moves = [move for move in moves if move[1] == hint] + [move for move in moves if move[1] != hint]
+        original_alpha = alpha
+        best_value, best_move = -float('inf'), None
+        for _, cell in moves:
+            if cell == ghost:
+                value = GHOST_EATEN_VALUE if power > 0 else CAUGHT_VALUE - depth
+            else:
+                next_power = power - 1 if power > 0 else 0
+                if cell in self.power_pellet_cells:
+                    next_power = self.power_moves
+                value = self._ghost_node(cell, ghost, ghost_direction, next_power, depth, alpha, beta)
+            if value > best_value:
+                best_value, best_move = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (self.generation, depth, best_value, flag, best_move)
+        if root:
+            return best_value, best_move
+        return best_value
+
+    def _ghost_node(self, ai, ghost, ghost_direction, power, depth, alpha, beta):
+        moves = self.ghost_moves[ghost][ghost_direction]
+        leaf = depth == 1
+        if leaf:
+            self.nodes += len(moves)
+
+        if power > 0:
+            # Frightened: InkyGhost wanders randomly, so average instead of assuming the worst
+            total = 0.0
+            for direction, cell in moves:
+                if cell == ai:
+                    total += GHOST_EATEN_VALUE
+                elif leaf:
+                    total += self._evaluate(ai, cell, power)
+                else:
+                    total += self._max_node(ai, cell, direction, power, depth - 1, -float('inf'), float('inf'))
+            return total / len(moves)
+
+        best_value = float('inf')
+        for direction, cell in moves:
+            if cell == ai:
+                value = CAUGHT_VALUE - depth
+            elif leaf:
+                value = self._evaluate(ai, cell, power)
+            else:
+                value = self._max_node(ai, cell, direction, power, depth - 1, alpha, beta)
+            if value < best_value:
+                best_value = value
+            if value < beta:
+                beta = value
+            if alpha >= beta:
+                break
+        return best_value
+
+    def _evaluate(self, ai, ghost, power):
+        distance_weight, power_bonus, power_distance_weight, pellet_bonus = self.weights
+        ghost_distance = self.distances[ai][ghost]
+        if power > 0 or ghost_distance is None or ghost_distance > DISTANCE_CAP:
+            ghost_distance = DISTANCE_CAP  # A frightened or unreachable ghost is no threat
+        value = ghost_distance * distance_weight
+
+        power_distance = self.power_pellet_distance[ai]
+        if ghost_distance <= 4 and power_distance is not None:
+            value += max(0, power_bonus - power_distance * power_distance_weight)
+        pellet_distance = self.pellet_distance[ai]
+        if self.chase_pellets and ghost_distance > 3 and pellet_distance is not None:
+            value += max(0, pellet_bonus - pellet_distance)
+        return value
+
+    def _ghost_direction(self, maze, ghost):
+        """Which way the ghost is heading, from the live entity if we have it, else from its last cell."""
+        width = maze.width
+        direction = NO_DIRECTION
+        for entity in self.ai_player.ghosts:
+            if entity.is_dead() or entity.grid_y * width + entity.grid_x != ghost:
+                continue
+            target = getattr(entity, 'target_grid', None)
+            if target is not None and target != (entity.grid_x, entity.grid_y):
+                # In A* modes InkyGhost leaves .direction stale, so trust where it is going instead
+                direction = ACTION_NAMES.index(entity.get_direction_to_next_position(target))
+            else:
+                direction = ACTION_NAMES.index(entity.direction)
+            break
+        else:
+            last = self.last_ghost_cell
+            if last is not None and last != ghost:
+                for index, cell in self.neighbors.get(last, ()):
+                    if cell == ghost:
+                        direction = index
+        self.last_ghost_cell = ghost
+        return direction
+
+    def _prepare_layout(self, maze):
+        key = (id(maze.layout), maze.layout_version)
+        if key == self.layout_key:
+            return
+        self.layout_key = key
+        self.table = {}
+        self.pellets_seen = None
+        tables = _layout_tables(maze)
+        self.neighbors = tables.neighbors
+        self.ghost_moves = tables.ghost_moves
+        self.distances = tables.distances
+        self.ai_keys = tables.ai_keys
+        self.ghost_keys = tables.ghost_keys
+        self.direction_keys = tables.direction_keys
+        max_power = int(self.ai_player.power_up_duration / (CELL_SIZE / AI_SPEED)) + 1
+        rng = random.Random(1)
+        self.power_keys = [rng.getrandbits(64) for _ in range(max_power + 1)]
+
+    def _prepare_pellets(self, maze):
+        """Distance maps to the nearest pellet and power pellet, rebuilt only when the pellets change."""
+        pellets = (len(maze.pellets), len(maze.power_pellets))
+        if pellets == self.pellets_seen:
+            return
+        self.pellets_seen = pellets
+        self.generation += 1  # Leaf values depend on the pellets, so older table values are stale
+        width = maze.width
+        self.power_pellet_cells = {y * width + x for x, y in maze.power_pellets}
+        self.pellet_distance = _bfs(self.neighbors, [y * width + x for x, y in maze.pellets])
+        self.power_pellet_distance = _bfs(self.neighbors, list(self.power_pellet_cells))
@@ -3,6 +3,7 @@ import time
 from collections import deque
 from constants import DIRECTIONS
 from collections import defaultdict
+from core.trace_recorder import tracer
 
 # Giving details explanation of the code:
 """
@@ -14,19 +15,28 @@ This class is responsible for managing pathfinding algorithms for AI players in
 class PathfindingManager:
     def __init__(self, ai_player):
         self.ai_player = ai_player
-        self.total_nodes_expanded = defaultdict(int)
-
-    def find_path(self, maze, start, goal, algorithm="astar", ghost_distances=None):
-        algorithms = {
+        self.last_nodes_expanded = defaultdict(int)  # Last search per algorithm
+        self.cumulative_nodes_expanded = defaultdict(int)  # Every search since creation
+        # Registered search algorithms; benchmarks iterate this
+        self.algorithms = {
             "bfs": self._breadth_first_search,
             "dfs": self._depth_first_search,
             "astar": self._a_star_search,
             "ucs": self._uniform_cost_search,
         }
 
-        if algorithm in algorithms:
-            self.total_nodes_expanded[algorithm] = 0
-            return algorithms[algorithm](maze, start, goal, ghost_distances)
+    def find_path(self, maze, start, goal, algorithm="astar", ghost_distances=None):
+        search = self.algorithms.get(algorithm)
+        if search is not None:
+            self.last_nodes_expanded[algorithm] = 0
+            started = tracer.begin()
+            path = search(maze, start, goal, ghost_distances)
+            self.cumulative_nodes_expanded[algorithm] += self.last_nodes_expanded[algorithm]
+            if started:
+                tracer.end(
+                    "find_path", started, "ai", {'algorithm': algorithm, 'nodes_expanded': self.last_nodes_expanded[algorithm], 'path_length': len(path)}
+                )
+            return path
         return []
 
     def _manhattan_distance(self, a, b):
@@ -39,7 +49,7 @@ class PathfindingManager:
         while queue:
             current, path = queue.popleft()
 
-            self.total_nodes_expanded["bfs"] += 1
+            self.last_nodes_expanded["bfs"] += 1
 
             if current == goal:
                 self.ai_player.ai_state.path = path
@@ -61,7 +71,7 @@ class PathfindingManager:
         while stack:
             current, path = stack.pop()
 
-            self.total_nodes_expanded["dfs"] += 1
+            self.last_nodes_expanded["dfs"] += 1
 
             if current == goal:
                 self.ai_player.ai_state.path = path
@@ -79,25 +89,27 @@ class PathfindingManager:
         def heuristic(a, b):
             return self._manhattan_distance(a, b)
 
+        params = self.ai_player.params
+
         def get_cost(pos):
             base_cost = 1  # Basic cost for moving to an adjacent cell
 
             # Add penalty for danger zones (already exists)
-            detect_distance = 3  # Can be adjusted
+            detect_distance = params.ghost_detect_distance
             if ghost_distances:
                 for ghost_pos, _ in ghost_distances:
                     dist = self._manhattan_distance(pos, ghost_pos)
                     if dist <= detect_distance:
-                        base_cost += (detect_distance - dist) * 10  # Tăng phạt để tránh ma hơn
+                        base_cost += (detect_distance - dist) * params.ghost_proximity_penalty  # Tăng phạt để tránh ma hơn
 
             # Apply exploration bonus: penalize already visited cells
             # The more a cell has been visited, the higher the cost
             visited_count = self.ai_player.ai_state.visited_cells_count.get(pos, 0)
-            base_cost += visited_count * 0.5  # Add a small penalty for visited cells
+            base_cost += visited_count * params.visited_cell_penalty  # Add a small penalty for visited cells
 
             # Reward uncollected pellets (optional, but good for "all food")
             if pos in self.ai_player.ai_state.uncollected_pellets:
-                base_cost -= 5  # Make it cheaper to go to a pellet
+                base_cost -= params.pellet_reward  # Make it cheaper to go to a pellet
 
             return base_cost
 
@@ -116,7 +128,7 @@ class PathfindingManager:
 
             self.ai_player.ai_state.increment_visited_count(current)
             self.ai_player.ai_state.add_recent_position(current)
-            self.total_nodes_expanded["astar"] += 1
+            self.last_nodes_expanded["astar"] += 1
 
             for next_x, next_y, _ in maze.get_neighbors(current[0], current[1]):
                 next_pos = (next_x, next_y)
@@ -135,25 +147,27 @@ class PathfindingManager:
         return []
 
     def _uniform_cost_search(self, maze, start, goal, ghost_distances=None):
+        params = self.ai_player.params
+
         def get_cost(pos):
             base_cost = 1  # Basic cost for moving to an adjacent cell
 
             # Add penalty for danger zones (already exists)
-            detect_distance = 3  # Can be adjusted
+            detect_distance = params.ghost_detect_distance
             if ghost_distances:
                 for ghost_pos, _ in ghost_distances:
                     dist = self._manhattan_distance(pos, ghost_pos)
                     if dist <= detect_distance:
-                        base_cost += (detect_distance - dist) * 10  # Tăng phạt để tránh ma hơn
+                        base_cost += (detect_distance - dist) * params.ghost_proximity_penalty  # Tăng phạt để tránh ma hơn
 
             # Apply exploration bonus: penalize already visited cells
             # The more a cell has been visited, the higher the cost
             visited_count = self.ai_player.ai_state.visited_cells_count.get(pos, 0)
-            base_cost += visited_count * 0.5  # Add a small penalty for visited cells
+            base_cost += visited_count * params.visited_cell_penalty  # Add a small penalty for visited cells
 
             # Reward uncollected pellets (optional, but good for "all food")
             if pos in self.ai_player.ai_state.uncollected_pellets:
-                base_cost -= 5  # Make it cheaper to go to a pellet
+                base_cost -= params.pellet_reward  # Make it cheaper to go to a pellet
 
             return base_cost
 
@@ -172,7 +186,7 @@ class PathfindingManager:
                 self.ai_player.ai_state.path = path
                 return path
 
-            self.total_nodes_expanded["ucs"] += 1
+            self.last_nodes_expanded["ucs"] += 1
 
             for next_x, next_y, _ in maze.get_neighbors(current[0], current[1]):
                 next_pos = (next_x, next_y)
@@ -187,10 +201,11 @@ class PathfindingManager:
     def compare_algorithms(self, maze, start, goal):
         results = {}
 
-        for algorithm in ["bfs", "dfs", "astar", "ucs"]:
-            start_time = time.time()
+        # One-shot comparison for debugging; entities/ai/pathfinding_benchmark.py does proper timing
+        for algorithm in self.algorithms:
+            start_time = time.perf_counter()
             path = self.find_path(maze, start, goal, algorithm)
-            end_time = time.time()
+            end_time = time.perf_counter()
 
             results[algorithm] = {'path_length': len(path), 'computation_time': end_time - start_time, 'path': path}
 
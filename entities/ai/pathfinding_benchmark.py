@@ -0,0 +1,353 @@
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections import deque
+from maze_layout import MAZE_LAYOUT, POSITIONS
+from core.maze_state import MazeState
+from entities.ai.ai_state import AIState
+from entities.ai.behavior_params import DEFAULT_PARAMS
+from entities.ai.pathfinding import PathfindingManager
+
+WALL = 3
+OPEN = 0
+
+DEFAULT_SIZES = [(19, 11), (50, 50), (100, 100), (250, 250), (500, 500), (1000, 1000)]
+
+# DFS copies its whole path onto the stack for every push, so on big open areas it wanders the
+# entire maze with multi-thousand-cell paths (150x150 open room: ~2 s and ~480 MB for one query).
+# Larger mazes skip it rather than exhausting memory.
+ALGORITHM_MAX_OPEN_CELLS = {
+    "dfs": 12000,
+}
+
+
+class _BenchmarkAgent:
+    """Stand-in for AIPlayer; PathfindingManager only reads and writes its ai_state and reads its params."""
+
+    def __init__(self):
+        self.ai_state = AIState("benchmark", 0, 0)
+        self.params = DEFAULT_PARAMS
+
+    def reset(self):
+        # A* and UCS add visit penalties as they search, so every call starts from a clean state
+        self.ai_state.visited_cells_count.clear()
+        self.ai_state.recent_positions.clear()
+        self.ai_state.path = []
+
+
+# ---------------------------------------------------------------- maze families
+
+
+def _walled_grid(width, height, fill=OPEN):
+    layout = [[fill] * width for _ in range(height)]
+    for x in range(width):
+        layout[0][x] = WALL
+        layout[height - 1][x] = WALL
+    for y in range(height):
+        layout[y][0] = WALL
+        layout[y][width - 1] = WALL
+    return layout
+
+
+def generate_open_rooms(width, height, rng, room_size=8):
+    """Rooms of about room_size cells separated by walls, with one or two doors in each wall."""
+    layout = _walled_grid(width, height)
+    step = room_size + 1
+    for wall_x in range(step, width - 1, step):
+        for y in range(1, height - 1):
+            layout[y][wall_x] = WALL
+        for top in range(1, height - 1, step):
+            for _ in range(rng.randint(1, 2)):
+                layout[min(height - 2, top + rng.randrange(room_size))][wall_x] = OPEN
+    for wall_y in range(step, height - 1, step):
+        for x in range(1, width - 1):
+            layout[wall_y][x] = WALL
+        for left in range(1, width - 1, step):
+            for _ in range(rng.randint(1, 2)):
+                layout[wall_y][min(width - 2, left + rng.randrange(room_size))] = OPEN
+    return layout
+
+
+def generate_corridors(width, height, rng, shortcut_every=24):
+    """One-cell corridors snaking back and forth, with an occasional shortcut between rows."""
+    layout = _walled_grid(width, height)
+    for wall_y in range(2, height - 2, 2):
+        for x in range(1, width - 1):
+            layout[wall_y][x] = WALL
+        # Alternate the gap end to end so the corridor snakes, then punch a few shortcuts
+        gap_x = width - 2 if (wall_y // 2) % 2 else 1
+        layout[wall_y][gap_x] = OPEN
+        for _ in range(max(0, (width - 2) // shortcut_every)):
+            layout[wall_y][rng.randrange(1, width - 1)] = OPEN
+    return layout
+
+
+def generate_dfs_maze(width, height, rng):
+    """Perfect maze from an iterative recursive backtracker; every cell has exactly one route."""
+    layout = _walled_grid(width, height, fill=WALL)
+    cells_x = range(1, width - 1, 2)
+    cells_y = range(1, height - 1, 2)
+    start = (cells_x[0], cells_y[0])
+    layout[start[1]][start[0]] = OPEN
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        neighbours = [(x + dx, y + dy, dx // 2, dy // 2) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))]
+        neighbours = [n for n in neighbours if 0 < n[0] < width - 1 and 0 < n[1] < height - 1 and layout[n[1]][n[0]] == WALL]
+        if not neighbours:
+            stack.pop()
+            continue
+        nx, ny, half_dx, half_dy = rng.choice(neighbours)
+        layout[y + half_dy][x + half_dx] = OPEN
+        layout[ny][nx] = OPEN
+        stack.append((nx, ny))
+    return layout
+
+
+def generate_tiled_layout(width, height, rng=None):
+    """The shipped MAZE_LAYOUT interior repeated to fill the size, inside one outer wall."""
+    interior = [row[1:-1] for row in MAZE_LAYOUT[1:-1]]
+    tile_height = len(interior)
+    tile_width = len(interior[0])
+    layout = _walled_grid(width, height)
+    for y in range(1, height - 1):
+        row = interior[(y - 1) % tile_height]
+        for x in range(1, width - 1):
+            layout[y][x] = WALL if row[(x - 1) % tile_width] == WALL else OPEN
+    return layout
+
+
+MAZE_FAMILIES = {
+    "open_rooms": generate_open_rooms,
+    "corridors": generate_corridors,
+    "dfs_maze": generate_dfs_maze,
+    "tiled": generate_tiled_layout,
+}
+
+
+# ---------------------------------------------------------------- queries
+
+
+def _bfs_distances(maze, start, radius=None):
+    """Path distance from start to every reachable cell (within radius steps if given)."""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        distance = distances[(x, y)]
+        if radius is not None and distance >= radius:
+            continue
+        for next_x, next_y, _ in maze.get_neighbors(x, y):
+            if (next_x, next_y) not in distances:
+                distances[(next_x, next_y)] = distance + 1
+                queue.append((next_x, next_y))
+    return distances
+
+
+def sample_queries(maze, count, rng, radius=64):
+    """Random reachable start/goal pairs; goals sit between radius/2 and radius steps away.
+
+    radius=None picks goals anywhere in the start's connected region.
+    """
+    open_cells = [(x, y) for y in range(maze.height) for x in range(maze.width) if not maze.is_wall(x, y)]
+    queries = []
+    attempts = 0
+    while len(queries) < count and attempts < count * 20:
+        attempts += 1
+        start = rng.choice(open_cells)
+        distances = _bfs_distances(maze, start, radius)
+        if len(distances) < 2:
+            continue
+        farthest = max(distances.values())
+        low = farthest // 2 if radius is None else min(radius // 2, farthest)
+        candidates = [cell for cell, distance in distances.items() if distance >= max(1, low)]
+        queries.append((start, rng.choice(candidates)))
+    return queries
+
+
+def default_queries():
+    """Start/goal pairs on the default maze between the spawn points and across the board."""
+    return [
+        (POSITIONS['PLAYER1_START'], POSITIONS['PLAYER2_START']),
+        (POSITIONS['PLAYER2_START'], POSITIONS['PLAYER1_START']),
+        (POSITIONS['INKY_GHOST_START'], POSITIONS['PLAYER1_START']),
+        ((16, 1), (1, 9)),
+    ]
+
+
+# ---------------------------------------------------------------- measurement
+
+
+def time_queries(pathfinding, agent, maze, algorithm, queries, repetitions=5, warmup=1):
+    """perf_counter_ns per query, after warmup passes. Returns (times_ns, expansions) with one
+    entry per query per repetition."""
+    for _ in range(warmup):
+        for start, goal in queries:
+            agent.reset()
+            pathfinding.find_path(maze, start, goal, algorithm)
+
+    times = []
+    expansions = []
+    # Like timeit: a collection landing inside one query would swamp a sub-millisecond timing
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repetitions):
+            for start, goal in queries:
+                agent.reset()
+                started = time.perf_counter_ns()
+                pathfinding.find_path(maze, start, goal, algorithm)
+                times.append(time.perf_counter_ns() - started)
+                expansions.append(pathfinding.last_nodes_expanded[algorithm])
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times, expansions
+
+
+def peak_memory_per_query(pathfinding, agent, maze, algorithm, queries):
+    """Largest tracemalloc peak (bytes) over single queries. Run apart from timing since tracing
+    slows allocation down several times."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    peak = 0
+    try:
+        for start, goal in queries:
+            agent.reset()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            pathfinding.find_path(maze, start, goal, algorithm)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def run_suite(families=None, sizes=None, algorithms=None, query_count=30, repetitions=5, warmup=1, radius=64, seed=0, measure_memory=True):
+    """Benchmark every algorithm on every maze family and size. Returns one row per combination."""
+    families = families or list(MAZE_FAMILIES.keys())
+    sizes = sizes or DEFAULT_SIZES
+    agent = _BenchmarkAgent()
+    pathfinding = PathfindingManager(agent)
+    algorithms = algorithms or list(pathfinding.algorithms.keys())
+
+    rows = []
+    for family in families:
+        for width, height in sizes:
+            rng = random.Random(f"{seed}-{family}-{width}x{height}")
+            maze = MazeState(MAZE_FAMILIES[family](width, height, rng))
+            open_cells = sum(1 for row in maze.layout for cell in row if cell != WALL)
+            queries = sample_queries(maze, query_count, rng, radius)
+            print(f"{family} {width}x{height}: {open_cells} open cells, {len(queries)} queries")
+
+            for algorithm in algorithms:
+                row = {'family': family, 'size': f"{width}x{height}", 'algorithm': algorithm, 'queries': len(queries)}
+                limit = ALGORITHM_MAX_OPEN_CELLS.get(algorithm)
+                if limit is not None and open_cells > limit:
+                    row['skipped'] = f"more than {limit} open cells"
+                    rows.append(row)
+                    continue
+
+                times, expansions = time_queries(pathfinding, agent, maze, algorithm, queries, repetitions, warmup)
+                total_expansions = sum(expansions)
+                row['ns_per_expansion'] = sum(times) / total_expansions if total_expansions else 0.0
+                row['expansions_per_query'] = total_expansions / len(expansions) if expansions else 0.0
+                row['median_query_us'] = _median(times) / 1000 if times else 0.0
+                row['max_query_us'] = max(times) / 1000 if times else 0.0
+                if measure_memory:
+                    row['peak_memory_kb'] = peak_memory_per_query(pathfinding, agent, maze, algorithm, queries) / 1024
+                rows.append(row)
+    return rows
+
+
+def benchmark_pathfinding(maze=None, queries=None, algorithms=None, repetitions=20, warmup=1):
+    """Time find_path per algorithm over a fixed query set (the default maze by default).
+
+    Returns {algorithm: {'time_ns': [...], 'nodes_expanded': [...]}} with one sample per
+    repetition, each summed over the queries.
+    """
+    maze = maze if maze is not None else MazeState()
+    queries = queries if queries is not None else default_queries()
+    agent = _BenchmarkAgent()
+    pathfinding = PathfindingManager(agent)
+    algorithms = algorithms or list(pathfinding.algorithms.keys())
+
+    results = {}
+    for algorithm in algorithms:
+        times, expansions = time_queries(pathfinding, agent, maze, algorithm, queries, repetitions, warmup)
+        per_query = len(queries)
+        results[algorithm] = {
+            'time_ns': [sum(times[i:i + per_query]) for i in range(0, len(times), per_query)],
+            'nodes_expanded': [sum(expansions[i:i + per_query]) for i in range(0, len(expansions), per_query)],
+        }
+    return results
+
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def _print_rows(rows):
+    print(f"\n{'family':<11} {'size':<10} {'algo':<6} {'ns/exp':>9} {'exp/query':>10} {'p50 us':>10} {'max us':>11} {'peak KB':>9}")
+    for row in rows:
+        if 'skipped' in row:
+            print(f"{row['family']:<11} {row['size']:<10} {row['algorithm']:<6} skipped: {row['skipped']}")
+            continue
+        print(
+            f"{row['family']:<11} {row['size']:<10} {row['algorithm']:<6} {row['ns_per_expansion']:>9.0f} {row['expansions_per_query']:>10.1f} "
+            f"{row['median_query_us']:>10.1f} {row['max_query_us']:>11.1f} {row.get('peak_memory_kb', 0):>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pathfinding microbenchmark over generated maze families.")
+    parser.add_argument("--families", nargs="+", choices=list(MAZE_FAMILIES.keys()), help="Maze families (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, help="Sizes as WIDTHxHEIGHT (default: 19x11 up to 1000x1000)")
+    parser.add_argument("--algorithms", nargs="+", help="Algorithms (default: every registered one)")
+    parser.add_argument("--queries", type=int, default=30, help="Start/goal pairs per maze")
+    parser.add_argument("--repetitions", type=int, default=5, help="Timed passes over the queries")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes before timing")
+    parser.add_argument("--radius", type=int, default=64, help="Max path distance from start to goal (0: unbounded)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--csv", help="Also write the rows to this CSV file")
+    args = parser.parse_args()
+
+    rows = run_suite(
+        families=args.families,
+        sizes=args.sizes,
+        algorithms=args.algorithms,
+        query_count=args.queries,
+        repetitions=args.repetitions,
+        warmup=args.warmup,
+        radius=args.radius or None,
+        seed=args.seed,
+        measure_memory=not args.no_memory,
+    )
+    _print_rows(rows)
+    if args.csv:
+        from entities.ai.benchmark_stats import write_csv
+
+        # Skipped rows lack the timing columns; give every row the same keys
+        columns = []
+        for row in rows:
+            columns.extend(key for key in row if key not in columns)
+        write_csv([{key: row.get(key, "") for key in columns} for row in rows], args.csv)
+        print(f"Rows written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
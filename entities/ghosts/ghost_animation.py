@@ -0,0 +1,43 @@
+# Which "round ghost" frame folder plays in each ghost AI mode
+GHOST_MODE_ANIMATIONS = {
+    "CHASE": "walk",
+    "SCATTER": "idle",
+    "FRIGHTENED": "damage",
+    "ENRAGED": "attack",
+    "EATEN": "dead",
+}
+
+# Multiply tints baked into copies of the frames at load time
+GHOST_TINTS = {
+    "ENRAGED": (255, 90, 90),
+    "FRIGHTENED": (110, 140, 255),
+}
+
+
+class GhostAnimation:
+    """Preloaded, pre-tinted frame lists for a ghost, advanced by tick index."""
+
+    def __init__(self, sprite_manager, name="ghost", ticks_per_frame=6):
+        self.sprite_manager = sprite_manager
+        self.name = name
+        self.ticks_per_frame = ticks_per_frame
+        self.frames = {}  # (ai_mode, tint) -> [atlas handles]
+        self._load_frames()
+
+    def _load_frames(self):
+        # Tints are baked into the shared atlas by the first ghost; later ghosts only look up handles
+        self.sprite_manager.bake_animation_tints(self.name, GHOST_TINTS)
+        for ai_mode, state in GHOST_MODE_ANIMATIONS.items():
+            self.frames[(ai_mode, None)] = list(self.sprite_manager.get_animation_ids(self.name, state))
+            for tint_name in GHOST_TINTS:
+                self.frames[(ai_mode, tint_name)] = list(self.sprite_manager.get_tinted_animation_ids(self.name, state, tint_name))
+
+    def has_frames(self):
+        return any(self.frames.values())
+
+    def get_frame(self, ai_mode, tick, tint=None):
+        frame_ids = self.frames.get((ai_mode, tint)) or self.frames.get((ai_mode, None))
+        if not frame_ids:
+            return None
+        index = (tick // self.ticks_per_frame) % len(frame_ids)
+        return self.sprite_manager.get_sprite_by_id(frame_ids[index])
@@ -1,23 +1,31 @@
 from constants import *
 from maze_layout import POSITIONS  # Import positions from maze layout
-import pygame
+from entities.ghosts.ghost_animation import GhostAnimation
+from core.debug_layers import DebugLayerCache, get_debug_font
+from core.event_log import log_event
+from entities.interpolation import InterpolatedPosition
+from optional_pygame import pygame
 import math
 import random
 import heapq
 
 
-class InkyGhost:
-    def __init__(self, player_id, start_x, start_y, sprite_manager):
+class InkyGhost(InterpolatedPosition):
+    def __init__(self, player_id, start_x, start_y, sprite_manager, rng=None):
         self.grid_x = start_x
         self.grid_y = start_y
         self.pixel_x = start_x * CELL_SIZE
         self.pixel_y = start_y * CELL_SIZE
+        self.prev_pixel_x = self.pixel_x
+        self.prev_pixel_y = self.pixel_y
         self.target_grid_x = (start_x, start_y)  # Target position for movement
         self.direction = "LEFT"
         self.next_direction = "LEFT"
         self.speed = GHOST_SPEED
         self.base_speed = GHOST_SPEED  # Store original speed
         self.sprite_manager = sprite_manager
+        self.positions = POSITIONS  # Scatter/respawn points; the simulation swaps these for other layouts
+        self.rng = rng if rng is not None else random.Random()  # Shared with the AI through SimulationCore
         self.moving = False
         self.movement_progress = 0.0
         self.target = None
@@ -29,6 +37,8 @@ class InkyGhost:
         # Animation properties
         self.animation_timer = 0
         self.bob_offset = 0
+        self.animation = GhostAnimation(sprite_manager) if sprite_manager is not None else None
+        self.debug_layers = DebugLayerCache()
 
         # A* pathfinding variables
         self.current_path = []  # Stores the planned path to destination
@@ -149,7 +159,7 @@ class InkyGhost:
         eliminate_directions = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
         possible_directions = [d for d in DIRECTIONS if d != eliminate_directions[self.direction]]
         if possible_directions:
-            new_direction = random.choice(possible_directions)
+            new_direction = self.rng.choice(possible_directions)
             nx, ny = self.grid_x + DIRECTIONS[new_direction][0], self.grid_y + DIRECTIONS[new_direction][1]
             if maze.is_valid_position(nx, ny):
                 return new_direction
@@ -198,7 +208,7 @@ class InkyGhost:
                         if maze.is_valid_position(tx, ty):
                             valid_dirs.append(d)
                     if valid_dirs:
-                        self.next_direction = random.choice(valid_dirs)
+                        self.next_direction = self.rng.choice(valid_dirs)
                     target_pos = None
             else:
                 # In FRIGHTENED mode, choose a random direction
@@ -208,7 +218,7 @@ class InkyGhost:
                 target_pos = None
             use_astar = False
         elif self.ai_mode == "EATEN":
-            target_pos = POSITIONS['GHOST_RESPAWN_POINT']['INKY']
+            target_pos = self.positions['GHOST_RESPAWN_POINT']['INKY']
             use_astar = True
         else:
             target_pos = None
@@ -233,7 +243,7 @@ class InkyGhost:
 
                     # Debug print for EATEN mode
                     if self.ai_mode == "EATEN":
-                        print(f"EATEN mode: Current pos ({self.grid_x}, {self.grid_y}), Next target: {next_position}, Direction: {new_dir}")
+                        log_event(f"EATEN mode: Current pos ({self.grid_x}, {self.grid_y}), Next target: {next_position}, Direction: {new_dir}")
 
                     self.next_direction = new_dir
                     self.target_grid = next_position
@@ -242,7 +252,7 @@ class InkyGhost:
                     if (self.grid_x, self.grid_y) == next_position:
                         self.current_path.pop(0)
                         if self.ai_mode == "EATEN":
-                            print(f"Reached waypoint, removing from path. Path length now: {len(self.current_path)}")
+                            log_event(f"Reached waypoint, removing from path. Path length now: {len(self.current_path)}")
             else:
                 # Use greedy direction selection for SCATTER mode
                 new_dir = self.choose_greedy_direction(maze, target_pos)
@@ -300,7 +310,7 @@ class InkyGhost:
 
     def get_scatter_point(self):
         # only one scatter point for Inky
-        return POSITIONS['INKY_GHOST_SCATTER_POINT']
+        return self.positions['INKY_GHOST_SCATTER_POINT']
 
     def kill(self):
         self.dead = True
@@ -348,7 +358,7 @@ class InkyGhost:
         self.is_enraged = False
         self.movement_history.clear()
 
-    def draw_debug_walkability(self, screen, maze):
+    def _draw_walkability_layer(self, surface, maze):
         for y in range(maze.height):
             for x in range(maze.width):
                 rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
@@ -358,9 +368,28 @@ class InkyGhost:
                 else:
                     color = (255, 0, 0, 100)  # Red for wall
 
-                surface = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-                pygame.draw.rect(surface, color, surface.get_rect())
-                screen.blit(surface, rect.topleft)
+                pygame.draw.rect(surface, color, rect)
+
+    def _draw_scatter_point_layer(self, surface, maze):
+        scatter_x, scatter_y = self.get_scatter_point()
+        scatter_rect = pygame.Rect(scatter_x * CELL_SIZE + CELL_SIZE // 4, scatter_y * CELL_SIZE + CELL_SIZE // 4, CELL_SIZE // 2, CELL_SIZE // 2)
+        pygame.draw.rect(surface, (0, 255, 0), scatter_rect)
+
+    def _draw_respawn_point_layer(self, surface, maze):
+        tx, ty = self.positions['GHOST_RESPAWN_POINT']['INKY']
+        cx = tx * CELL_SIZE + CELL_SIZE // 2
+        cy = ty * CELL_SIZE + CELL_SIZE // 2
+        pygame.draw.circle(surface, (0, 255, 255), (cx, cy), 6)  # Cyan dot on target
+
+    def _debug_layer_size(self, maze):
+        # The scatter point may sit outside the grid, so grow the layer to include it
+        scatter_x, scatter_y = self.get_scatter_point()
+        return (max(maze.width, scatter_x + 1) * CELL_SIZE, max(maze.height, scatter_y + 1) * CELL_SIZE)
+
+    def draw_debug_walkability(self, screen, maze):
+        # Rendered once per maze layout; each frame only blits the cached overlay
+        overlay = self.debug_layers.get("walkability", maze, self._draw_walkability_layer)
+        screen.blit(overlay, (0, 0))
 
     def update(self, maze, pos_players, power_up_players):
         # (0) Enter FRIGHTENED mode if a player collects a power pellet
@@ -391,7 +420,7 @@ class InkyGhost:
         # (0.5) Check if Inky move to ghost spawn point
         if self.ai_mode == "EATEN":
             now_x, now_y = self.grid_x, self.grid_y
-            respawn_x, respawn_y = POSITIONS['GHOST_RESPAWN_POINT']['INKY']
+            respawn_x, respawn_y = self.positions['GHOST_RESPAWN_POINT']['INKY']
             if (now_x, now_y) == (respawn_x, respawn_y):
                 self.revive()
                 # Immediately check if Inky should be enraged after revive
@@ -418,7 +447,7 @@ class InkyGhost:
             if food_percentage <= 20:
                 self.is_enraged = True
                 self.state_change("ENRAGED")
-                print("Inky is enraged! Speed increased.")
+                log_event("Inky is enraged! Speed increased.")
 
         # (3) run the moving algorithm
         if self.pixel_x % CELL_SIZE == 0 and self.pixel_y % CELL_SIZE == 0:
@@ -427,8 +456,12 @@ class InkyGhost:
         # (4) update pixel position
         self.move_towards_target()
 
-    def render(self, screen, maze=None, debug_mode=False):
-        if debug_mode:
+        self.animation_timer += 1
+
+    def render(self, screen, maze=None, debug_mode=False, alpha=1.0):
+        pixel_x, pixel_y = self.get_interpolated_position(alpha)
+
+        if debug_mode and maze is not None:
             # Draw walkability grid if debug mode is enabled
             self.draw_debug_walkability(screen, maze)
 
@@ -440,19 +473,14 @@ class InkyGhost:
                 pygame.draw.rect(screen, (128, 0, 128), path_rect)  # Purple for A* path
 
         # Draw scatter points and path in scatter mode (green) if debug mode
-        if debug_mode and self.ai_mode == "SCATTER":
+        if debug_mode and maze is not None and self.ai_mode == "SCATTER":
             # Draw single scatter point
-            scatter_point = self.get_scatter_point()
-            scatter_x, scatter_y = scatter_point
-            scatter_rect = pygame.Rect(scatter_x * CELL_SIZE + CELL_SIZE // 4, scatter_y * CELL_SIZE + CELL_SIZE // 4, CELL_SIZE // 2, CELL_SIZE // 2)
-            pygame.draw.rect(screen, (0, 255, 0), scatter_rect)
-
-        if debug_mode and self.ai_mode == "EATEN":
-            target_pos = POSITIONS['GHOST_RESPAWN_POINT']['INKY']
-            tx, ty = target_pos
-            cx = tx * CELL_SIZE + CELL_SIZE // 2
-            cy = ty * CELL_SIZE + CELL_SIZE // 2
-            pygame.draw.circle(screen, (0, 255, 255), (cx, cy), 6)  # Cyan dot on target
+            layer = self.debug_layers.get("scatter_point", maze, self._draw_scatter_point_layer, self._debug_layer_size(maze))
+            screen.blit(layer, (0, 0))
+
+        if debug_mode and maze is not None and self.ai_mode == "EATEN":
+            layer = self.debug_layers.get("respawn_point", maze, self._draw_respawn_point_layer, self._debug_layer_size(maze))
+            screen.blit(layer, (0, 0))
 
         # Draw grid-based movement history (red squares) if debug mode
         if debug_mode and self.movement_history:
@@ -470,35 +498,25 @@ class InkyGhost:
             target_rect = pygame.Rect(target_x * CELL_SIZE + CELL_SIZE // 4, target_y * CELL_SIZE + CELL_SIZE // 4, CELL_SIZE // 2, CELL_SIZE // 2)
             pygame.draw.rect(screen, (0, 0, 255), target_rect)
 
-        # Try to get ghost sprite - use fallback sprite names
-        sprite = None
-        sprite_names_to_try = ["inky", "ghost", "ghost1", self.player_id]
-
-        for sprite_name in sprite_names_to_try:
-            sprite = self.sprite_manager.get_sprite(sprite_name, self.direction.lower())
-            if sprite:
-                break
+        # Frames are pre-tinted at load; pick the list for the current mode and advance by tick
+        if self.ai_mode == "FRIGHTENED":
+            tint = "FRIGHTENED"
+        elif self.is_enraged:
+            tint = "ENRAGED"
+        else:
+            tint = None
+        sprite = self.animation.get_frame(self.ai_mode, self.animation_timer, tint) if self.animation else None
 
         if sprite:
-            bobbed_y = self.pixel_y + self.bob_offset
+            bobbed_y = pixel_y + self.bob_offset
+            screen.blit(sprite, (pixel_x, bobbed_y))
 
-            # Add red tint when enraged
             if self.is_enraged:
-                # Create a red-tinted version of the sprite
-                tinted_sprite = sprite.copy()
-                red_overlay = pygame.Surface(sprite.get_size())
-                red_overlay.fill((255, 0, 0))
-                red_overlay.set_alpha(100)  # Semi-transparent red
-                tinted_sprite.blit(red_overlay, (0, 0), special_flags=pygame.BLEND_MULT)
-                screen.blit(tinted_sprite, (self.pixel_x, bobbed_y))
-
                 # Add pulsing red glow around enraged ghost
                 glow_radius = int(CELL_SIZE // 2 + math.sin(self.animation_timer * 0.3) * 5)
                 glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
                 pygame.draw.circle(glow_surface, (255, 0, 0, 50), (glow_radius, glow_radius), glow_radius)
-                screen.blit(glow_surface, (self.pixel_x + CELL_SIZE // 2 - glow_radius, bobbed_y + CELL_SIZE // 2 - glow_radius))
-            else:
-                screen.blit(sprite, (self.pixel_x, bobbed_y))
+                screen.blit(glow_surface, (pixel_x + CELL_SIZE // 2 - glow_radius, bobbed_y + CELL_SIZE // 2 - glow_radius))
         else:
             if self.is_enraged:
                 color = (255, 50, 50)  # Bright red for enraged mode
@@ -512,11 +530,11 @@ class InkyGhost:
                 color = (128, 128, 128)  # Gray for eaten mode
             else:
                 color = (255, 255, 255)  # Default white
-            pygame.draw.rect(screen, color, (self.pixel_x, self.pixel_y, CELL_SIZE, CELL_SIZE))
+            pygame.draw.rect(screen, color, (pixel_x, pixel_y, CELL_SIZE, CELL_SIZE))
 
         # Debug info
         if debug_mode:
-            font = pygame.font.Font(None, 24)
+            font = get_debug_font(24)
             mode_text = self.ai_mode
             if self.is_enraged:
                 mode_text += f" SPD:{self.speed:.1f}"
@@ -526,7 +544,18 @@ class InkyGhost:
             else:
                 debug_text = f"{mode_text}"
             text_surface = font.render(debug_text, True, (255, 255, 255))
-            screen.blit(text_surface, (self.pixel_x, self.pixel_y - 30))
+            screen.blit(text_surface, (pixel_x, pixel_y - 30))
+
+    def reset_ai(self):
+        """Back to the first-tick chase state, for a new match rather than a respawn."""
+        self.ai_mode = "CHASE"
+        self.mode_timer = 0
+        self.path_recalculation_timer = 0
+        self.stuck_counter = 0
+        self.first_frightened = True
+        self.last_grid_pos = None
+        self.target = None
+        self.speed = self.base_speed
 
     def reset_position(self, x, y):
         self.grid_x = x
@@ -0,0 +1,19 @@
+from constants import CELL_SIZE
+
+
+class InterpolatedPosition:
+    """Render-side smoothing for entities with pixel_x/pixel_y that move once per simulation tick."""
+
+    def store_previous_position(self):
+        """Remember where this tick started so rendering can interpolate towards the new position."""
+        self.prev_pixel_x = self.pixel_x
+        self.prev_pixel_y = self.pixel_y
+
+    def get_interpolated_position(self, alpha):
+        """Pixel position blended between the previous and current tick (alpha 0..1)."""
+        dx = self.pixel_x - self.prev_pixel_x
+        dy = self.pixel_y - self.prev_pixel_y
+        # Teleports (respawn, reset) snap instead of sliding across the maze
+        if alpha >= 1.0 or abs(dx) > CELL_SIZE or abs(dy) > CELL_SIZE:
+            return self.pixel_x, self.pixel_y
+        return self.prev_pixel_x + dx * alpha, self.prev_pixel_y + dy * alpha
@@ -1,4 +1,4 @@
-import pygame
+from optional_pygame import pygame
 from constants import *
 from entities.player_base import PlayerBase
 
@@ -58,11 +58,12 @@ class Player(PlayerBase):
 
         self._update_pixel_position()
 
-    def render(self, screen, debug=False):
+    def render(self, screen, debug=False, alpha=1.0):
         if self.is_dead():
             return
 
-        sprite = self.sprite_manager.get_sprite(self.player_id, self.direction.lower())
+        pixel_x, pixel_y = self.get_interpolated_position(alpha)
+        sprite = self.sprite_manager.get_sprite_by_id(self.sprite_ids[self.direction])
         should_render = True
 
         if self.is_invincible and self.power_timer <= 0:
@@ -72,7 +73,7 @@ class Player(PlayerBase):
 
         if should_render:
             if sprite:
-                render_y = self.pixel_y + self.bob_offset
+                render_y = pixel_y + self.bob_offset
 
                 # Add power mode visual effect
                 if self.power_timer > 0:
@@ -81,14 +82,14 @@ class Player(PlayerBase):
                     glow_surface.set_alpha(100)
                     glow_color = YELLOW if self.power_timer > 60 else RED
                     pygame.draw.circle(glow_surface, glow_color, (CELL_SIZE // 2 + 2, CELL_SIZE // 2 + 2), CELL_SIZE // 2 + 2)
-                    screen.blit(glow_surface, (self.pixel_x - 2, render_y - 2))
+                    screen.blit(glow_surface, (pixel_x - 2, render_y - 2))
 
-                screen.blit(sprite, (self.pixel_x, render_y))
+                screen.blit(sprite, (pixel_x, render_y))
             else:
                 color = YELLOW if self.player_id == "player1" else RED
                 if self.is_invincible:
                     color = tuple(min(255, c + 100) for c in color)
-                pygame.draw.circle(screen, color, (int(self.pixel_x + CELL_SIZE // 2), int(self.pixel_y + CELL_SIZE // 2)), CELL_SIZE // 2 - 2)
+                pygame.draw.circle(screen, color, (int(pixel_x + CELL_SIZE // 2), int(pixel_y + CELL_SIZE // 2)), CELL_SIZE // 2 - 2)
 
     def reset_position(self, x, y):
         self.grid_x = x
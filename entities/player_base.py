@@ -1,16 +1,25 @@
-import pygame
+from optional_pygame import pygame
 import math
 from constants import *
+from core.event_log import log_event
+from entities.interpolation import InterpolatedPosition
 
 
-class PlayerBase:
+class PlayerBase(InterpolatedPosition):
     def __init__(self, player_id, start_x, start_y, sprite_manager):
         self.player_id = player_id
         self.grid_x = start_x
         self.grid_y = start_y
         self.pixel_x = start_x * CELL_SIZE
         self.pixel_y = start_y * CELL_SIZE
+        self.prev_pixel_x = self.pixel_x
+        self.prev_pixel_y = self.pixel_y
         self.sprite_manager = sprite_manager
+        # Atlas handles per direction, resolved once instead of building a key every frame
+        if sprite_manager is not None:
+            self.sprite_ids = sprite_manager.get_sprite_ids(player_id)
+        else:
+            self.sprite_ids = {direction: None for direction in DIRECTIONS}
         self.score = 0
         self.moving = False
         self.movement_progress = 0.0
@@ -120,7 +129,7 @@ class PlayerBase:
             if self.power_timer > 0:
                 # Player is powered up - hunt the ghost
                 self.score += 200
-                print(f"Player {self.player_id} caught a ghost! +200 points")
+                log_event(f"Player {self.player_id} caught a ghost! +200 points")
                 return "caught_ghost"  # Return special value to indicate ghost was caught
             else:
                 # Player is not powered up - take damage
@@ -0,0 +1,187 @@
+import argparse
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from constants import SIM_TICK_RATE
+from maze_layout import MAZE_LAYOUTS
+from entities.ai.algorithm_switcher import AIBenchmark, AlgorithmSwitcher, BenchmarkResultSink, BENCHMARK_OUTPUT_DIR
+from game.simulation import SimulationCore
+
+DEFAULT_SEED_COUNT = 5
+DEFAULT_MAX_TICKS = 20000
+
+
+def game_result_for_ai(sim):
+    """Map a finished match to AIBenchmark's 'WIN'/'LOSS'/'DRAW'/'INCOMPLETE' from the AI's side."""
+    winner = sim.get_winner()
+    if winner == "player2":
+        return 'WIN'
+    elif winner in ("player1", "both_dead"):
+        return 'LOSS'
+    elif winner == "draw":
+        return 'DRAW'
+    return 'INCOMPLETE'
+
+
+def run_benchmark_game(job):
+    """Play one headless match and return its AIBenchmark record.
+
+    job is (algorithm, layout_name, seed, max_ticks). Top level so multiprocessing can pickle it.
+    """
+    algorithm, layout_name, seed, max_ticks = job
+    maze_layout = MAZE_LAYOUTS[layout_name]
+    sim = SimulationCore.create_headless(ai_type=algorithm, layout=maze_layout['layout'], positions=maze_layout['positions'], seed=seed)
+
+    benchmark = AIBenchmark()
+    benchmark.start_benchmark(algorithm, layout_name)
+    started = time.perf_counter()
+    try:
+        result = sim.run(max_ticks=max_ticks)
+    except Exception as e:
+        # One broken behaviour should not take the rest of the sweep down with it
+        result = sim.get_result()
+        benchmark.current_test['error'] = f"{type(e).__name__}: {e}"
+    wall_time = time.perf_counter() - started
+    return _finish_record(benchmark, sim, result, wall_time)
+
+
+def _finish_record(benchmark, sim, result, wall_time):
+    """Fill in and close benchmark.current_test for a match that has stopped; returns the record."""
+    benchmark.update_benchmark_stats(sim.player2, sim.maze)
+    record = benchmark.current_test
+    record['seed'] = sim.seed
+    record['ticks'] = result['ticks']
+    record['wall_time_seconds'] = wall_time
+    record['score'] = result['player2_score']
+    record['pellets_left'] = result['pellets_left']
+    game_result = 'ERROR' if 'error' in record else game_result_for_ai(sim)
+    # Game time, so runs compare the same regardless of machine load
+    benchmark.end_benchmark(game_result, result['ticks'] / SIM_TICK_RATE)
+    return record
+
+
+class GameBenchmarkRecorder:
+    """SimulationCore observer that turns every match it sees into an AIBenchmark record.
+
+    Used by the windowed game's fast-forward mode: a record starts on the first tick of a match
+    and ends when the match does (or when finish() is called for a match cut short). Records go
+    to benchmark.results and, if a sink is given, straight to disk.
+    """
+
+    def __init__(self, benchmark, maze_name="default", sink=None):
+        self.benchmark = benchmark
+        self.maze_name = maze_name
+        self.sink = sink
+        self.started = 0.0
+        self.completed = 0
+
+    def on_tick_start(self, sim):
+        if self.benchmark.current_test is None:
+            self.benchmark.start_benchmark(sim.player2.get_current_algorithm(), self.maze_name)
+            self.started = time.perf_counter()
+
+    def on_game_over(self, sim):
+        self.finish(sim)
+
+    def finish(self, sim):
+        if self.benchmark.current_test is None:
+            return None
+        record = _finish_record(self.benchmark, sim, sim.get_result(), time.perf_counter() - self.started)
+        if self.sink is not None:
+            self.sink.append(record)
+        self.completed += 1
+        print(
+            f"[{self.completed}] {record['algorithm']} seed {record['seed']}: {record['stats']['game_result']} "
+            f"in {record['ticks']} ticks ({record['ticks'] / max(record['wall_time_seconds'], 1e-9):.0f} ticks/s)"
+        )
+        return record
+
+    def discard(self):
+        """Drop the match in progress without recording it."""
+        self.benchmark.current_test = None
+
+
+class BenchmarkSweep:
+    """Every algorithm x seed x maze layout, played headless across a process pool."""
+
+    def __init__(self, algorithms=None, seeds=DEFAULT_SEED_COUNT, layouts=None, max_ticks=DEFAULT_MAX_TICKS, processes=None, benchmark=None, output_path=None, flush_every=20):
+        self.algorithms = list(algorithms) if algorithms else list(AlgorithmSwitcher().available_algorithms)
+        self.seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+        self.layouts = list(layouts) if layouts else list(MAZE_LAYOUTS.keys())
+        self.max_ticks = max_ticks
+        self.processes = processes or os.cpu_count() or 1
+        self.benchmark = benchmark if benchmark is not None else AIBenchmark()
+        if output_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(BENCHMARK_OUTPUT_DIR, f"sweep_{timestamp}.jsonl")
+        self.output_path = output_path
+        self.flush_every = flush_every
+        self.completed = 0
+
+        for layout_name in self.layouts:
+            if layout_name not in MAZE_LAYOUTS:
+                raise ValueError(f"Unknown maze layout: {layout_name} (available: {list(MAZE_LAYOUTS.keys())})")
+
+    def build_jobs(self):
+        return [(algorithm, layout_name, seed, self.max_ticks) for algorithm in self.algorithms for layout_name in self.layouts for seed in self.seeds]
+
+    def run(self):
+        """Play every job, appending each record to benchmark.results and the output file as it finishes."""
+        jobs = self.build_jobs()
+        processes = max(1, min(self.processes, len(jobs)))
+        print(
+            f"Benchmark: {len(jobs)} runs ({len(self.algorithms)} algorithms x {len(self.seeds)} seeds x "
+            f"{len(self.layouts)} layouts) on {processes} processes"
+        )
+
+        started = time.perf_counter()
+        with BenchmarkResultSink(self.output_path, flush_every=self.flush_every) as sink:
+            if processes == 1:
+                for record in map(run_benchmark_game, jobs):
+                    self._record(record, sink, len(jobs))
+            else:
+                # Spawned workers start clean instead of inheriting the parent's pygame/SDL state
+                context = multiprocessing.get_context("spawn")
+                with context.Pool(processes) as pool:
+                    for record in pool.imap_unordered(run_benchmark_game, jobs):
+                        self._record(record, sink, len(jobs))
+
+        elapsed = time.perf_counter() - started
+        print(f"Benchmark finished: {self.completed} runs in {elapsed:.1f}s, results in {self.output_path}")
+        return self.benchmark.results
+
+    def summary_basename(self):
+        """Summary tables sit next to the results file: sweep_X.jsonl -> sweep_X_by_algorithm.csv etc."""
+        return os.path.splitext(self.output_path)[0]
+
+    def _record(self, record, sink, total):
+        self.benchmark.results[record['algorithm']].append(record)
+        sink.append(record)
+        self.completed += 1
+        print(
+            f"[{self.completed}/{total}] {record['algorithm']} on {record['maze']} seed {record['seed']}: "
+            f"{record['stats']['game_result']} in {record['ticks']} ticks"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every AI algorithm headless over several seeds and maze layouts.")
+    parser.add_argument("--algorithms", nargs="+", help="Algorithms to run (default: all in AlgorithmSwitcher)")
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEED_COUNT, help="Number of seeds per algorithm and layout")
+    parser.add_argument("--layouts", nargs="+", choices=list(MAZE_LAYOUTS.keys()), help="Maze layouts (default: all)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="Ticks before a run counts as INCOMPLETE")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="JSON lines file to append results to")
+    args = parser.parse_args()
+
+    sweep = BenchmarkSweep(
+        algorithms=args.algorithms, seeds=args.seeds, layouts=args.layouts, max_ticks=args.max_ticks, processes=args.processes, output_path=args.output
+    )
+    sweep.run()
+    sweep.benchmark.summarize_results()
+    sweep.benchmark.export_summary(sweep.summary_basename())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+from core.event_log import log_event
+
+
 class CollisionSystem:
     def __init__(self):
         pass
@@ -36,19 +39,27 @@ class CollisionSystem:
             if result['type'] == 'ghost_caught':
                 player = result['player']
                 ghost = result['ghost']
-                print(f"{player.player_id} caught a ghost! +200 points! Score: {player.score}")
+                log_event(f"{player.player_id} caught a ghost! +200 points! Score: {player.score}")
                 ghost.kill()
+                self._record_ai_stat(player, 'ghosts_eaten')
 
             elif result['type'] == 'player_damaged':
                 player = result['player']
                 ghost = result['ghost']
-                print(f"{player.player_id} hit by ghost! Health: {player.health}")
+                log_event(f"{player.player_id} hit by ghost! Health: {player.health}")
 
                 if result['player_died']:
-                    print(f"{player.player_id} has died!")
+                    log_event(f"{player.player_id} has died!")
+                    self._record_ai_stat(player, 'deaths')
                     self._handle_player_death(player)
 
+    def _record_ai_stat(self, player, stat_name):
+        # Only AI players keep algorithm_stats; AIBenchmark reads them at the end of a run
+        ai_state = getattr(player, 'ai_state', None)
+        if ai_state is not None:
+            ai_state.algorithm_stats[stat_name] += 1
+
     def _handle_player_death(self, player):
-        print(f"Handling death for player {player.player_id}")
+        log_event(f"Handling death for player {player.player_id}")
         # !NOTE: Add stuff later on maybe...
         # Reset player position, score, etc
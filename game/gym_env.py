@@ -0,0 +1,140 @@
+import numpy as np
+from constants import DIRECTIONS
+from maze_layout import MAZE_LAYOUTS
+from core.event_log import show_events
+from game.simulation import SimulationCore
+
+ACTIONS = list(DIRECTIONS)  # step() takes an index into this; -1 or None keeps the last direction
+
+# Planes of the (channels, height, width) grid observation, all 0/1
+OBSERVATION_CHANNELS = ("walls", "pellets", "power_pellets", "player1", "player2", "ghost")
+WALLS, PELLETS, POWER_PELLETS, PLAYER1, PLAYER2, GHOST = range(len(OBSERVATION_CHANNELS))
+
+GHOST_MODES = ("CHASE", "SCATTER", "FRIGHTENED", "ENRAGED", "EATEN")
+# Entries of the float32 state vector; the ghost's mode is one-hot
+STATE_FIELDS = (
+    "player1_health", "player2_health", "player1_power", "player2_power",
+    "player1_progress", "player2_progress", "food_left", "ghost_dead",
+) + tuple(f"ghost_{mode.lower()}" for mode in GHOST_MODES)
+
+DAMAGE_PENALTY = 100  # Reward lost per point of health, so dying is never worth a pellet
+DEFAULT_MAX_TICKS = 20000
+
+
+class PacmanEnv:
+    """reset(seed)/step(action) over SimulationCore, for learning and search agents.
+
+    The agent plays player 1 against the built-in AI (opponent) and the ghost. Each step applies
+    the action, runs ticks_per_step simulation ticks and returns
+    (observation, reward, terminated, truncated, info) in the gymnasium order. The reward is the
+    agent's score gain minus DAMAGE_PENALTY per health lost.
+
+    The observation is a dict of two arrays allocated once and updated in place: 'grid', a uint8
+    (channels, height, width) stack of OBSERVATION_CHANNELS, and 'state', a float32 vector of
+    STATE_FIELDS. Copy them if you need to keep one past the next step.
+    """
+
+    def __init__(self, layout_name="default", opponent="reflex_agent", ticks_per_step=1, max_ticks=DEFAULT_MAX_TICKS, verbose=False):
+        maze = MAZE_LAYOUTS[layout_name]
+        self.layout_name = layout_name
+        self.ticks_per_step = ticks_per_step
+        self.max_ticks = max_ticks
+        self.verbose = verbose
+        self.sim = SimulationCore.create_headless(ai_type=opponent, layout=maze['layout'], positions=maze['positions'], hide_player1=False)
+
+        layout = self.sim.maze.layout
+        self.height = len(layout)
+        self.width = len(layout[0])
+        self.grid = np.zeros((len(OBSERVATION_CHANNELS), self.height, self.width), dtype=np.uint8)
+        self.state = np.zeros(len(STATE_FIELDS), dtype=np.float32)
+        self.observation = {'grid': self.grid, 'state': self.state}
+        self.info = {'tick': 0, 'score': 0, 'opponent_score': 0, 'result': None}
+
+        self.initial_grid = np.zeros((3, self.height, self.width), dtype=np.uint8)
+        for y, row in enumerate(layout):
+            for x, value in enumerate(row):
+                self.initial_grid[WALLS, y, x] = value == 3
+                self.initial_grid[PELLETS, y, x] = value == 1
+                self.initial_grid[POWER_PELLETS, y, x] = value == 2
+        self.ghost_mode_index = {mode: STATE_FIELDS.index(f"ghost_{mode.lower()}") for mode in GHOST_MODES}
+        self.entity_cells = [None, None, None]  # Where each entity channel currently has its 1
+        self.reset()
+
+    @property
+    def action_count(self):
+        return len(ACTIONS)
+
+    def reset(self, seed=None):
+        """Start a new match and return (observation, info)."""
+        self.sim.reset(seed)
+        self.grid[:3] = self.initial_grid
+        self.grid[PLAYER1:].fill(0)
+        self.entity_cells = [None, None, None]
+        self.info['result'] = None
+        self._write_observation()
+        return self.observation, self.info
+
+    def step(self, action):
+        sim = self.sim
+        player1 = sim.player1
+        score = player1.score
+        health = player1.health
+        direction = ACTIONS[action] if action is not None and action >= 0 else None
+
+        with show_events(self.verbose):  # Entities log most events
+            for _ in range(self.ticks_per_step):
+                running = sim.tick(direction)
+                self._clear_eaten_pellets()
+                if not running or sim.tick_count >= self.max_ticks:
+                    break
+
+        self._write_observation()
+        reward = (player1.score - score) - DAMAGE_PENALTY * (health - player1.health)
+        terminated = sim.is_game_over()
+        truncated = not terminated and sim.tick_count >= self.max_ticks
+        if terminated or truncated:
+            self.info['result'] = sim.get_result()
+        return self.observation, reward, terminated, truncated, self.info
+
+    def _clear_eaten_pellets(self):
+        # Pellets only ever disappear under a player, so only those two cells can have changed
+        maze = self.sim.maze
+        for player in (self.sim.player1, self.sim.player2):
+            x, y = player.grid_x, player.grid_y
+            if self.grid[PELLETS, y, x] or self.grid[POWER_PELLETS, y, x]:
+                if not maze.is_pellet(x, y):
+                    self.grid[PELLETS, y, x] = 0
+                    self.grid[POWER_PELLETS, y, x] = 0
+
+    def _write_observation(self):
+        sim = self.sim
+        player1, player2, ghost = sim.player1, sim.player2, sim.inky_ghost
+        grid = self.grid
+        entities = ((player1, not player1.is_dead()), (player2, not player2.is_dead()), (ghost, True))
+        for index, (entity, present) in enumerate(entities):
+            channel = PLAYER1 + index
+            old = self.entity_cells[index]
+            if old is not None:
+                grid[channel, old[1], old[0]] = 0
+            if present:
+                grid[channel, entity.grid_y, entity.grid_x] = 1
+                self.entity_cells[index] = (entity.grid_x, entity.grid_y)
+            else:
+                self.entity_cells[index] = None
+
+        state = self.state
+        state.fill(0)
+        state[0] = player1.health
+        state[1] = player2.health
+        state[2] = player1.power_timer / player1.power_up_duration
+        state[3] = player2.power_timer / player2.power_up_duration
+        state[4] = player1.movement_progress
+        state[5] = player2.movement_progress
+        state[6] = sim.maze.get_remaining_food_count() / max(sim.maze.total_pellets, 1)
+        state[7] = ghost.dead
+        state[self.ghost_mode_index[ghost.ai_mode]] = 1
+
+        info = self.info
+        info['tick'] = sim.tick_count
+        info['score'] = player1.score
+        info['opponent_score'] = player2.score
@@ -25,7 +25,9 @@ class InputHandler:
             pygame.K_F9: "next_algorithm",
             pygame.K_F10: "prev_algorithm",
             pygame.K_F11: "run_benchmark",
-            pygame.K_F12: "save_results",
+            pygame.K_F12: "profile_capture",
+            pygame.K_t: "export_trace",
+            pygame.K_g: "fast_forward",
         }
 
     def handle_events(self, events, state_manager, callbacks):
@@ -0,0 +1,244 @@
+import bisect
+import gc
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram upper bounds in seconds
+DECISION_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+GC_PAUSE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+
+
+class _Histogram:
+    """Cumulative-style histogram; only the simulation thread writes to it."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def freeze(self):
+        return (tuple(self.counts), self.total, self.count)
+
+
+def _read_rss_bytes():
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current RSS, but the best available off Linux (kB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+class SimulationMetrics:
+    """SimulationCore observer that counts ticks, decisions, search effort, games and GC pauses.
+
+    The simulation thread updates its own counters and every publish_every ticks swaps in a new
+    immutable snapshot dict. The HTTP thread only ever reads self.snapshot, so neither side takes
+    a lock and a slow scrape can never stall a tick.
+    """
+
+    def __init__(self, publish_every=10):
+        self.publish_every = publish_every
+        self.started = time.perf_counter()
+
+        self.ticks = 0
+        self.games = {}  # result -> count
+        self.decision_latency = {}  # behavior -> _Histogram
+        self.nodes_expanded = {}  # algorithm -> count
+        # Every generation exists up front: the GC callback can fire mid-snapshot on any thread, so it
+        # must never add keys to a dict _build_snapshot may be iterating
+        self.gc_pauses = {generation: _Histogram(GC_PAUSE_BUCKETS) for generation in range(3)}  # generation -> _Histogram
+        self.ticks_per_second = 0.0
+
+        self._rate_ticks = 0
+        self._rate_started = time.perf_counter()
+        self._seen_decisions = {}  # id(ai player) -> decisions already counted
+        self._seen_nodes = {}  # id(pathfinding) -> {algorithm: nodes already counted}
+        self._gc_started = None
+
+        self.snapshot = self._build_snapshot()
+
+    # -- GC pauses
+
+    def install_gc_callback(self):
+        gc.callbacks.append(self._on_gc)
+
+    def remove_gc_callback(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            histogram = self.gc_pauses.get(info.get('generation', 0))
+            if histogram is not None:
+                histogram.observe(time.perf_counter() - self._gc_started)
+            self._gc_started = None
+
+    # -- observer hooks
+
+    def on_tick(self, sim):
+        self.ticks += 1
+        self._rate_ticks += 1
+
+        ai_player = sim.player2
+        decisions = getattr(ai_player, 'decisions_made', None)
+        if decisions is not None:
+            key = id(ai_player)
+            # != rather than >: reset_ai() starts the count over when a match restarts
+            if decisions and decisions != self._seen_decisions.get(key, 0):
+                behavior = ai_player.get_current_algorithm()
+                histogram = self.decision_latency.get(behavior)
+                if histogram is None:
+                    histogram = self.decision_latency[behavior] = _Histogram(DECISION_LATENCY_BUCKETS)
+                histogram.observe(ai_player.last_decision_time_ns / 1e9)
+            self._seen_decisions[key] = decisions
+
+        if self.ticks % self.publish_every == 0:
+            self._collect_nodes(ai_player)
+            self.publish()
+
+    def on_game_over(self, sim):
+        winner = sim.get_winner() or "unfinished"
+        self.games[winner] = self.games.get(winner, 0) + 1
+        self._collect_nodes(sim.player2)
+        # Finished players are dropped, so a long soak doesn't keep one entry per game
+        self._seen_decisions.pop(id(sim.player2), None)
+        self._seen_nodes.pop(id(getattr(sim.player2, 'pathfinding', None)), None)
+        self.publish()
+
+    def _collect_nodes(self, ai_player):
+        pathfinding = getattr(ai_player, 'pathfinding', None)
+        if pathfinding is None:
+            return
+        seen = self._seen_nodes.setdefault(id(pathfinding), {})
+        for algorithm, total in pathfinding.cumulative_nodes_expanded.items():
+            delta = total - seen.get(algorithm, 0)
+            if delta:
+                self.nodes_expanded[algorithm] = self.nodes_expanded.get(algorithm, 0) + delta
+                seen[algorithm] = total
+
+    # -- snapshots
+
+    def publish(self):
+        now = time.perf_counter()
+        elapsed = now - self._rate_started
+        if elapsed >= 1.0:
+            self.ticks_per_second = self._rate_ticks / elapsed
+            self._rate_ticks = 0
+            self._rate_started = now
+        self.snapshot = self._build_snapshot()
+
+    def _build_snapshot(self):
+        return {
+            'ticks': self.ticks,
+            'ticks_per_second': self.ticks_per_second,
+            'uptime': time.perf_counter() - self.started,
+            'games': dict(self.games),
+            'decision_latency': {behavior: h.freeze() for behavior, h in self.decision_latency.items()},
+            'nodes_expanded': dict(self.nodes_expanded),
+            'gc_pauses': {generation: h.freeze() for generation, h in self.gc_pauses.items()},
+        }
+
+
+def _format_histogram(lines, name, buckets, label_name, histograms):
+    for label, (counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{label_name}="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label_name}="{label}",le="+Inf"}} {count}')
+        lines.append(f'{name}_sum{{{label_name}="{label}"}} {total}')
+        lines.append(f'{name}_count{{{label_name}="{label}"}} {count}')
+
+
+def format_prometheus(snapshot):
+    """Render a SimulationMetrics snapshot in the Prometheus text exposition format."""
+    lines = [
+        "# HELP pacman_ticks_total Simulation ticks run.",
+        "# TYPE pacman_ticks_total counter",
+        f"pacman_ticks_total {snapshot['ticks']}",
+        "# HELP pacman_ticks_per_second Ticks per second over the last publish interval.",
+        "# TYPE pacman_ticks_per_second gauge",
+        f"pacman_ticks_per_second {snapshot['ticks_per_second']:.3f}",
+        "# HELP pacman_uptime_seconds Seconds since the exporter started.",
+        "# TYPE pacman_uptime_seconds gauge",
+        f"pacman_uptime_seconds {snapshot['uptime']:.3f}",
+        "# HELP pacman_games_total Finished games by winner.",
+        "# TYPE pacman_games_total counter",
+    ]
+    for winner, count in sorted(snapshot['games'].items()):
+        lines.append(f'pacman_games_total{{winner="{winner}"}} {count}')
+
+    lines += ["# HELP pacman_decision_latency_seconds AI decision time (analyze_situation + execute_behavior).", "# TYPE pacman_decision_latency_seconds histogram"]
+    _format_histogram(lines, "pacman_decision_latency_seconds", DECISION_LATENCY_BUCKETS, "behavior", snapshot['decision_latency'])
+
+    lines += ["# HELP pacman_nodes_expanded_total Search nodes expanded by find_path.", "# TYPE pacman_nodes_expanded_total counter"]
+    for algorithm, count in sorted(snapshot['nodes_expanded'].items()):
+        lines.append(f'pacman_nodes_expanded_total{{algorithm="{algorithm}"}} {count}')
+
+    lines += ["# HELP pacman_gc_pause_seconds Garbage collector pause time.", "# TYPE pacman_gc_pause_seconds histogram"]
+    _format_histogram(lines, "pacman_gc_pause_seconds", GC_PAUSE_BUCKETS, "generation", snapshot['gc_pauses'])
+
+    lines += [
+        "# HELP pacman_resident_memory_bytes Resident set size of the process.",
+        "# TYPE pacman_resident_memory_bytes gauge",
+        f"pacman_resident_memory_bytes {_read_rss_bytes()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves /metrics from a SimulationMetrics on a localhost port, on a daemon thread."""
+
+    def __init__(self, metrics, port=9100, host="127.0.0.1"):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = format_prometheus(metrics.snapshot).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"Metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,173 @@
+import argparse
+import os
+import random
+import time
+import numpy as np
+from maze_layout import MAZE_LAYOUTS
+from entities.ai.behaviors.q_learning import Q_TABLE_DIR, q_table_path, new_q_table
+from game.simulation import SimulationCore
+
+DEATH_PENALTY = 300  # Per health point lost, on top of whatever the score did
+WIN_BONUS = 500
+STEP_COST = 1  # Per decision, so dawdling costs something even when nothing else happens
+PROGRESS_EVERY = 50  # Episodes between progress lines and table saves
+
+
+class QLearner:
+    """One-step Q-learning over QLearningBehavior decisions, with epsilon-greedy exploration.
+
+    The behavior calls decide() at every AI decision; the reward for the previous decision is
+    read off the AIPlayer's score and health since then. finish() closes an episode; a game cut
+    off by max_ticks hasn't ended, so its last update bootstraps from the state it stopped in.
+    """
+
+    def __init__(self, alpha=0.1, gamma=0.95, epsilon=0.1, seed=None, table_dir=Q_TABLE_DIR, fresh=False):
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.rng = random.Random(seed)
+        self.table_dir = table_dir
+        self.fresh = fresh
+        self.tables = {}  # q_table_path -> writable table
+        self.previous = None  # (table, state, action) awaiting its reward
+        self.last_score = 0
+        self.last_health = 0
+
+    def table_for(self, maze):
+        path = q_table_path(maze, self.table_dir)
+        if path not in self.tables:
+            if os.path.exists(path) and not self.fresh:
+                self.tables[path] = np.array(np.load(path))
+                print(f"Continuing training of {path}")
+            else:
+                self.tables[path] = new_q_table(maze)
+        return self.tables[path]
+
+    def start_episode(self, ai_player):
+        self.previous = None
+        self.last_score = ai_player.score
+        self.last_health = ai_player.health
+
+    def decide(self, ai_player, table, state, valid):
+        values = table[state]
+        self._learn(self._reward(ai_player) - STEP_COST, self.gamma * max(values[index] for index in valid))
+
+        if self.rng.random() < self.epsilon:
+            action = self.rng.choice(valid)
+        else:
+            best = max(values[index] for index in valid)
+            action = self.rng.choice([index for index in valid if values[index] == best])
+        self.previous = (table, state, action)
+        return action
+
+    def finish(self, ai_player, won, cutoff=None):
+        """Update for the episode's last decision: terminal, or from `cutoff` (table, state, valid) if truncated."""
+        future_value = 0.0
+        if cutoff is not None:
+            table, state, valid = cutoff
+            future_value = self.gamma * max(table[state][index] for index in valid)
+        self._learn(self._reward(ai_player) + (WIN_BONUS if won else 0), future_value)
+        self.previous = None
+
+    def _reward(self, ai_player):
+        reward = ai_player.score - self.last_score - DEATH_PENALTY * max(0, self.last_health - ai_player.health)
+        self.last_score = ai_player.score
+        self.last_health = ai_player.health
+        return reward
+
+    def _learn(self, reward, future_value):
+        if self.previous is None:
+            return
+        table, state, action = self.previous
+        entry = state + (action,)
+        table[entry] += self.alpha * (reward + future_value - table[entry])
+
+    def save(self):
+        if not os.path.exists(self.table_dir):
+            os.makedirs(self.table_dir)
+        for path, table in self.tables.items():
+            # Write then rename so a game memory-mapping the old table never sees a half-written file
+            temporary = path + ".tmp"
+            with open(temporary, 'wb') as f:
+                np.save(f, table)
+            os.replace(temporary, path)
+        return list(self.tables)
+
+
+def cutoff_state(sim, behavior):
+    """(table, state, valid actions) where a game cut off by max_ticks stopped, or None if it ended."""
+    ai_player = sim.player2
+    if sim.get_winner() is not None or ai_player.is_dead():
+        return None
+    valid = behavior.valid_actions(sim.maze)
+    if not valid:
+        return None
+    human_pos = sim.player1.get_position() if not sim.player1.is_dead() else None
+    ghost_pos = [sim.inky_ghost.get_position()] if not sim.inky_ghost.is_dead() else []
+    situation = ai_player.decision_maker.analyze_situation(sim.maze, human_pos, ghost_pos)
+    return (behavior.learner.table_for(sim.maze), behavior.encode_state(sim.maze, situation), valid)
+
+
+def train(layouts=None, episodes=2000, max_ticks=6000, alpha=0.1, gamma=0.95, epsilon_start=1.0, epsilon_end=0.05, seed=0, table_dir=Q_TABLE_DIR, fresh=False):
+    """Play `episodes` headless games of q_learning against the ghost, cycling through `layouts`, and save the tables."""
+    layouts = list(layouts) if layouts else list(MAZE_LAYOUTS.keys())
+    learner = QLearner(alpha=alpha, gamma=gamma, seed=seed, table_dir=table_dir, fresh=fresh)
+    print(f"Training q_learning for {episodes} episodes on {', '.join(layouts)}")
+
+    started = time.perf_counter()
+    ticks = 0
+    recent = []
+    for episode in range(episodes):
+        # Explore a lot early, then mostly exploit what has been learned
+        learner.epsilon = epsilon_start + (epsilon_end - epsilon_start) * min(1.0, episode / max(1, episodes * 0.8))
+        layout_name = layouts[episode % len(layouts)]
+        maze = MAZE_LAYOUTS[layout_name]
+        sim = SimulationCore.create_headless(ai_type="q_learning", layout=maze['layout'], positions=maze['positions'], seed=seed + episode)
+        behavior = sim.player2.behavior_manager.behaviors["q_learning"]
+        behavior.learner = learner
+        learner.start_episode(sim.player2)
+
+        result = sim.run(max_ticks=max_ticks)
+        learner.finish(sim.player2, result['winner'] == "player2", cutoff_state(sim, behavior))
+        ticks += result['ticks']
+        recent.append(result)
+
+        if (episode + 1) % PROGRESS_EVERY == 0 or episode + 1 == episodes:
+            wins = sum(1 for r in recent if r['winner'] == "player2")
+            mean_score = sum(r['player2_score'] for r in recent) / len(recent)
+            visited = sum(int(np.count_nonzero(table.any(axis=-1))) for table in learner.tables.values())
+            elapsed = time.perf_counter() - started
+            print(
+                f"Episode {episode + 1}/{episodes}: wins {wins}/{len(recent)}, mean score {mean_score:.0f}, "
+                f"epsilon {learner.epsilon:.2f}, {visited} states visited, {ticks / elapsed:.0f} ticks/s"
+            )
+            recent = []
+            learner.save()
+
+    for path in learner.save():
+        print(f"Q-table written to {path}")
+    return learner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the q_learning behavior's Q-tables on headless games.")
+    parser.add_argument("--episodes", type=int, default=2000, help="Games to play in total")
+    parser.add_argument("--layouts", nargs="+", choices=list(MAZE_LAYOUTS.keys()), help="Maze layouts, played in turn (default: all)")
+    parser.add_argument("--max-ticks", type=int, default=6000, help="Ticks before a game is cut off")
+    parser.add_argument("--alpha", type=float, default=0.1, help="Learning rate")
+    parser.add_argument("--gamma", type=float, default=0.95, help="Discount per decision")
+    parser.add_argument("--epsilon-start", type=float, default=1.0, help="Exploration rate for the first episode")
+    parser.add_argument("--epsilon-end", type=float, default=0.05, help="Exploration rate reached at 80%% of the episodes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game; later games count up from it")
+    parser.add_argument("--table-dir", default=Q_TABLE_DIR, help="Where the tables are read and written (play them with main.py --q-table-dir)")
+    parser.add_argument("--fresh", action="store_true", help="Start from empty tables instead of continuing saved ones")
+    args = parser.parse_args()
+
+    train(
+        layouts=args.layouts, episodes=args.episodes, max_ticks=args.max_ticks, alpha=args.alpha, gamma=args.gamma,
+        epsilon_start=args.epsilon_start, epsilon_end=args.epsilon_end, seed=args.seed, table_dir=args.table_dir, fresh=args.fresh,
+    )
+
+
+if __name__ == "__main__":
+    main()
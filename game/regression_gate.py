@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+import numpy as np
+from entities.ai.benchmark_stats import collect_metric_values, compare_samples
+from entities.ai.pathfinding_benchmark import benchmark_pathfinding
+from game.benchmark_runner import BenchmarkSweep
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# Wall times only compare on the machine that measured them, so they are kept out of the
+# committed baseline and recorded per host on the first run instead
+TIMING_BASELINE_DIR = "benchmark_results"
+
+# Metric kind -> (statistic, relative change?, worse direction, default threshold)
+METRIC_KINDS = {
+    'time': (np.median, True, 1, 0.10),  # +10% median wall time
+    'nodes': (np.mean, True, 1, 0.05),  # +5% nodes expanded
+    'win_rate': (np.mean, False, -1, 0.05),  # 5 points of win rate lost
+}
+
+# Only deterministic per-seed metrics: the sweep runs on a full process pool, so its wall and
+# decision times mostly measure contention. Time is gated on the serial pathfinding microbenchmark.
+SWEEP_METRICS = {
+    'win': 'win_rate',
+    'nodes_expanded': 'nodes',
+}
+
+DEFAULT_CONFIG = {
+    'seeds': 5,
+    'layouts': None,
+    'algorithms': None,
+    'max_ticks': 5000,
+    'pathfinding_repetitions': 30,
+}
+
+
+def _metric_kind(name):
+    metric = name.rsplit("/", 1)[-1]
+    if metric == 'time_ns':
+        return 'time'
+    return SWEEP_METRICS.get(metric, 'nodes')
+
+
+def timing_baseline_path(directory=TIMING_BASELINE_DIR):
+    return os.path.join(directory, f"timing_baseline_{platform.node() or 'local'}.json")
+
+
+def split_timing(metrics):
+    """Split {metric name: samples} into (host-independent metrics, wall-time metrics)."""
+    portable = {name: values for name, values in metrics.items() if _metric_kind(name) != 'time'}
+    timing = {name: values for name, values in metrics.items() if _metric_kind(name) == 'time'}
+    return portable, timing
+
+
+def collect_metrics(config, processes=None):
+    """Run the pathfinding microbenchmark and the headless sweep, returning {metric name: samples}."""
+    metrics = {}
+
+    print("Running pathfinding microbenchmark...")
+    for algorithm, samples in benchmark_pathfinding(repetitions=config['pathfinding_repetitions']).items():
+        for metric, values in samples.items():
+            metrics[f"pathfinding/{algorithm}/{metric}"] = [float(v) for v in values]
+
+    print("Running algorithm sweep...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sweep = BenchmarkSweep(
+        algorithms=config['algorithms'],
+        seeds=config['seeds'],
+        layouts=config['layouts'],
+        max_ticks=config['max_ticks'],
+        processes=processes,
+        output_path=os.path.join("benchmark_results", f"gate_{timestamp}.jsonl"),
+    )
+    sweep.run()
+    # Same order in every run so the gate can compare baseline and current run by run
+    records = sorted((run for runs in sweep.benchmark.results.values() for run in runs), key=lambda r: (r['algorithm'], r['maze'], r['seed']))
+    grouped = collect_metric_values(records, group_by=("algorithm",), metrics=list(SWEEP_METRICS.keys()))
+    for (algorithm,), by_metric in grouped.items():
+        for metric, values in by_metric.items():
+            metrics[f"sweep/{algorithm}/{metric}"] = values.tolist()
+    return metrics
+
+
+def compare_to_baseline(baseline_metrics, current_metrics, thresholds, confidence=0.95):
+    """One row per metric present in both runs; 'regression' is set when the change is both
+    past its threshold and significant (the whole CI of the change lies on the worse side)."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for name in sorted(baseline_metrics):
+        if name not in current_metrics or not baseline_metrics[name] or not current_metrics[name]:
+            continue
+        kind = _metric_kind(name)
+        statistic, relative, worse, _ = METRIC_KINDS[kind]
+        paired = name.startswith("sweep/")
+        result = compare_samples(baseline_metrics[name], current_metrics[name], statistic=statistic, relative=relative, paired=paired, confidence=confidence, rng=rng)
+
+        threshold = thresholds[kind]
+        worse_change = result['change'] * worse
+        # The end of the CI nearest "no change": if even that is worse, the shift is significant
+        best_case = min(result['ci_low'] * worse, result['ci_high'] * worse)
+        result.update({'metric': name, 'kind': kind, 'threshold': threshold, 'regression': worse_change > threshold and best_case > 0})
+        rows.append(result)
+    return rows
+
+
+def _format_change(row):
+    if row['kind'] == 'win_rate':
+        return f"{row['change'] * 100:+.1f} pts [{row['ci_low'] * 100:+.1f}, {row['ci_high'] * 100:+.1f}]"
+    return f"{row['change'] * 100:+.1f}% [{row['ci_low'] * 100:+.1f}, {row['ci_high'] * 100:+.1f}]"
+
+
+def print_report(rows):
+    print("\n--- Benchmark regression check ---")
+    for row in rows:
+        status = "REGRESSION" if row['regression'] else "ok"
+        print(f"  {status:<10} {row['metric']:<45} {row['baseline']:>12.4g} -> {row['current']:<12.4g} {_format_change(row)}")
+    regressions = [row for row in rows if row['regression']]
+    print(f"\n{len(regressions)} regression(s) in {len(rows)} metrics")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(path, config, metrics):
+    baseline = {'created': datetime.now().isoformat(timespec='seconds'), 'config': config, 'metrics': metrics}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"Baseline written to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pathfinding and AI benchmarks against a committed baseline.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file (host-independent metrics)")
+    parser.add_argument("--timing-baseline", default=None, help="Wall-time baseline for this machine (default: one per host under benchmark_results/)")
+    parser.add_argument("--update-baseline", action="store_true", help="Record a new baseline instead of comparing")
+    parser.add_argument("--seeds", type=int, help="Seeds per algorithm and layout (new baselines only)")
+    parser.add_argument("--max-ticks", type=int, help="Ticks per run (new baselines only)")
+    parser.add_argument("--processes", type=int, help="Worker processes for the sweep")
+    parser.add_argument("--time-threshold", type=float, default=METRIC_KINDS['time'][3], help="Allowed relative slowdown of median wall time")
+    parser.add_argument("--nodes-threshold", type=float, default=METRIC_KINDS['nodes'][3], help="Allowed relative growth in nodes expanded")
+    parser.add_argument("--win-rate-threshold", type=float, default=METRIC_KINDS['win_rate'][3], help="Allowed absolute drop in win rate")
+    args = parser.parse_args(argv)
+    timing_path = args.timing_baseline or timing_baseline_path()
+
+    if args.update_baseline:
+        config = dict(DEFAULT_CONFIG)
+        if args.seeds is not None:
+            config['seeds'] = args.seeds
+        if args.max_ticks is not None:
+            config['max_ticks'] = args.max_ticks
+        portable, timing = split_timing(collect_metrics(config, args.processes))
+        save_baseline(args.baseline, config, portable)
+        save_baseline(timing_path, config, timing)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; create one with --update-baseline")
+        return 2
+
+    baseline = load_baseline(args.baseline)
+    # Re-run with the baseline's own settings so the samples are comparable
+    config = dict(DEFAULT_CONFIG, **baseline.get('config', {}))
+    current = collect_metrics(config, args.processes)
+    baseline_metrics, _ = split_timing(baseline['metrics'])
+
+    if os.path.exists(timing_path):
+        baseline_metrics.update(split_timing(load_baseline(timing_path)['metrics'])[1])
+    else:
+        print(f"No timing baseline for this machine; recording one at {timing_path} (wall times not gated this run)")
+        save_baseline(timing_path, config, split_timing(current)[1])
+
+    thresholds = {'time': args.time_threshold, 'nodes': args.nodes_threshold, 'win_rate': args.win_rate_threshold}
+    regressions = print_report(compare_to_baseline(baseline_metrics, current, thresholds))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
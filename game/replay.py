@@ -0,0 +1,191 @@
+import argparse
+import base64
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import zlib
+from datetime import datetime
+from constants import DIRECTIONS
+from maze_layout import MAZE_LAYOUTS
+from core.event_log import show_events
+from game.simulation import SimulationCore
+
+REPLAY_OUTPUT_DIR = "replays"
+REPLAY_VERSION = 1
+
+# One byte per tick: 0 means "no direction set", then the DIRECTIONS keys in order
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS, start=1)}
+DIRECTION_NAMES = [None] + list(DIRECTIONS)
+
+
+def state_digest(sim):
+    """Short hash of everything that decides a match, to check that a replay ended where the game did."""
+    player1, player2, ghost = sim.player1, sim.player2, sim.inky_ghost
+    state = (
+        sim.tick_count,
+        tuple((p.grid_x, p.grid_y, p.pixel_x, p.pixel_y, p.direction, p.score, p.health, p.power_timer) for p in (player1, player2)),
+        (ghost.grid_x, ghost.grid_y, ghost.pixel_x, ghost.pixel_y, ghost.direction, ghost.ai_mode, ghost.dead),
+        sim.maze.get_remaining_food_count(),
+    )
+    return hashlib.sha1(repr(state).encode("utf-8")).hexdigest()[:16]
+
+
+class InputRecorder:
+    """SimulationCore observer that logs the seed, player 1's input each tick and the few hotkeys
+    that change a running match, which is all a headless replay needs to rerun it exactly.
+
+    Inputs cost one byte per tick. Debug test keys (F1-F5) reposition entities directly and
+    are not recorded, so a game where they were used won't replay faithfully.
+    """
+
+    def __init__(self, output_dir=REPLAY_OUTPUT_DIR):
+        self.output_dir = output_dir
+        self.recording = None
+        self.last_path = None
+
+    def is_recording(self):
+        return self.recording is not None
+
+    def start(self, sim, layout_name="default"):
+        self.recording = {
+            'version': REPLAY_VERSION,
+            'seed': sim.seed,
+            'ai_type': sim.player2.get_current_algorithm(),
+            'layout': layout_name,
+            'hide_player1': sim.hide_player1,
+            'hide_all_ghosts': sim.hide_all_ghosts,
+            'events': [],  # [tick, name, value], applied before that tick runs
+            'inputs': bytearray(),
+            'result': None,
+            'digest': None,
+        }
+
+    def record_event(self, sim, name, value=None):
+        if self.recording is not None:
+            self.recording['events'].append([sim.tick_count, name, value])
+
+    def on_tick_start(self, sim):
+        if self.recording is not None:
+            self.recording['inputs'].append(DIRECTION_CODES.get(sim.player1.next_direction, 0))
+
+    def on_game_over(self, sim):
+        if self.recording is not None:
+            self.stop(sim)
+
+    def stop(self, sim):
+        """Finish the recording, write it out if any ticks ran, and return the file path."""
+        recording = self.recording
+        self.recording = None
+        if recording is None or not recording['inputs']:
+            return None
+        recording['result'] = sim.get_result()
+        recording['digest'] = state_digest(sim)
+        self.last_path = save_replay(recording, self.output_dir)
+        return self.last_path
+
+
+def save_replay(recording, output_dir=REPLAY_OUTPUT_DIR, path=None):
+    if path is None:
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        path = os.path.join(output_dir, f"replay_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{recording['seed']}.json")
+    data = dict(recording)
+    data['ticks'] = len(recording['inputs'])
+    data['inputs'] = base64.b64encode(zlib.compress(bytes(recording['inputs']), 9)).decode("ascii")
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    print(f"Replay of {data['ticks']} ticks written to {path}")
+    return path
+
+
+def load_replay(path):
+    with open(path, 'r') as f:
+        recording = json.load(f)
+    if recording.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {recording.get('version')} in {path}")
+    recording['inputs'] = zlib.decompress(base64.b64decode(recording['inputs']))
+    return recording
+
+
+def replay(recording, verbose=False, trace_path=None):
+    """Rerun a recording headless and return the finished SimulationCore.
+
+    With trace_path, the full per-tick state is also written there as a binary state trace.
+    """
+    maze = MAZE_LAYOUTS[recording['layout']]
+    sim = SimulationCore.create_headless(
+        ai_type=recording['ai_type'], layout=maze['layout'], positions=maze['positions'], hide_player1=recording['hide_player1'], seed=recording['seed']
+    )
+    sim.hide_all_ghosts = recording['hide_all_ghosts']
+    writer = None
+    if trace_path:
+        from game.state_trace import StateTraceWriter
+
+        writer = StateTraceWriter(trace_path, sim, metadata={'layout': recording['layout']})
+        sim.add_observer(writer)
+    events = recording['events']
+    next_event = 0
+
+    def run():
+        nonlocal next_event
+        for code in recording['inputs']:
+            while next_event < len(events) and events[next_event][0] <= sim.tick_count:
+                _apply_event(sim, events[next_event][1], events[next_event][2])
+                next_event += 1
+            sim.tick(DIRECTION_NAMES[code])
+
+    try:
+        with show_events(verbose):
+            run()
+    finally:
+        if writer is not None:
+            writer.close()
+    return sim
+
+
+def _apply_event(sim, name, value):
+    if name == "algorithm":
+        sim.player2.change_algorithm(value)
+    elif name == "hide_player1":
+        sim.hide_player1 = value
+    elif name == "hide_all_ghosts":
+        sim.hide_all_ghosts = value
+    elif name == "power_player2":
+        sim.player2.power_timer = value
+    else:
+        print(f"Unknown replay event {name!r} ignored")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game headless, optionally under cProfile.")
+    parser.add_argument("replay", help="Replay file written by the game")
+    parser.add_argument("--profile", metavar="BASE", help="Profile the replay into BASE.pstats and BASE.collapsed.txt")
+    parser.add_argument("--trace", metavar="PATH", help="Also write the full per-tick state as a binary state trace")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's own prints")
+    args = parser.parse_args()
+
+    recording = load_replay(args.replay)
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    sim = replay(recording, verbose=args.verbose, trace_path=args.trace)
+    if profiler:
+        profiler.disable()
+        from core.profile_capture import write_collapsed_stacks
+
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(args.profile + ".pstats")
+        write_collapsed_stacks(stats, args.profile + ".collapsed.txt")
+        stats.sort_stats("cumulative").print_stats(15)
+
+    digest = state_digest(sim)
+    print(f"Replayed {sim.tick_count} ticks (seed {recording['seed']}): {sim.get_result()}")
+    if recording.get('digest'):
+        status = "matches" if digest == recording['digest'] else f"DIVERGED (recorded {recording['digest']})"
+        print(f"Final state {digest} {status}")
+
+
+if __name__ == "__main__":
+    main()
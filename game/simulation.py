@@ -0,0 +1,248 @@
+import random
+from constants import *
+from maze_layout import POSITIONS
+from core.maze_state import MazeState
+from entities.player import Player
+from entities.ai.ai_player import AIPlayer
+from entities.ghosts.inky_ghost import InkyGhost
+from game.game_state import GameState, GameStateManager
+from game.collision_system import CollisionSystem
+from core.frame_profiler import FrameProfiler
+from core.event_log import log_event, show_events
+
+
+class SimulationCore:
+    """Game rules for one match: maze, both players, the ghost, collisions and win conditions.
+
+    Nothing here needs pygame. PacmanGame drives it from the windowed loop, headless tools build
+    one with create_headless() and call tick() directly. Observers get on_tick_start(sim) once the
+    tick's input is applied, on_tick(sim) after every tick and on_game_over(sim) once when the
+    match ends; all hooks are optional.
+
+    All randomness in the match (AI fallbacks, stuck handling, the ghost's frightened moves) comes
+    from self.rng, seeded per game, so a seed plus player 1's inputs reproduces a game exactly.
+    """
+
+    def __init__(self, maze, player1, player2, ghost, state_manager=None, collision_system=None, positions=None, profiler=None, seed=None):
+        self.maze = maze
+        self.player1 = player1
+        self.player2 = player2
+        self.inky_ghost = ghost
+        self.state_manager = state_manager if state_manager is not None else GameStateManager()
+        self.collision_system = collision_system if collision_system is not None else CollisionSystem()
+        self.positions = positions if positions is not None else POSITIONS
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+
+        self.hide_player1 = False
+        self.hide_all_ghosts = False
+        self.tick_count = 0
+        self.observers = []
+
+        self.rng = random.Random()
+        self.seed = None
+        player2.rng = self.rng
+        player2.ghosts = [ghost]
+        ghost.rng = self.rng
+        if self.player1_is_ai():
+            player1.rng = self.rng
+            player1.ghosts = [ghost]
+        self.reseed(seed)
+
+    @classmethod
+    def create_headless(cls, ai_type="reflex_agent", layout=None, positions=None, hide_player1=True, seed=None, player1_ai_type=None, params=None):
+        """Build a match with no sprites, images or window, already in the PLAYING state.
+
+        With player1_ai_type, player 1 is a second AIPlayer running that behavior instead of
+        waiting for input, so two behaviors can play each other. params (a BehaviorParams) replaces
+        the shared default heuristic weights for the player 2 AI.
+        """
+        positions = positions if positions is not None else POSITIONS
+        maze = MazeState(layout)
+        player1_pos = positions['PLAYER1_START']
+        player2_pos = positions['PLAYER2_START']
+        ghost_pos = positions['INKY_GHOST_START']
+
+        if player1_ai_type is not None:
+            player1 = AIPlayer(player_id="player1", start_x=player1_pos[0], start_y=player1_pos[1], sprite_manager=None, ai_type=player1_ai_type)
+        else:
+            player1 = Player(player_id="player1", start_x=player1_pos[0], start_y=player1_pos[1], key_mapping=PLAYER1_KEYS, sprite_manager=None)
+        player2 = AIPlayer(player_id="ai1", start_x=player2_pos[0], start_y=player2_pos[1], sprite_manager=None, ai_type=ai_type, params=params)
+        ghost = InkyGhost(player_id="inky", start_x=ghost_pos[0], start_y=ghost_pos[1], sprite_manager=None)
+        ghost.positions = positions
+        ghost.set_total_food_count(maze.get_remaining_food_count())
+
+        sim = cls(maze, player1, player2, ghost, positions=positions, seed=seed)
+        sim.hide_player1 = hide_player1
+        sim.state_manager.change_state(GameState.PLAYING)
+        return sim
+
+    def reseed(self, seed=None):
+        """Restart the match RNG from `seed`, or from a fresh random seed that is kept in self.seed."""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        # Reseed in place: the AI and the ghost hold references to this same object
+        self.rng.seed(seed)
+
+    def player1_is_ai(self):
+        return isinstance(self.player1, AIPlayer)
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def is_playing(self):
+        return self.state_manager.is_state(GameState.PLAYING)
+
+    def is_game_over(self):
+        return self.state_manager.is_state(GameState.GAME_OVER)
+
+    def tick(self, player1_direction=None):
+        """Advance the match by one simulation tick. Returns True while the match is still running."""
+        # Renderers interpolate from here. A frozen match still stores it, so its next frame draws at rest
+        for entity in (self.player1, self.player2, self.inky_ghost):
+            entity.store_previous_position()
+
+        if not self.is_playing():
+            return False
+
+        if player1_direction is not None:
+            self.player1.next_direction = player1_direction
+
+        for observer in self.observers:
+            on_tick_start = getattr(observer, "on_tick_start", None)
+            if on_tick_start:
+                on_tick_start(self)
+
+        profiler = self.profiler
+
+        # Update players
+        players = [self.player1, self.player2]
+        for player in players:
+            if not player.is_dead():
+                if player == self.player1 and not self.hide_player1:
+                    started = profiler.begin()
+                    if self.player1_is_ai():
+                        opponent_pos = self.player2.get_position() if not self.player2.is_dead() else None
+                        ghost_pos = [self.inky_ghost.get_position()] if not self.inky_ghost.is_dead() else []
+                        player.update(self.maze, opponent_pos, ghost_pos)
+                    else:
+                        player.update(self.maze)
+                    profiler.end("player1", started)
+                elif player == self.player2:
+                    human_pos = self.player1.get_position() if not self.player1.is_dead() else None
+                    ghost_pos = [self.inky_ghost.get_position()] if not self.inky_ghost.is_dead() else []
+                    started = profiler.begin()
+                    player.update(self.maze, human_pos, ghost_pos)
+                    profiler.end("ai_player", started)
+
+        # Update Inky Ghost
+        alive_positions = [p.get_position() if not p.is_dead() else None for p in players]
+        player_power_status = [p.is_powered_up() if not p.is_dead() else False for p in players]
+        if not self.hide_all_ghosts:
+            started = profiler.begin()
+            self.inky_ghost.update(self.maze, alive_positions, player_power_status)
+            profiler.end("ghost", started)
+
+        # Handle collisions
+        started = profiler.begin()
+        collision_results = self.collision_system.check_ghost_collisions(players, self.inky_ghost)
+        self.collision_system.handle_collision_results(collision_results)
+        profiler.end("collisions", started)
+
+        self.tick_count += 1
+
+        # Check win conditions
+        self._check_win_conditions()
+
+        for observer in self.observers:
+            on_tick = getattr(observer, "on_tick", None)
+            if on_tick:
+                on_tick(self)
+
+        if self.is_game_over():
+            for observer in self.observers:
+                on_game_over = getattr(observer, "on_game_over", None)
+                if on_game_over:
+                    on_game_over(self)
+            return False
+        return True
+
+    def _check_win_conditions(self):
+        if self.maze.all_pellets_collected():
+            self.state_manager.change_state(GameState.GAME_OVER)
+            return
+
+        if self.player1.is_dead() and self.player2.is_dead():
+            log_event("Both players died! Game Over!")
+            self.state_manager.change_state(GameState.GAME_OVER)
+            return
+
+    def get_winner(self):
+        """Return "player1", "player2", "draw", "both_dead", or None while the match is undecided."""
+        if self.player1.is_dead() and self.player2.is_dead():
+            return "both_dead"
+        elif self.player1.is_dead():
+            return "player2"
+        elif self.player2.is_dead():
+            return "player1"
+        elif self.maze.all_pellets_collected():
+            if self.player1.score > self.player2.score:
+                return "player1"
+            elif self.player1.score < self.player2.score:
+                return "player2"
+            return "draw"
+        return None
+
+    def get_result(self):
+        return {
+            'winner': self.get_winner(),
+            'ticks': self.tick_count,
+            'player1_score': self.player1.score,
+            'player2_score': self.player2.score,
+            'player1_health': self.player1.health,
+            'player2_health': self.player2.health,
+            'pellets_left': self.maze.get_remaining_food_count(),
+            'ai_type': self.player2.get_current_algorithm(),
+        }
+
+    def run(self, max_ticks=20000, verbose=False):
+        """Tick until the match ends or max_ticks pass, then return get_result()."""
+        # Entities log most events; hide them unless asked so batch runs stay fast
+        with show_events(verbose):
+            while self.tick_count < max_ticks and self.tick():
+                pass
+        return self.get_result()
+
+    def reset(self, seed=None):
+        """Put pellets, players and the ghost back to the start of a fresh match, with a new RNG seed."""
+        self.maze.reset_collectibles()
+        self.reseed(seed)
+
+        player1_pos = self.positions['PLAYER1_START']
+        player2_pos = self.positions['PLAYER2_START']
+        ghost_pos = self.positions['INKY_GHOST_START']
+
+        for player, pos in ((self.player1, player1_pos), (self.player2, player2_pos)):
+            player.reset_position(pos[0], pos[1])
+            player.score = 0
+            player.health = 3
+            player.is_invincible = False
+            player.invincibility_timer = 0
+            player.invincibility_blink_timer = 0
+            player.power_timer = 0.0
+        self.player2.reset_ai()
+        if self.player1_is_ai():
+            self.player1.reset_ai()
+
+        # Reset Ghost
+        self.inky_ghost.reset_position(ghost_pos[0], ghost_pos[1])
+        self.inky_ghost.reset_ai()
+        self.inky_ghost.can_chase = True
+        self.inky_ghost.set_total_food_count(self.maze.get_remaining_food_count())
+
+        self.tick_count = 0
+        self.state_manager.change_state(GameState.PLAYING)
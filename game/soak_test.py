@@ -0,0 +1,70 @@
+import argparse
+import itertools
+import random
+import time
+from entities.ai.algorithm_switcher import AlgorithmSwitcher
+from game.simulation import SimulationCore
+from game.metrics_exporter import MetricsServer, SimulationMetrics
+from core.memory_tracker import MemoryTracker
+
+
+def run_soak(ai_types, duration_seconds, max_ticks=20000, port=9100, seed=None, memory_interval=None):
+    """Play headless games back to back until duration_seconds pass, exporting live metrics."""
+    # Game seeds come from one generator, so a soak run with --seed plays the same sequence of games
+    seeds = random.Random(seed)
+    metrics = SimulationMetrics()
+    metrics.install_gc_callback()
+    server = None
+    if port is not None:
+        server = MetricsServer(metrics, port=port)
+        server.start()
+    memory_tracker = None
+    if memory_interval:
+        memory_tracker = MemoryTracker(interval_minutes=memory_interval)
+        memory_tracker.start()
+
+    deadline = time.perf_counter() + duration_seconds
+    games = 0
+    try:
+        for ai_type in itertools.cycle(ai_types):
+            if time.perf_counter() >= deadline:
+                break
+            if memory_tracker is not None:
+                memory_tracker.maybe_snapshot()
+            sim = SimulationCore.create_headless(ai_type=ai_type, seed=seeds.randrange(2 ** 32))
+            sim.add_observer(metrics)
+            result = sim.run(max_ticks=max_ticks)
+            if not sim.is_game_over():
+                # Ran out of ticks; on_game_over only fires for games that actually end
+                metrics.on_game_over(sim)
+            games += 1
+            print(f"Game {games}: {ai_type} -> {result['winner'] or 'unfinished'} in {result['ticks']} ticks ({metrics.ticks_per_second:.0f} ticks/s)")
+    except KeyboardInterrupt:
+        print("Soak test interrupted")
+    finally:
+        metrics.remove_gc_callback()
+        if memory_tracker is not None:
+            memory_tracker.stop()
+        if server is not None:
+            server.stop()
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless games for a long time with a Prometheus metrics endpoint.")
+    parser.add_argument("--ai-types", nargs="+", help="Algorithms to cycle through (default: all)")
+    parser.add_argument("--minutes", type=float, default=60.0, help="How long to run")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="Ticks before a game is abandoned")
+    parser.add_argument("--port", type=int, default=9100, help="Metrics port on localhost (0 picks a free one)")
+    parser.add_argument("--no-metrics", action="store_true", help="Don't start the HTTP endpoint")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--memory-minutes", type=float, help="Take tracemalloc snapshots this often and report growth")
+    args = parser.parse_args()
+
+    ai_types = args.ai_types or AlgorithmSwitcher().available_algorithms
+    port = None if args.no_metrics else args.port
+    run_soak(ai_types, args.minutes * 60, args.max_ticks, port, args.seed, args.memory_minutes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import json
+import mmap
+import struct
+import numpy as np
+from constants import DIRECTIONS
+
+TRACE_MAGIC = b"PMTR"
+TRACE_VERSION = 1
+TRACE_END_MAGIC = b"RTMP"
+
+# Header: magic, version, keyframe interval, pellet cell count, metadata JSON length
+_HEADER = struct.Struct("<4sHIII")
+# Footer at the very end of the file: keyframe index offset, tick records written, end magic
+_FOOTER = struct.Struct("<QI4s")
+_MASK = struct.Struct("<I")
+_COUNT = struct.Struct("<H")
+
+DIRECTION_NAMES = [None] + list(DIRECTIONS)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTION_NAMES)}
+GHOST_MODES = [None, "CHASE", "SCATTER", "FRIGHTENED", "ENRAGED", "EATEN"]
+GHOST_MODE_CODES = {mode: code for code, mode in enumerate(GHOST_MODES)}
+
+
+def _player_fields(prefix, attr):
+    return [
+        (f"{prefix}_x", "h", lambda sim: getattr(sim, attr).grid_x),
+        (f"{prefix}_y", "h", lambda sim: getattr(sim, attr).grid_y),
+        (f"{prefix}_px", "f", lambda sim: getattr(sim, attr).pixel_x),
+        (f"{prefix}_py", "f", lambda sim: getattr(sim, attr).pixel_y),
+        (f"{prefix}_dir", "B", lambda sim: DIRECTION_CODES.get(getattr(sim, attr).direction, 0)),
+        (f"{prefix}_score", "i", lambda sim: getattr(sim, attr).score),
+        (f"{prefix}_health", "b", lambda sim: getattr(sim, attr).health),
+        (f"{prefix}_power", "f", lambda sim: getattr(sim, attr).power_timer),
+        (f"{prefix}_invincible", "f", lambda sim: getattr(sim, attr).invincibility_timer),
+    ]
+
+
+# Every per-tick value in the trace, in record order. At most 32 so a uint32 can flag the changed ones.
+STATE_FIELDS = _player_fields("p1", "player1") + _player_fields("p2", "player2") + [
+    ("ghost_x", "h", lambda sim: sim.inky_ghost.grid_x),
+    ("ghost_y", "h", lambda sim: sim.inky_ghost.grid_y),
+    ("ghost_px", "f", lambda sim: sim.inky_ghost.pixel_x),
+    ("ghost_py", "f", lambda sim: sim.inky_ghost.pixel_y),
+    ("ghost_dir", "B", lambda sim: DIRECTION_CODES.get(sim.inky_ghost.direction, 0)),
+    ("ghost_mode", "B", lambda sim: GHOST_MODE_CODES.get(sim.inky_ghost.ai_mode, 0)),
+    ("ghost_dead", "?", lambda sim: sim.inky_ghost.dead),
+    ("ghost_mode_timer", "i", lambda sim: sim.inky_ghost.mode_timer),
+    ("ghost_enraged", "?", lambda sim: sim.inky_ghost.is_enraged),
+]
+FIELD_NAMES = [name for name, _, _ in STATE_FIELDS]
+_FIELD_STRUCTS = [struct.Struct("<" + fmt) for _, fmt, _ in STATE_FIELDS]
+_FULL_RECORD = struct.Struct("<" + "".join(fmt for _, fmt, _ in STATE_FIELDS))
+_ALL_FIELDS_MASK = (1 << len(STATE_FIELDS)) - 1
+STATE_DTYPE = np.dtype([(name, "<" + fmt) for name, fmt, _ in STATE_FIELDS])
+
+
+def pellet_cells(maze):
+    """Every cell that starts with a pellet or power pellet, in bit order."""
+    return sorted(maze.initial_pellets_set | maze.initial_power_pellets_set)
+
+
+class StateTraceWriter:
+    """SimulationCore observer that writes the full match state of every tick to a compact file.
+
+    Every keyframe_interval ticks the record holds every field plus the whole pellet bitset. The
+    ticks in between store a uint32 mask of the fields that changed, only those values, and the
+    indices of pellet bits that flipped. A keyframe offset index in the footer gives random access.
+
+        record N = state after tick N; record 0 is the state before the first tick
+        keyframe = mask(all) | all field values | pellet bitset
+        delta    = mask | changed field values | uint16 flip count | uint16 flip indices
+    """
+
+    def __init__(self, path, sim, keyframe_interval=60, metadata=None):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.cells = pellet_cells(sim.maze)
+        self.cell_index = {cell: index for index, cell in enumerate(self.cells)}
+        self.keyframe_offsets = []
+        self.records = 0
+        self.previous = None
+        self.present = set()  # Indices of pellet bits currently set
+        self.present_count = -1
+
+        metadata = dict(metadata or {})
+        metadata.update({'seed': sim.seed, 'ai_type': sim.player2.get_current_algorithm(), 'fields': FIELD_NAMES})
+        metadata_bytes = json.dumps(metadata).encode("utf-8")
+
+        self.file = open(path, 'wb')
+        self.file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, keyframe_interval, len(self.cells), len(metadata_bytes)))
+        self.file.write(np.asarray(self.cells, dtype="<i2").tobytes())
+        self.file.write(metadata_bytes)
+        self.write_state(sim)
+
+    def on_tick(self, sim):
+        self.write_state(sim)
+
+    def _pellet_flips(self, maze):
+        # Eating and restarting change the count, so an unchanged count means no bits flipped
+        count = len(maze.pellets) + len(maze.power_pellets)
+        if count == self.present_count:
+            return ()
+        self.present_count = count
+        cell_index = self.cell_index
+        present = {cell_index[cell] for cell in maze.pellets if cell in cell_index}
+        present.update(cell_index[cell] for cell in maze.power_pellets if cell in cell_index)
+        flips = present ^ self.present
+        self.present = present
+        return sorted(flips)
+
+    def write_state(self, sim):
+        values = tuple(getter(sim) for _, _, getter in STATE_FIELDS)
+        flips = self._pellet_flips(sim.maze)
+        write = self.file.write
+
+        if self.records % self.keyframe_interval == 0:
+            self.keyframe_offsets.append(self.file.tell())
+            write(_MASK.pack(_ALL_FIELDS_MASK))
+            write(_FULL_RECORD.pack(*values))
+            bits = np.zeros(len(self.cells), dtype=bool)
+            bits[list(self.present)] = True
+            write(np.packbits(bits, bitorder="little").tobytes())
+        else:
+            mask = 0
+            changed = []
+            for index, (value, old) in enumerate(zip(values, self.previous)):
+                if value != old:
+                    mask |= 1 << index
+                    changed.append(_FIELD_STRUCTS[index].pack(value))
+            write(_MASK.pack(mask))
+            if changed:
+                write(b"".join(changed))
+            write(_COUNT.pack(len(flips)))
+            if flips:
+                write(struct.pack(f"<{len(flips)}H", *flips))
+
+        self.previous = values
+        self.records += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.asarray(self.keyframe_offsets, dtype="<u8").tobytes())
+        self.file.write(_FOOTER.pack(index_offset, self.records, TRACE_END_MAGIC))
+        self.file.close()
+        self.file = None
+        print(f"State trace of {self.records} ticks written to {self.path}")
+
+
+class StateTraceReader:
+    """Memory-mapped reader: state_at(tick) decodes forward from the nearest keyframe."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.keyframe_interval, cell_count, metadata_length = _HEADER.unpack_from(self.data, 0)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} state trace")
+        offset = _HEADER.size
+        self.cells = [tuple(cell) for cell in np.frombuffer(self.data, dtype="<i2", count=cell_count * 2, offset=offset).reshape(-1, 2).tolist()]
+        offset += cell_count * 4
+        self.metadata = json.loads(bytes(self.data[offset:offset + metadata_length]))
+        if self.metadata.get('fields') != FIELD_NAMES:
+            raise ValueError(f"{path} was written with a different field layout")
+
+        index_offset, self.ticks, end_magic = _FOOTER.unpack_from(self.data, len(self.data) - _FOOTER.size)
+        if end_magic != TRACE_END_MAGIC:
+            raise ValueError(f"{path} has no footer; the writer was not closed")
+        keyframes = (self.ticks + self.keyframe_interval - 1) // self.keyframe_interval
+        # Copied out so close() can release the mmap (numpy views would keep it pinned)
+        self.keyframe_offsets = np.frombuffer(self.data, dtype="<u8", count=keyframes, offset=index_offset).copy()
+        self.bitset_size = (cell_count + 7) // 8
+
+    def __len__(self):
+        return self.ticks
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _read_keyframe(self, offset):
+        offset += _MASK.size
+        values = list(_FULL_RECORD.unpack_from(self.data, offset))
+        offset += _FULL_RECORD.size
+        bits = np.unpackbits(np.frombuffer(self.data, dtype=np.uint8, count=self.bitset_size, offset=offset), bitorder="little")
+        present = bits[:len(self.cells)].astype(bool)
+        return values, present, offset + self.bitset_size
+
+    def _apply_delta(self, offset, values, present):
+        data = self.data
+        (mask,) = _MASK.unpack_from(data, offset)
+        offset += _MASK.size
+        index = 0
+        while mask:
+            if mask & 1:
+                field = _FIELD_STRUCTS[index]
+                values[index] = field.unpack_from(data, offset)[0]
+                offset += field.size
+            mask >>= 1
+            index += 1
+        (flip_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        if flip_count:
+            flips = np.frombuffer(data, dtype="<u2", count=flip_count, offset=offset)
+            present[flips] = ~present[flips]
+            offset += flip_count * 2
+        return offset
+
+    def iter_states(self, start=0, stop=None):
+        """Yield (tick, field values, pellet present flags) for ticks in [start, stop)."""
+        stop = self.ticks if stop is None else min(stop, self.ticks)
+        if start >= stop:
+            return
+        keyframe = start // self.keyframe_interval
+        tick = keyframe * self.keyframe_interval
+        values, present, offset = self._read_keyframe(int(self.keyframe_offsets[keyframe]))
+        while True:
+            if tick >= start:
+                yield tick, values, present
+            tick += 1
+            if tick >= stop:
+                return
+            if tick % self.keyframe_interval == 0:
+                values, present, offset = self._read_keyframe(offset)
+            else:
+                offset = self._apply_delta(offset, values, present)
+
+    def state_at(self, tick):
+        """The match state after `tick` as a dict, with 'pellets' the cells still holding food."""
+        if not 0 <= tick < self.ticks:
+            raise IndexError(f"tick {tick} outside 0..{self.ticks - 1}")
+        for _, values, present in self.iter_states(tick, tick + 1):
+            state = dict(zip(FIELD_NAMES, values))
+            state['pellets'] = [cell for cell, here in zip(self.cells, present) if here]
+            return state
+
+    def to_arrays(self):
+        """Decode every tick into a STATE_DTYPE array plus a per-tick pellets-remaining count."""
+        states = np.empty(self.ticks, dtype=STATE_DTYPE)
+        pellets_left = np.empty(self.ticks, dtype=np.int32)
+        for tick, values, present in self.iter_states():
+            states[tick] = tuple(values)
+            pellets_left[tick] = int(present.sum())
+        return states, pellets_left
+
+
+def record_trace(path, ai_type="reflex_agent", seed=None, max_ticks=20000, keyframe_interval=60):
+    """Play one headless game and write its state trace."""
+    from game.simulation import SimulationCore
+
+    sim = SimulationCore.create_headless(ai_type=ai_type, seed=seed)
+    writer = StateTraceWriter(path, sim, keyframe_interval=keyframe_interval)
+    sim.add_observer(writer)
+    try:
+        sim.run(max_ticks=max_ticks)
+    finally:
+        writer.close()
+    return sim
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or inspect binary state traces.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Play a headless game and trace it")
+    record.add_argument("output")
+    record.add_argument("--ai-type", default="reflex_agent")
+    record.add_argument("--seed", type=int)
+    record.add_argument("--max-ticks", type=int, default=20000)
+    record.add_argument("--keyframe-interval", type=int, default=60)
+
+    show = subparsers.add_parser("show", help="Print a summary, or the state at one tick")
+    show.add_argument("trace")
+    show.add_argument("--tick", type=int)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_trace(args.output, args.ai_type, args.seed, args.max_ticks, args.keyframe_interval)
+        return
+
+    with StateTraceReader(args.trace) as reader:
+        if args.tick is not None:
+            for name, value in reader.state_at(args.tick).items():
+                print(f"{name:>18}: {value}")
+            return
+        states, pellets_left = reader.to_arrays()
+        size = len(reader.data)
+        print(f"{args.trace}: {reader.ticks} ticks, {size / 1024:.1f} KiB ({size / max(1, reader.ticks):.1f} bytes/tick), "
+              f"keyframe every {reader.keyframe_interval} ticks")
+        print(f"Metadata: {json.dumps({k: v for k, v in reader.metadata.items() if k != 'fields'})}")
+        print(f"Final score {states['p1_score'][-1]} - {states['p2_score'][-1]}, {pellets_left[-1]} pellets left")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from maze_layout import MAZE_LAYOUTS
+from entities.ai.algorithm_switcher import BenchmarkResultSink, BENCHMARK_OUTPUT_DIR
+from entities.ai.behaviors.behavior_manager import BehaviorManager
+from entities.ai.behaviors.q_learning import has_trained_tables
+from entities.ai import benchmark_stats
+from game.metrics_exporter import _Histogram, DECISION_LATENCY_BUCKETS
+from game.simulation import SimulationCore
+
+DEFAULT_SEED_COUNT = 3
+DEFAULT_MAX_TICKS = 20000
+ELO_START = 1500
+ELO_K = 16
+
+
+def behavior_names():
+    """Every behavior BehaviorManager knows, in its registration order (q_learning only once it has a table)."""
+    return [name for name in BehaviorManager(None).behaviors if name != "q_learning" or has_trained_tables()]
+
+
+class _LatencyRecorder:
+    """SimulationCore observer that histograms each side's decision latency, in seconds."""
+
+    def __init__(self, sim):
+        self.players = (sim.player1, sim.player2)
+        self.histograms = [_Histogram(DECISION_LATENCY_BUCKETS) for _ in self.players]
+        self.max_seconds = [0.0, 0.0]
+        self.seen = [0, 0]
+
+    def on_tick(self, sim):
+        for side, player in enumerate(self.players):
+            # Counted by change rather than growth so a restart's reset_ai() can't hide decisions
+            if player.decisions_made != self.seen[side]:
+                self.seen[side] = player.decisions_made
+                seconds = player.last_decision_time_ns / 1e9
+                self.histograms[side].observe(seconds)
+                self.max_seconds[side] = max(self.max_seconds[side], seconds)
+
+
+def match_score(record):
+    """Player 1's result for Elo: 1 for a win, 0.5 for a draw, 0 for a loss.
+
+    Games where both die or that hit the tick limit go to the higher score.
+    """
+    winner = record['winner']
+    if winner not in ("player1", "player2", "draw"):
+        if record['player1_score'] == record['player2_score']:
+            winner = "draw"
+        else:
+            winner = "player1" if record['player1_score'] > record['player2_score'] else "player2"
+    return {"player1": 1.0, "draw": 0.5, "player2": 0.0}[winner]
+
+
+def run_match(job):
+    """Play one headless match between two behaviors and return its record.
+
+    job is (index, player1_behavior, player2_behavior, layout_name, seed, max_ticks). Top level
+    so multiprocessing can pickle it.
+    """
+    index, player1_behavior, player2_behavior, layout_name, seed, max_ticks = job
+    maze = MAZE_LAYOUTS[layout_name]
+    sim = SimulationCore.create_headless(
+        ai_type=player2_behavior, layout=maze['layout'], positions=maze['positions'], hide_player1=False, seed=seed, player1_ai_type=player1_behavior
+    )
+    latency = _LatencyRecorder(sim)
+    sim.add_observer(latency)
+
+    record = {'index': index, 'player1': player1_behavior, 'player2': player2_behavior, 'maze': layout_name, 'seed': seed}
+    started = time.perf_counter()
+    try:
+        result = sim.run(max_ticks=max_ticks)
+    except Exception as e:
+        # One broken behavior should not take the rest of the tournament down with it
+        result = sim.get_result()
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['wall_time_seconds'] = time.perf_counter() - started
+    for key in ('winner', 'ticks', 'player1_score', 'player2_score', 'player1_health', 'player2_health', 'pellets_left'):
+        record[key] = result[key]
+    record['latency'] = [
+        {'counts': histogram.counts, 'total': histogram.total, 'count': histogram.count, 'max': worst}
+        for histogram, worst in zip(latency.histograms, latency.max_seconds)
+    ]
+    return record
+
+
+def _bucket_quantile(counts, quantile):
+    """Upper bound, in ms, of the histogram bucket holding the given quantile (inf past the last bucket)."""
+    total = sum(counts)
+    if total == 0:
+        return float('nan')
+    running = 0
+    for bound, count in zip(DECISION_LATENCY_BUCKETS + (float('inf'),), counts):
+        running += count
+        if running >= quantile * total:
+            return bound * 1000
+    return float('inf')
+
+
+class Tournament:
+    """Round robin of behaviors: every ordered pair, so each behavior plays both seats, across
+    seeds and maze layouts on a process pool. Produces Elo ratings, win rates, a head-to-head
+    table and per-behavior decision latency profiles."""
+
+    def __init__(self, behaviors=None, seeds=DEFAULT_SEED_COUNT, layouts=None, max_ticks=DEFAULT_MAX_TICKS, processes=None, output_path=None, flush_every=20):
+        self.behaviors = list(behaviors) if behaviors else behavior_names()
+        self.seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+        self.layouts = list(layouts) if layouts else list(MAZE_LAYOUTS.keys())
+        self.max_ticks = max_ticks
+        self.processes = processes or os.cpu_count() or 1
+        if output_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(BENCHMARK_OUTPUT_DIR, f"tournament_{timestamp}.jsonl")
+        self.output_path = output_path
+        self.flush_every = flush_every
+        self.records = []
+
+        known = set(behavior_names())
+        for behavior in self.behaviors:
+            if behavior not in known:
+                raise ValueError(f"Unknown behavior: {behavior} (available: {sorted(known)})")
+        for layout_name in self.layouts:
+            if layout_name not in MAZE_LAYOUTS:
+                raise ValueError(f"Unknown maze layout: {layout_name} (available: {list(MAZE_LAYOUTS.keys())})")
+
+    def build_jobs(self):
+        pairs = itertools.permutations(self.behaviors, 2)
+        matches = [(first, second, layout_name, seed) for first, second in pairs for layout_name in self.layouts for seed in self.seeds]
+        return [(index,) + match + (self.max_ticks,) for index, match in enumerate(matches)]
+
+    def run(self):
+        jobs = self.build_jobs()
+        processes = max(1, min(self.processes, len(jobs)))
+        print(f"Tournament: {len(jobs)} matches ({len(self.behaviors)} behaviors, {len(self.seeds)} seeds, {len(self.layouts)} layouts) on {processes} processes")
+
+        started = time.perf_counter()
+        with BenchmarkResultSink(self.output_path, flush_every=self.flush_every) as sink:
+            if processes == 1:
+                for record in map(run_match, jobs):
+                    self._record(record, sink, len(jobs))
+            else:
+                # Spawned workers start clean instead of inheriting the parent's pygame/SDL state
+                context = multiprocessing.get_context("spawn")
+                with context.Pool(processes) as pool:
+                    for record in pool.imap_unordered(run_match, jobs):
+                        self._record(record, sink, len(jobs))
+        # Elo depends on match order; sort so the ratings don't depend on which worker finished first
+        self.records.sort(key=lambda record: record['index'])
+        print(f"Tournament finished: {len(self.records)} matches in {time.perf_counter() - started:.1f}s, results in {self.output_path}")
+        return self.records
+
+    def _record(self, record, sink, total):
+        self.records.append(record)
+        sink.append(record)
+        outcome = record.get('error') or record['winner']
+        print(
+            f"[{len(self.records)}/{total}] {record['player1']} vs {record['player2']} on {record['maze']} seed {record['seed']}: "
+            f"{outcome} ({record['player1_score']}-{record['player2_score']}) in {record['ticks']} ticks"
+        )
+
+    def elo_ratings(self):
+        ratings = dict.fromkeys(self.behaviors, float(ELO_START))
+        for record in self.records:
+            first, second = record['player1'], record['player2']
+            expected = 1 / (1 + 10 ** ((ratings[second] - ratings[first]) / 400))
+            change = ELO_K * (match_score(record) - expected)
+            ratings[first] += change
+            ratings[second] -= change
+        return ratings
+
+    def standings(self):
+        """One row per behavior, best Elo first."""
+        ratings = self.elo_ratings()
+        totals = {behavior: defaultdict(float) for behavior in self.behaviors}
+        for record in self.records:
+            score = match_score(record)
+            for side, behavior, points in ((0, record['player1'], score), (1, record['player2'], 1 - score)):
+                row = totals[behavior]
+                row['games'] += 1
+                row['wins'] += points == 1
+                row['draws'] += points == 0.5
+                row['losses'] += points == 0
+                row['deaths'] += record[f"player{side + 1}_health"] <= 0
+                row['score'] += record[f"player{side + 1}_score"]
+        rows = []
+        for behavior in sorted(self.behaviors, key=lambda name: -ratings[name]):
+            row = totals[behavior]
+            games = max(row['games'], 1)
+            rows.append({
+                'behavior': behavior,
+                'elo': round(ratings[behavior], 1),
+                'games': int(row['games']),
+                'wins': int(row['wins']),
+                'draws': int(row['draws']),
+                'losses': int(row['losses']),
+                'win_rate': row['wins'] / games,
+                'death_rate': row['deaths'] / games,
+                'mean_score': row['score'] / games,
+            })
+        return rows
+
+    def head_to_head(self):
+        """Rows of win rate (draws count half) for the row behavior against each column behavior, both seats."""
+        points = defaultdict(float)
+        games = defaultdict(int)
+        for record in self.records:
+            score = match_score(record)
+            first, second = record['player1'], record['player2']
+            points[(first, second)] += score
+            points[(second, first)] += 1 - score
+            games[(first, second)] += 1
+            games[(second, first)] += 1
+        rows = []
+        for behavior in self.behaviors:
+            row = {'behavior': behavior}
+            for opponent in self.behaviors:
+                played = games[(behavior, opponent)]
+                row[opponent] = points[(behavior, opponent)] / played if played else float('nan')
+            rows.append(row)
+        return rows
+
+    def latency_profiles(self):
+        """Decision latency per behavior over all its games. Quantiles are histogram bucket bounds."""
+        merged = {behavior: {'counts': [0] * (len(DECISION_LATENCY_BUCKETS) + 1), 'total': 0.0, 'count': 0, 'max': 0.0} for behavior in self.behaviors}
+        for record in self.records:
+            for behavior, latency in zip((record['player1'], record['player2']), record['latency']):
+                profile = merged[behavior]
+                profile['counts'] = [a + b for a, b in zip(profile['counts'], latency['counts'])]
+                profile['total'] += latency['total']
+                profile['count'] += latency['count']
+                profile['max'] = max(profile['max'], latency['max'])
+        rows = []
+        for behavior, profile in merged.items():
+            count = profile['count']
+            rows.append({
+                'behavior': behavior,
+                'decisions': count,
+                'mean_ms': profile['total'] / count * 1000 if count else float('nan'),
+                'p50_le_ms': _bucket_quantile(profile['counts'], 0.50),
+                'p95_le_ms': _bucket_quantile(profile['counts'], 0.95),
+                'p99_le_ms': _bucket_quantile(profile['counts'], 0.99),
+                'max_ms': profile['max'] * 1000,
+            })
+        return rows
+
+    def export_tables(self, basename=None):
+        """Write standings, head-to-head and latency tables as CSV and Markdown next to the results file."""
+        basename = basename or os.path.splitext(self.output_path)[0]
+        written = []
+        for suffix, title, rows in (
+            ("standings", "Tournament standings", self.standings()),
+            ("head_to_head", "Head-to-head win rate (row vs column)", self.head_to_head()),
+            ("latency", "Decision latency", self.latency_profiles()),
+        ):
+            csv_path = f"{basename}_{suffix}.csv"
+            md_path = f"{basename}_{suffix}.md"
+            benchmark_stats.write_csv(rows, csv_path)
+            benchmark_stats.write_markdown(rows, md_path, title=title)
+            written.extend([csv_path, md_path])
+        print(f"Tournament tables written to {', '.join(written)}")
+        return written
+
+    def print_tables(self):
+        print("\nStandings\n" + benchmark_stats.to_markdown(self.standings()))
+        print("Head-to-head win rate (row vs column)\n" + benchmark_stats.to_markdown(self.head_to_head()))
+        print("Decision latency\n" + benchmark_stats.to_markdown(self.latency_profiles()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI behaviors with Elo ratings.")
+    parser.add_argument("--behaviors", nargs="+", help="Behaviors to enter (default: all in BehaviorManager)")
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEED_COUNT, help="Seeds per pairing and layout")
+    parser.add_argument("--layouts", nargs="+", choices=list(MAZE_LAYOUTS.keys()), help="Maze layouts (default: all)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="Ticks before a match is decided on score")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="JSON lines file to append match records to")
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        behaviors=args.behaviors, seeds=args.seeds, layouts=args.layouts, max_ticks=args.max_ticks, processes=args.processes, output_path=args.output
+    )
+    tournament.run()
+    tournament.print_tables()
+    tournament.export_tables()
+
+
+if __name__ == "__main__":
+    main()
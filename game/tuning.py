@@ -0,0 +1,298 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from maze_layout import MAZE_LAYOUTS
+from entities.ai.behavior_params import BehaviorParams, PARAMETERS
+from game.simulation import SimulationCore
+
+TUNING_OUTPUT_DIR = "tuning"
+DEFAULT_MAX_TICKS = 8000
+WIN_BONUS = 500  # Clearing the board beats any score reached by dying late
+HEALTH_PENALTY = 100  # Per health point lost
+
+
+def game_fitness(result, max_ticks):
+    """Higher is better: the AI's score, minus lost health, plus a bonus for winning (more for winning fast)."""
+    fitness = result['player2_score'] - HEALTH_PENALTY * (3 - result['player2_health'])
+    if result['winner'] == "player2":
+        fitness += WIN_BONUS * (2 - result['ticks'] / max_ticks)
+    return fitness
+
+
+def evaluate_game(job):
+    """Play one headless game with a candidate's weights. Top level so multiprocessing can pickle it.
+
+    job is (candidate, params_dict, ai_type, layout_name, seed, max_ticks); returns (candidate, fitness).
+    """
+    candidate, values, ai_type, layout_name, seed, max_ticks = job
+    maze = MAZE_LAYOUTS[layout_name]
+    sim = SimulationCore.create_headless(ai_type=ai_type, layout=maze['layout'], positions=maze['positions'], seed=seed, params=BehaviorParams(**values))
+    try:
+        result = sim.run(max_ticks=max_ticks)
+    except Exception as e:
+        print(f"Candidate {candidate} crashed on {layout_name} seed {seed}: {type(e).__name__}: {e}")
+        return candidate, -float(HEALTH_PENALTY * 3)
+    return candidate, game_fitness(result, max_ticks)
+
+
+def encode(params, names):
+    """BehaviorParams -> point in the unit cube, one axis per tuned parameter."""
+    return np.array([(getattr(params, name) - PARAMETERS[name][1]) / (PARAMETERS[name][2] - PARAMETERS[name][1]) for name in names])
+
+
+def decode(point, names):
+    """Point in (or outside) the unit cube -> weights dict, clipped to each parameter's bounds."""
+    values = {}
+    for name, unit in zip(names, np.clip(point, 0.0, 1.0)):
+        _, low, high, integer = PARAMETERS[name]
+        value = low + unit * (high - low)
+        values[name] = int(round(value)) if integer else round(float(value), 4)
+    return values
+
+
+class CMAES:
+    """Plain (mu/mu_w, lambda) CMA-ES that maximises fitness, after Hansen's tutorial.
+
+    ask() returns population points, tell() takes their fitnesses in the same order. The whole
+    search state round-trips through state()/from_state() as JSON-friendly lists.
+    """
+
+    def __init__(self, mean, sigma=0.2, population=None, seed=0):
+        n = len(mean)
+        self.n = n
+        self.mean = np.array(mean, dtype=float)
+        self.sigma = sigma
+        self.population = population or 4 + int(3 * math.log(n))
+        self.mu = self.population // 2
+        weights = math.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1 / np.sum(self.weights ** 2)
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.cov = np.eye(n)
+        self.path_sigma = np.zeros(n)
+        self.path_c = np.zeros(n)
+        self.generation = 0
+        self.rng = np.random.default_rng(seed)
+        self._steps = None
+
+    def ask(self):
+        eigenvalues, basis = np.linalg.eigh(self.cov)
+        scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        noise = self.rng.standard_normal((self.population, self.n))
+        self._steps = (noise * scales) @ basis.T
+        return self.mean + self.sigma * self._steps
+
+    def tell(self, fitnesses):
+        order = np.argsort(fitnesses)[::-1][:self.mu]
+        steps = self._steps[order]
+        step = self.weights @ steps
+        self.mean = self.mean + self.sigma * step
+
+        eigenvalues, basis = np.linalg.eigh(self.cov)
+        inverse_sqrt = basis @ np.diag(1 / np.sqrt(np.maximum(eigenvalues, 1e-20))) @ basis.T
+        self.path_sigma = (1 - self.cs) * self.path_sigma + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * (inverse_sqrt @ step)
+        norm = np.linalg.norm(self.path_sigma) / math.sqrt(1 - (1 - self.cs) ** (2 * (self.generation + 1)))
+        stalled = norm / self.chi_n < 1.4 + 2 / (self.n + 1)
+        self.path_c = (1 - self.cc) * self.path_c + stalled * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * step
+
+        rank_one = np.outer(self.path_c, self.path_c) + (1 - stalled) * self.cc * (2 - self.cc) * self.cov
+        rank_mu = (steps.T * self.weights) @ steps
+        self.cov = (1 - self.c1 - self.cmu) * self.cov + self.c1 * rank_one + self.cmu * rank_mu
+        self.cov = (self.cov + self.cov.T) / 2
+        self.sigma *= math.exp((self.cs / self.damps) * (np.linalg.norm(self.path_sigma) / self.chi_n - 1))
+        self.generation += 1
+
+    def state(self):
+        return {
+            'mean': self.mean.tolist(),
+            'sigma': self.sigma,
+            'population': self.population,
+            'cov': self.cov.tolist(),
+            'path_sigma': self.path_sigma.tolist(),
+            'path_c': self.path_c.tolist(),
+            'generation': self.generation,
+            'rng': self.rng.bit_generator.state,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        es = cls(state['mean'], state['sigma'], state['population'])
+        es.cov = np.array(state['cov'])
+        es.path_sigma = np.array(state['path_sigma'])
+        es.path_c = np.array(state['path_c'])
+        es.generation = state['generation']
+        es.rng.bit_generator.state = state['rng']
+        return es
+
+
+class WeightTuner:
+    """CMA-ES over BehaviorParams, each candidate scored by its mean game_fitness over the same
+    seeds and layouts (common random numbers, so candidates differ only by their weights).
+
+    Games run on a process pool. After every generation the search state and the best weights
+    so far are written to disk; resume=True picks the search up from the checkpoint. Load the
+    best file at startup with main.py --weights.
+    """
+
+    def __init__(self, ai_type="smart_hunter", seeds=4, layouts=None, max_ticks=DEFAULT_MAX_TICKS, names=None, population=None, sigma=0.2,
+                 processes=None, output_dir=TUNING_OUTPUT_DIR, seed=0):
+        self.ai_type = ai_type
+        self.seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+        self.layouts = list(layouts) if layouts else list(MAZE_LAYOUTS.keys())
+        self.max_ticks = max_ticks
+        self.names = list(names) if names else list(PARAMETERS)
+        self.population = population
+        self.sigma = sigma
+        self.processes = processes or os.cpu_count() or 1
+        self.seed = seed
+        self.checkpoint_path = os.path.join(output_dir, f"{ai_type}_checkpoint.json")
+        self.best_path = os.path.join(output_dir, f"{ai_type}_best.json")
+
+        self.es = None
+        self.best_values = None
+        self.best_fitness = -float('inf')
+        self.baseline_fitness = None
+
+        for name in self.names:
+            if name not in PARAMETERS:
+                raise ValueError(f"Unknown behavior parameter: {name}")
+
+    def evaluate(self, candidates, pool=None):
+        """Mean fitness of each weights dict in candidates."""
+        jobs = [
+            (index, values, self.ai_type, layout_name, seed, self.max_ticks)
+            for index, values in enumerate(candidates) for layout_name in self.layouts for seed in self.seeds
+        ]
+        totals = [0.0] * len(candidates)
+        results = pool.imap_unordered(evaluate_game, jobs) if pool is not None else map(evaluate_game, jobs)
+        for candidate, fitness in results:
+            totals[candidate] += fitness
+        games = len(self.layouts) * len(self.seeds)
+        return [total / games for total in totals]
+
+    def run(self, generations, resume=False):
+        if resume and os.path.exists(self.checkpoint_path) and self.load_checkpoint():
+            print(f"Resuming {self.ai_type} tuning at generation {self.es.generation} (best {self.best_fitness:.1f})")
+        else:
+            self.es = CMAES(encode(BehaviorParams(), self.names), self.sigma, self.population, self.seed)
+
+        processes = max(1, min(self.processes, self.es.population))
+        games = len(self.layouts) * len(self.seeds)
+        print(f"Tuning {len(self.names)} weights for {self.ai_type}: population {self.es.population}, {games} games per candidate, {processes} processes")
+
+        pool = None
+        if processes > 1:
+            # Spawned workers start clean instead of inheriting the parent's pygame/SDL state
+            pool = multiprocessing.get_context("spawn").Pool(processes)
+        try:
+            if self.baseline_fitness is None:
+                defaults = BehaviorParams().to_dict()
+                self.baseline_fitness = self.evaluate([defaults], pool)[0]
+                self._consider(defaults, self.baseline_fitness)
+                print(f"Default weights: fitness {self.baseline_fitness:.1f}")
+
+            while self.es.generation < generations:
+                started = time.perf_counter()
+                points = self.es.ask()
+                candidates = [decode(point, self.names) for point in points]
+                fitnesses = self.evaluate(candidates, pool)
+                self.es.tell(np.array(fitnesses))
+                for values, fitness in zip(candidates, fitnesses):
+                    self._consider(values, fitness)
+                self.save_checkpoint()
+                print(
+                    f"Generation {self.es.generation}: best {max(fitnesses):.1f}, mean {np.mean(fitnesses):.1f}, "
+                    f"overall best {self.best_fitness:.1f} (defaults {self.baseline_fitness:.1f}), sigma {self.es.sigma:.3f}, "
+                    f"{time.perf_counter() - started:.1f}s"
+                )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        print(f"Best weights written to {self.best_path}")
+        return self.best_values, self.best_fitness
+
+    def _consider(self, values, fitness):
+        if fitness > self.best_fitness:
+            self.best_fitness = fitness
+            self.best_values = dict(values)
+            full = BehaviorParams(**values)
+            full.save(self.best_path, ai_type=self.ai_type, fitness=fitness, baseline_fitness=self.baseline_fitness, seeds=self.seeds, layouts=self.layouts)
+
+    def save_checkpoint(self):
+        state = {
+            'ai_type': self.ai_type,
+            'names': self.names,
+            'seeds': self.seeds,
+            'layouts': self.layouts,
+            'max_ticks': self.max_ticks,
+            'es': self.es.state(),
+            'best_values': self.best_values,
+            'best_fitness': self.best_fitness,
+            'baseline_fitness': self.baseline_fitness,
+        }
+        output_dir = os.path.dirname(self.checkpoint_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        # Write then rename, so a crash mid-write never leaves a torn checkpoint behind
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def load_checkpoint(self):
+        """Restore a saved search. Returns False when it tunes parameters that no longer exist."""
+        with open(self.checkpoint_path, 'r') as f:
+            state = json.load(f)
+        retired = [name for name in state['names'] if name not in PARAMETERS]
+        if retired:
+            print(f"Checkpoint {self.checkpoint_path} tunes retired parameters ({', '.join(retired)}); starting a new search")
+            return False
+        # The search only means something for the setup it was started with
+        self.names = state['names']
+        self.seeds = state['seeds']
+        self.layouts = state['layouts']
+        self.max_ticks = state['max_ticks']
+        self.es = CMAES.from_state(state['es'])
+        self.best_values = state['best_values']
+        self.best_fitness = state['best_fitness']
+        self.baseline_fitness = state['baseline_fitness']
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune behavior weights with CMA-ES over parallel headless games.")
+    parser.add_argument("--ai-type", default="smart_hunter", help="Behavior whose games score the weights")
+    parser.add_argument("--generations", type=int, default=20, help="Stop after this many generations in total")
+    parser.add_argument("--population", type=int, help="Candidates per generation (default: CMA-ES's 4 + 3 ln n)")
+    parser.add_argument("--sigma", type=float, default=0.2, help="Initial step size, as a fraction of each parameter's range")
+    parser.add_argument("--seeds", type=int, default=4, help="Seeds per layout each candidate plays")
+    parser.add_argument("--layouts", nargs="+", choices=list(MAZE_LAYOUTS.keys()), help="Maze layouts (default: all)")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="Ticks before a game is cut off")
+    parser.add_argument("--params", nargs="+", choices=list(PARAMETERS), help="Only tune these weights (default: all)")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output-dir", default=TUNING_OUTPUT_DIR, help="Where the checkpoint and best weights go")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint in --output-dir")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the CMA-ES sampler")
+    args = parser.parse_args()
+
+    tuner = WeightTuner(
+        ai_type=args.ai_type, seeds=args.seeds, layouts=args.layouts, max_ticks=args.max_ticks, names=args.params, population=args.population,
+        sigma=args.sigma, processes=args.processes, output_dir=args.output_dir, seed=args.seed,
+    )
+    tuner.run(args.generations, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
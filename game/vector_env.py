@@ -0,0 +1,582 @@
+import argparse
+import heapq
+import math
+import time
+from collections import deque
+import numpy as np
+from constants import *
+from maze_layout import MAZE_LAYOUTS
+
+# Direction codes used by every array in here: an index into DIRECTIONS, -1 for "no change"
+DIRECTION_NAMES = list(DIRECTIONS)
+REVERSE = np.array([DIRECTION_NAMES.index(name) for name in ("DOWN", "UP", "RIGHT", "LEFT")])
+# The three directions random_direction() picks from, per current direction
+NON_REVERSE = np.array([[d for d in range(len(DIRECTION_NAMES)) if d != REVERSE[current]] for current in range(len(DIRECTION_NAMES))])
+
+GHOST_MODES = ("CHASE", "SCATTER", "FRIGHTENED", "ENRAGED", "EATEN")
+CHASE, SCATTER, FRIGHTENED, ENRAGED, EATEN = range(len(GHOST_MODES))
+
+TURN_WINDOW = (0.1, 0.3)  # Player.update and AIPlayer._handle_movement accept a turn this early in a step
+PLAYER_SPEEDS = (PLAYER_SPEED, AI_SPEED)
+PELLET, POWER_PELLET = 1, 2
+PELLET_SCORES = np.array([0, PELLET_POINTS, POWER_PELLET_POINTS])
+UNREACHABLE = 1 << 20
+
+# Same numbers InkyGhost and PlayerBase use
+MODE_SWITCH_TICKS = 600
+PATH_RECALCULATION_INTERVAL = 30
+ENRAGED_SPEED_MULTIPLIER = 1.5
+ENRAGED_FOOD_PERCENT = 20
+INVINCIBILITY_DURATION = 180
+POWER_UP_DURATION = 1000
+START_HEALTH = 3
+
+
+class VectorSimulation:
+    """N independent matches on one maze layout, advanced together as NumPy arrays.
+
+    One step() mirrors SimulationCore.tick for every unfinished env: the players move with the
+    Player/AIPlayer movement rule, the ghost runs InkyGhost's mode timers, target choice and
+    move_towards_target, then collisions and win conditions. Both players are driven by the
+    caller: step() takes an (N, 2) array of direction codes, so any batched policy can play
+    either side.
+
+    Cells are flat indices into the maze padded with one ring of wall, so a neighbour lookup
+    never needs a bounds check. Everything is vectorized except the ghost's A*, which only runs
+    when an env's path runs out or goes stale and is cheap next to a tick of every env. Frightened
+    moves draw from self.rng, so a run is reproducible per seed but is not the same game as a
+    SimulationCore match with that seed; up to the first frightened move it is.
+    """
+
+    def __init__(self, num_envs, layout=None, positions=None, hide_player1=True, seed=None):
+        maze = MAZE_LAYOUTS['default']
+        self.layout = layout if layout is not None else maze['layout']
+        self.positions = positions if positions is not None else maze['positions']
+        self.num_envs = num_envs
+        self.hide_player1 = hide_player1
+
+        self.height = len(self.layout)
+        self.width = len(self.layout[0])
+        self.padded_width = self.width + 2
+        cell_count = (self.height + 2) * self.padded_width
+        self.cell_x = np.arange(cell_count) % self.padded_width - 1
+        self.cell_y = np.arange(cell_count) // self.padded_width - 1
+        self.offsets = np.array([dy * self.padded_width + dx for dx, dy in DIRECTIONS.values()])
+
+        self.walkable = np.zeros(cell_count, dtype=bool)
+        self.initial_pellets = np.zeros(cell_count, dtype=np.int8)
+        for y, row in enumerate(self.layout):
+            for x, value in enumerate(row):
+                if value != 3:  # Same wall test as MazeState.is_wall
+                    self.walkable[self.cell(x, y)] = True
+                if value in (PELLET, POWER_PELLET):
+                    self.initial_pellets[self.cell(x, y)] = value
+        self.total_food = int(np.count_nonzero(self.initial_pellets))
+        # Plain lists for the per-env A*, which is faster on Python ints than on array scalars
+        self._walkable = self.walkable.tolist()
+        self._coords = list(zip(self.cell_x.tolist(), self.cell_y.tolist()))
+        self._offsets = self.offsets.tolist()
+        self.distance = self._all_pairs_distance()
+
+        self.start_cells = np.array([self.cell(*self.positions['PLAYER1_START']), self.cell(*self.positions['PLAYER2_START'])])
+        self.ghost_start = self.cell(*self.positions['INKY_GHOST_START'])
+        self.respawn_cell = self.cell(*self.positions['GHOST_RESPAWN_POINT']['INKY'])
+        self.scatter_point = self.positions['INKY_GHOST_SCATTER_POINT']  # May lie outside the grid
+
+        n = num_envs
+        self.pellets = np.zeros((n, cell_count), dtype=np.int8)
+        self.food_left = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+
+        # Players, column 0 is player1 and column 1 the AI
+        self.player_cell = np.zeros((n, 2), dtype=np.int64)
+        self.player_direction = np.zeros((n, 2), dtype=np.int64)
+        self.player_next_direction = np.zeros((n, 2), dtype=np.int64)
+        self.movement_progress = np.zeros((n, 2))
+        self.score = np.zeros((n, 2), dtype=np.int64)
+        self.health = np.zeros((n, 2), dtype=np.int64)
+        self.power_timer = np.zeros((n, 2))
+        self.invincible = np.zeros((n, 2), dtype=bool)
+        self.invincibility_timer = np.zeros((n, 2))
+
+        self.ghost_cell = np.zeros(n, dtype=np.int64)
+        self.ghost_target = np.zeros(n, dtype=np.int64)
+        self.ghost_pixel_x = np.zeros(n)
+        self.ghost_pixel_y = np.zeros(n)
+        self.ghost_direction = np.zeros(n, dtype=np.int64)
+        self.ghost_next_direction = np.zeros(n, dtype=np.int64)
+        self.ghost_speed = np.zeros(n)
+        self.ghost_mode = np.zeros(n, dtype=np.int64)
+        self.ghost_mode_timer = np.zeros(n, dtype=np.int64)
+        self.ghost_dead = np.zeros(n, dtype=bool)
+        self.ghost_enraged = np.zeros(n, dtype=bool)
+        self.ghost_first_frightened = np.zeros(n, dtype=bool)
+        # InkyGhost.current_path: the cells, how many are left and where the next one is
+        self.ghost_path = np.zeros((n, cell_count), dtype=np.int64)
+        self.ghost_path_left = np.zeros(n, dtype=np.int64)
+        self.ghost_path_index = np.zeros(n, dtype=np.int64)
+        self.ghost_recalculation_timer = np.zeros(n, dtype=np.int64)
+
+        self.rng = np.random.default_rng()
+        self.seed = None
+        self.reset(seed)
+
+    def cell(self, x, y):
+        return (y + 1) * self.padded_width + (x + 1)
+
+    def _all_pairs_distance(self):
+        """BFS from every walkable cell; distance[a, b] is the number of steps, UNREACHABLE if none."""
+        cell_count = len(self.walkable)
+        distance = np.full((cell_count, cell_count), UNREACHABLE, dtype=np.int64)
+        for source in np.flatnonzero(self.walkable):
+            row = distance[source]
+            row[source] = 0
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for offset in self.offsets:
+                    neighbor = current + offset
+                    if self.walkable[neighbor] and row[neighbor] == UNREACHABLE:
+                        row[neighbor] = row[current] + 1
+                        queue.append(neighbor)
+        return distance
+
+    def reset(self, seed=None, env_ids=None):
+        """Start fresh matches in env_ids (default: all envs, which also reseeds self.rng)."""
+        if env_ids is None:
+            env_ids = np.arange(self.num_envs)
+            self.seed = seed
+            self.rng = np.random.default_rng(seed)
+        self.pellets[env_ids] = self.initial_pellets
+        self.food_left[env_ids] = self.total_food
+        self.ticks[env_ids] = 0
+        self.done[env_ids] = False
+
+        self.player_cell[env_ids] = self.start_cells
+        self.player_direction[env_ids] = DIRECTION_NAMES.index("RIGHT")
+        self.player_next_direction[env_ids] = DIRECTION_NAMES.index("RIGHT")
+        self.movement_progress[env_ids] = 0.0
+        self.score[env_ids] = 0
+        self.health[env_ids] = START_HEALTH
+        self.power_timer[env_ids] = 0.0
+        self.invincible[env_ids] = False
+        self.invincibility_timer[env_ids] = 0.0
+
+        self.ghost_cell[env_ids] = self.ghost_start
+        self.ghost_target[env_ids] = self.ghost_start
+        self.ghost_pixel_x[env_ids] = self.cell_x[self.ghost_start] * CELL_SIZE
+        self.ghost_pixel_y[env_ids] = self.cell_y[self.ghost_start] * CELL_SIZE
+        self.ghost_direction[env_ids] = DIRECTION_NAMES.index("LEFT")
+        self.ghost_next_direction[env_ids] = DIRECTION_NAMES.index("LEFT")
+        self.ghost_speed[env_ids] = GHOST_SPEED
+        self.ghost_mode[env_ids] = CHASE
+        self.ghost_mode_timer[env_ids] = 0
+        self.ghost_dead[env_ids] = False
+        self.ghost_enraged[env_ids] = False
+        self.ghost_first_frightened[env_ids] = True
+        self.ghost_path_left[env_ids] = 0
+        self.ghost_recalculation_timer[env_ids] = 0
+
+    def step(self, actions=None):
+        """Advance every unfinished env by one tick and return self.done.
+
+        actions is an (N, 2) array of direction codes for player1 and the AI; -1 (or None for
+        the whole batch) keeps each player's previous next_direction, like a released key.
+        """
+        if actions is not None:
+            actions = np.asarray(actions)
+            self.player_next_direction = np.where(actions >= 0, actions, self.player_next_direction)
+
+        active = ~self.done
+        for player in (0, 1):
+            if player == 0 and self.hide_player1:
+                continue
+            envs = np.flatnonzero(active & (self.health[:, player] > 0))
+            if len(envs):
+                self._update_player(player, envs)
+
+        self._update_ghost(active)
+        self._handle_collisions(active)
+
+        self.ticks[active] += 1
+        both_dead = (self.health <= 0).all(axis=1)
+        self.done |= active & ((self.food_left == 0) | both_dead)
+        return self.done
+
+    def _update_player(self, player, envs):
+        invincible = self.invincible[envs, player]
+        timer = self.invincibility_timer[envs, player] - invincible
+        ended = invincible & (timer <= 0)
+        self.invincibility_timer[envs, player] = np.where(ended, 0.0, timer)
+        self.invincible[envs, player] = invincible & ~ended
+        power = self.power_timer[envs, player]
+        self.power_timer[envs, player] = np.where(power > 0, power - 1, power)
+
+        cell = self.player_cell[envs, player]
+        progress = self.movement_progress[envs, player]
+        next_direction = self.player_next_direction[envs, player]
+        turn = (progress <= TURN_WINDOW[player]) & self.walkable[cell + self.offsets[next_direction]]
+        direction = np.where(turn, next_direction, self.player_direction[envs, player])
+
+        target = cell + self.offsets[direction]
+        open_ahead = self.walkable[target]
+        progress = np.where(open_ahead, progress + PLAYER_SPEEDS[player] / CELL_SIZE, 0.0)
+        arrived = open_ahead & (progress >= 1.0)
+        cell = np.where(arrived, target, cell)
+        progress[arrived] = 0.0
+
+        self.player_cell[envs, player] = cell
+        self.movement_progress[envs, player] = progress
+        self.player_direction[envs, player] = direction
+
+        eaters = envs[arrived]
+        cells = cell[arrived]
+        points = self.pellets[eaters, cells]
+        self.pellets[eaters, cells] = 0
+        self.food_left[eaters] -= points > 0
+        self.score[eaters, player] += PELLET_SCORES[points]
+        powered = eaters[points == POWER_PELLET]
+        self.invincible[powered, player] = True
+        self.invincibility_timer[powered, player] = INVINCIBILITY_DURATION
+        self.power_timer[powered, player] = POWER_UP_DURATION
+
+    def _update_ghost(self, active):
+        mode = self.ghost_mode
+        timer = self.ghost_mode_timer
+        powered = ((self.power_timer > 0) & (self.health > 0)).any(axis=1)
+        low_food = self.food_left / self.total_food * 100 <= ENRAGED_FOOD_PERCENT
+
+        frighten = active & (mode != EATEN) & (mode != FRIGHTENED) & powered
+        mode[frighten] = FRIGHTENED
+        self.ghost_first_frightened[frighten] = True
+        timer[frighten] = 0
+        self.ghost_path_left[frighten] = 0
+
+        calm = active & (mode == FRIGHTENED) & ~powered
+        mode[calm] = np.where(self.ghost_enraged[calm], ENRAGED, CHASE)
+        timer[calm] = 0
+        self.ghost_path_left[calm] = 0
+
+        revive = active & (mode == EATEN) & (self.ghost_cell == self.respawn_cell)
+        self.ghost_dead[revive] = False
+        mode[revive] = CHASE
+        timer[revive] = 0
+        self.ghost_enraged[revive] = False
+        revive_enraged = revive & low_food
+        self.ghost_enraged[revive_enraged] = True
+        mode[revive_enraged] = ENRAGED
+        self.ghost_path_left[revive_enraged] = 0
+
+        timed = active & ((mode == CHASE) | (mode == SCATTER))
+        timer[timed] += 1
+        switch = timed & (timer >= MODE_SWITCH_TICKS)
+        mode[switch] = np.where(mode[switch] == CHASE, SCATTER, CHASE)
+        timer[switch] = 0
+        self.ghost_path_left[switch] = 0
+
+        # Like InkyGhost.update this fires in any mode, EATEN included
+        rage = active & ~self.ghost_enraged & low_food
+        self.ghost_enraged[rage] = True
+        rage &= mode != ENRAGED
+        mode[rage] = ENRAGED
+        timer[rage] = 0
+        self.ghost_path_left[rage] = 0
+
+        aligned = active & (self.ghost_pixel_x % CELL_SIZE == 0) & (self.ghost_pixel_y % CELL_SIZE == 0)
+        envs = np.flatnonzero(aligned)
+        if len(envs):
+            self._choose_ghost_target(envs)
+        self._move_ghosts(np.flatnonzero(active))
+
+    def _choose_ghost_target(self, envs):
+        """InkyGhost.moving_algorithm for the ghosts sitting exactly on a cell."""
+        mode = self.ghost_mode[envs]
+        self.ghost_speed[envs] = np.where(mode == ENRAGED, GHOST_SPEED * ENRAGED_SPEED_MULTIPLIER, GHOST_SPEED)
+
+        # Closest living player by straight-line distance, player1 winning ties
+        cell = self.ghost_cell[envs]
+        players = self.player_cell[envs]
+        gap = np.hypot(self.cell_x[players] - self.cell_x[cell][:, None], self.cell_y[players] - self.cell_y[cell][:, None])
+        gap[self.health[envs] <= 0] = np.inf
+        closest = players[np.arange(len(envs)), gap.argmin(axis=1)]
+        anyone_alive = np.isfinite(gap).any(axis=1)
+
+        chasing = ((mode == CHASE) | (mode == ENRAGED)) & anyone_alive
+        eaten = mode == EATEN
+        pathing = chasing | eaten
+        if pathing.any():
+            goals = np.where(eaten, self.respawn_cell, closest)
+            self._follow_path(envs[pathing], goals[pathing])
+
+        scatter = envs[mode == SCATTER]
+        if len(scatter):
+            self._choose_greedy_direction(scatter)
+        frightened = envs[mode == FRIGHTENED]
+        if len(frightened):
+            self._choose_frightened_direction(frightened)
+
+        # Everything without an A* target steps in next_direction when it can
+        free = envs[~pathing]
+        if len(free):
+            cell = self.ghost_cell[free]
+            next_direction = self.ghost_next_direction[free]
+            target = cell + self.offsets[next_direction]
+            open_ahead = self.walkable[target]
+            self.ghost_direction[free] = np.where(open_ahead, next_direction, self.ghost_direction[free])
+            self.ghost_target[free] = np.where(open_ahead, target, cell)
+
+    def _follow_path(self, envs, goals):
+        self.ghost_recalculation_timer[envs] += 1
+        recalculate = (self.ghost_path_left[envs] == 0) | (self.ghost_recalculation_timer[envs] >= PATH_RECALCULATION_INTERVAL)
+        for env, goal in zip(envs[recalculate].tolist(), goals[recalculate].tolist()):
+            path = self._a_star(self.ghost_cell[env], goal, self.ghost_direction[env])
+            self.ghost_path[env, :len(path)] = path
+            self.ghost_path_left[env] = len(path)
+            self.ghost_path_index[env] = 0
+            self.ghost_recalculation_timer[env] = 0
+
+        cell = self.ghost_cell[envs]
+        waypoint = self.ghost_path[envs, self.ghost_path_index[envs]]
+        has_path = self.ghost_path_left[envs] > 0
+
+        # The ghost spends one tick at each waypoint it reaches before popping it off the path
+        reached = envs[has_path & (waypoint == cell)]
+        self.ghost_next_direction[reached] = self.ghost_direction[reached]
+        self.ghost_target[reached] = self.ghost_cell[reached]
+        self.ghost_path_left[reached] -= 1
+        self.ghost_path_index[reached] += 1
+
+        heading = has_path & (waypoint != cell)
+        moving = envs[heading]
+        offset = waypoint[heading] - cell[heading]
+        self.ghost_next_direction[moving] = (offset[:, None] == self.offsets).argmax(axis=1)
+        self.ghost_target[moving] = waypoint[heading]
+
+    def _a_star(self, start, goal, direction):
+        """InkyGhost.a_star_pathfind on flat cells, keeping its (f, (x, y)) heap order so ties break the same way."""
+        walkable = self._walkable
+        coords = self._coords
+        goal_x, goal_y = coords[goal]
+        reverse = REVERSE[direction]
+        can_go_forward = any(walkable[start + offset] for d, offset in enumerate(self._offsets) if d != reverse)
+        open_set = [(0, coords[start], start)]
+        came_from = {}
+        g_score = {start: 0}
+        while open_set:
+            current = heapq.heappop(open_set)[2]
+            if current == goal:
+                path = []
+                while current in came_from:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            for d, offset in enumerate(self._offsets):
+                neighbor = current + offset
+                if not walkable[neighbor]:
+                    continue
+                if current == start and d == reverse and can_go_forward:
+                    continue
+                tentative_g_score = g_score[current] + 1
+                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    x, y = coords[neighbor]
+                    heapq.heappush(open_set, (tentative_g_score + math.sqrt((x - goal_x) ** 2 + (y - goal_y) ** 2), (x, y), neighbor))
+        return []
+
+    def _choose_greedy_direction(self, envs):
+        cell = self.ghost_cell[envs]
+        direction = self.ghost_direction[envs]
+        neighbors = cell[:, None] + self.offsets
+        reverse = REVERSE[direction]
+        forward = self.walkable[neighbors] & (np.arange(len(DIRECTION_NAMES)) != reverse[:, None])
+        scatter_x, scatter_y = self.scatter_point
+        gap = np.where(forward, np.hypot(self.cell_x[neighbors] - scatter_x, self.cell_y[neighbors] - scatter_y), np.inf)
+        dead_end = np.where(self.walkable[cell + self.offsets[reverse]], reverse, direction)
+        new_direction = np.where(forward.any(axis=1), gap.argmin(axis=1), dead_end)
+        self.ghost_next_direction[envs] = np.where(new_direction != direction, new_direction, self.ghost_next_direction[envs])
+
+    def _choose_frightened_direction(self, envs):
+        first = self.ghost_first_frightened[envs]
+        direction = self.ghost_direction[envs]
+        cell = self.ghost_cell[envs]
+
+        # First frightened tick: turn around, or take any open direction if the way back is a wall
+        turning = envs[first]
+        if len(turning):
+            reverse = REVERSE[direction[first]]
+            open_ = self.walkable[cell[first][:, None] + self.offsets]
+            pick = np.where(open_, self.rng.random(open_.shape), -1.0).argmax(axis=1)
+            fallback = np.where(open_.any(axis=1), pick, self.ghost_next_direction[turning])
+            self.ghost_next_direction[turning] = np.where(open_[np.arange(len(turning)), reverse], reverse, fallback)
+            self.ghost_first_frightened[turning] = False
+
+        wandering = envs[~first]
+        if len(wandering):
+            current = direction[~first]
+            choice = NON_REVERSE[current, self.rng.integers(0, NON_REVERSE.shape[1], len(wandering))]
+            new_direction = np.where(self.walkable[cell[~first] + self.offsets[choice]], choice, current)
+            self.ghost_next_direction[wandering] = np.where(new_direction != current, new_direction, self.ghost_next_direction[wandering])
+
+    def _move_ghosts(self, envs):
+        """InkyGhost.move_towards_target: slide towards the target cell, snapping within a pixel."""
+        target = self.ghost_target[envs]
+        target_x = self.cell_x[target] * CELL_SIZE
+        target_y = self.cell_y[target] * CELL_SIZE
+        pixel_x = self.ghost_pixel_x[envs]
+        pixel_y = self.ghost_pixel_y[envs]
+        dx = target_x - pixel_x
+        dy = target_y - pixel_y
+        dist = np.hypot(dx, dy)
+        move = np.minimum(self.ghost_speed[envs], dist)
+        safe_dist = np.where(dist == 0, 1.0, dist)
+        pixel_x = pixel_x + move * dx / safe_dist
+        pixel_y = pixel_y + move * dy / safe_dist
+        arrived = (np.abs(pixel_x - target_x) < 1) & (np.abs(pixel_y - target_y) < 1)
+        self.ghost_pixel_x[envs] = np.where(arrived, target_x, pixel_x)
+        self.ghost_pixel_y[envs] = np.where(arrived, target_y, pixel_y)
+        self.ghost_cell[envs] = np.where(arrived, target, self.ghost_cell[envs])
+
+    def _handle_collisions(self, active):
+        # Every player is checked against the ghost as it was before anyone caught it
+        alive = self.health > 0
+        hit = (active & ~self.ghost_dead)[:, None] & alive & (self.player_cell == self.ghost_cell[:, None])
+        caught = hit & (self.power_timer > 0)
+        self.score += 200 * caught
+        killed = caught.any(axis=1)
+        self.ghost_dead[killed] = True
+        self.ghost_mode[killed] = EATEN
+
+        damaged = hit & ~caught & ~self.invincible
+        self.health -= damaged
+        protected = damaged & (self.health > 0)
+        self.invincible[protected] = True
+        self.invincibility_timer[protected] = INVINCIBILITY_DURATION
+
+    def get_winners(self):
+        """SimulationCore.get_winner for every env, as a list of strings (None while undecided)."""
+        winners = []
+        for (health1, health2), (score1, score2), food in zip(self.health, self.score, self.food_left):
+            if health1 <= 0 and health2 <= 0:
+                winners.append("both_dead")
+            elif health1 <= 0:
+                winners.append("player2")
+            elif health2 <= 0:
+                winners.append("player1")
+            elif food == 0:
+                winners.append("player1" if score1 > score2 else "player2" if score1 < score2 else "draw")
+            else:
+                winners.append(None)
+        return winners
+
+    def get_results(self):
+        """SimulationCore.get_result for every env."""
+        return [
+            {
+                'winner': winner,
+                'ticks': int(self.ticks[env]),
+                'player1_score': int(self.score[env, 0]),
+                'player2_score': int(self.score[env, 1]),
+                'player1_health': int(self.health[env, 0]),
+                'player2_health': int(self.health[env, 1]),
+                'pellets_left': int(self.food_left[env]),
+            }
+            for env, winner in enumerate(self.get_winners())
+        ]
+
+
+def random_policy(sim, player):
+    """A random direction per env, redrawn every tick."""
+    return sim.rng.integers(0, len(DIRECTION_NAMES), sim.num_envs)
+
+
+def greedy_pellet_policy(sim, player):
+    """Head for the nearest pellet by maze distance, avoiding cells next to a live, unfrightened ghost.
+
+    Only players standing on a cell choose; everyone mid-step keeps their direction (-1).
+    """
+    actions = np.full(sim.num_envs, -1, dtype=np.int64)
+    envs = np.flatnonzero((sim.movement_progress[:, player] == 0) & ~sim.done)
+    cell = sim.player_cell[envs, player]
+    pellet_distance = np.where(sim.pellets[envs] > 0, sim.distance[cell], UNREACHABLE)
+    goal = pellet_distance.argmin(axis=1)
+    neighbors = cell[:, None] + sim.offsets
+    steps = np.where(sim.walkable[neighbors], sim.distance[neighbors, goal[:, None]], UNREACHABLE)
+    threatening = ~sim.ghost_dead[envs] & (sim.ghost_mode[envs] != FRIGHTENED) & (sim.power_timer[envs, player] <= 0)
+    near_ghost = sim.distance[neighbors, sim.ghost_cell[envs, None]] < 2
+    steps = steps + np.where(threatening[:, None] & near_ghost, UNREACHABLE // 2, 0)
+    actions[envs] = np.where(pellet_distance.min(axis=1) < UNREACHABLE, steps.argmin(axis=1), -1)
+    return actions
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_pellet_policy,
+}
+
+
+def run_vector_benchmark(num_envs=256, ticks=2000, layout_name="default", seed=0, policy="greedy"):
+    """Step num_envs matches for `ticks` ticks, restarting finished ones, and return env-steps per second."""
+    maze = MAZE_LAYOUTS[layout_name]
+    sim = VectorSimulation(num_envs, layout=maze['layout'], positions=maze['positions'], hide_player1=False, seed=seed)
+    choose = POLICIES[policy]
+    actions = np.empty((num_envs, 2), dtype=np.int64)
+    env_steps = 0
+    finished = 0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        actions[:, 0] = choose(sim, 0)
+        actions[:, 1] = choose(sim, 1)
+        env_steps += int(np.count_nonzero(~sim.done))
+        done = sim.step(actions)
+        if done.any():
+            finished += int(np.count_nonzero(done))
+            sim.reset(env_ids=np.flatnonzero(done))
+    elapsed = time.perf_counter() - started
+    return {
+        'envs': num_envs,
+        'ticks': ticks,
+        'env_steps': env_steps,
+        'games_finished': finished,
+        'seconds': elapsed,
+        'env_steps_per_second': env_steps / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_scalar_benchmark(ticks=2000, layout_name="default", seed=0, ai_type="reflex_agent"):
+    """Ticks per second of one SimulationCore match with the built-in AI, for comparison."""
+    from game.simulation import SimulationCore
+
+    maze = MAZE_LAYOUTS[layout_name]
+    sim = SimulationCore.create_headless(ai_type=ai_type, layout=maze['layout'], positions=maze['positions'], seed=seed)
+    done = 0
+    started = time.perf_counter()
+    while done < ticks:
+        result = sim.run(max_ticks=ticks - done)
+        done += result['ticks']
+        sim.reset(seed=seed + done)
+    elapsed = time.perf_counter() - started
+    return ticks / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step many headless matches at once with NumPy and report env-steps per second.")
+    parser.add_argument("--envs", type=int, default=256, help="Number of matches stepped together")
+    parser.add_argument("--ticks", type=int, default=2000, help="Ticks to run")
+    parser.add_argument("--layout", choices=list(MAZE_LAYOUTS.keys()), default="default", help="Maze layout")
+    parser.add_argument("--policy", choices=list(POLICIES), default="greedy", help="Batched policy for both players")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the ghosts and random policy")
+    parser.add_argument("--compare", action="store_true", help="Also time one SimulationCore match with the built-in AI")
+    args = parser.parse_args()
+
+    stats = run_vector_benchmark(args.envs, args.ticks, args.layout, args.seed, args.policy)
+    print(f"{stats['envs']} envs x {stats['ticks']} ticks: {stats['env_steps']} env-steps in {stats['seconds']:.2f}s "
+          f"= {stats['env_steps_per_second']:.0f} env-steps/s ({stats['games_finished']} games finished)")
+    if args.compare:
+        scalar = run_scalar_benchmark(args.ticks, args.layout, args.seed)
+        print(f"SimulationCore: {scalar:.0f} ticks/s ({stats['env_steps_per_second'] / scalar:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import pygame
 import sys
 import os
+import threading
+import time
+from datetime import datetime
+import argparse
+import random
 
 # Game components
 from constants import *
@@ -9,22 +14,47 @@ from core.maze import Maze
 from core.intro import CinematicIntro
 from ui.game_ui import GameUI
 from core.music import OneShotMusicManager
+from core.debug_layers import get_debug_font
+from core.frame_profiler import FrameProfiler
+from core.profile_capture import ProfileCapture
+from core.trace_recorder import tracer
+from core.memory_tracker import MemoryTracker
 from maze_layout import POSITIONS, MAZE_INFO  # Import position definitions
-from entities.ai.algorithm_switcher import AlgorithmSwitcher, AIBenchmark
+from entities.ai.algorithm_switcher import AlgorithmSwitcher, AIBenchmark, BenchmarkResultSink, BENCHMARK_OUTPUT_DIR
 
 # Entities
 from entities.player import Player
 from entities.ai.ai_player import AIPlayer
+from entities.ai.behavior_params import load_default_params
+from entities.ai.behaviors.mcts import MCTSBehavior
+from entities.ai.behaviors.q_learning import set_table_dir
 from entities.ghosts.inky_ghost import InkyGhost
 
 # Game handler
 from game.game_state import GameState, GameStateManager
 from game.input_handler import InputHandler
 from game.collision_system import CollisionSystem
+from game.simulation import SimulationCore
+from game.benchmark_runner import BenchmarkSweep, GameBenchmarkRecorder
+from game.replay import InputRecorder
 
 
 class PacmanGame:
-    def __init__(self, music_file=None, volume=0.5, font_path=None):
+    def __init__(
+        self,
+        music_file=None,
+        volume=0.5,
+        font_path=None,
+        memory_diagnostics=False,
+        memory_interval=5.0,
+        seed=None,
+        fast_forward=1,
+        render_every=10,
+        benchmark_games=0,
+        max_game_ticks=20000,
+        ai_only=False,
+        record_replays=False,
+    ):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Aria Quest: Space Union")
@@ -38,14 +68,12 @@ class PacmanGame:
         # Initialize components
         self.sprite_manager = SpriteManager()
         self.sprite_manager.auto_load_from_assets()
-        self.maze = Maze()
+        # The background gets its own generator so its stars never shift the simulation's random draws
+        self.maze = Maze(self.sprite_manager, rng=random.Random(seed))
         self.ui = GameUI(font_path=font_path)
         self.music = self._initialize_music(music_file, volume)
         self.intro = CinematicIntro(SCREEN_WIDTH, SCREEN_HEIGHT)
 
-        self.hide_player1 = False  # Hide player 1 during intro
-        self.hide_all_ghosts = False  # Hide all ghosts during intro
-
         # Initialize algorithm switcher
         self.algorithm_switcher = AlgorithmSwitcher()
 
@@ -59,6 +87,30 @@ class PacmanGame:
 
         self.four_corners_completed_time = 0  # Track time for Four Corners completion
 
+        # Fixed-timestep loop: entities are drawn render_alpha of the way from the previous tick to the latest
+        self.render_alpha = 1.0
+
+        # Fast-forward: 1 is real time, N > 1 runs N times faster, 0 runs uncapped. While fast-forwarding
+        # only every render_every-th frame is drawn (0: none) and every game becomes an AIBenchmark record.
+        self.fast_forward = 1
+        self.render_every = render_every
+        self.frame_count = 0
+        self.game_benchmark = None
+        # With benchmark_games, finished games restart on their own and the game quits after the last one
+        self.benchmark_games_left = benchmark_games
+        self.max_game_ticks = max_game_ticks
+
+        # Per-stage frame timings, recorded and drawn while debug mode is on
+        self.profiler = FrameProfiler()
+        # F12: cProfile the next few seconds of play into profiles/
+        self.profile_capture = ProfileCapture(frames=FPS * 5)
+        # Span tracing stays on in a ring buffer; T writes the last spans out as a Chrome trace
+        tracer.enabled = True
+        # tracemalloc snapshots at startup, game start/restart and every memory_interval minutes
+        self.memory_tracker = MemoryTracker(interval_minutes=memory_interval)
+        if memory_diagnostics:
+            self.memory_tracker.start()
+
         self.benchmark_runner = AIBenchmark()
         self.benchmark_mode = False  # Flag to control if we are in benchmark mode
         self.benchmark_algorithms_to_test = []  # List of algorithms to test
@@ -68,6 +120,37 @@ class PacmanGame:
         # Initialize players
         self._initialize_players()
 
+        # Game rules run in the pygame-free simulation core; this class only handles input, audio and rendering
+        self.simulation = SimulationCore(
+            self.maze, self.player1, self.player2, self.inky_ghost, self.state_manager, self.collision_system, positions=POSITIONS, profiler=self.profiler, seed=seed
+        )
+        # With record_replays, every game is recorded (seed + one byte of input per tick) to replays/ for headless replay
+        self.record_replays = record_replays
+        self.input_recorder = InputRecorder()
+        self.simulation.add_observer(self.input_recorder)
+        self._set_fast_forward(fast_forward)
+        self.hide_player1 = ai_only  # Hide player 1 during intro
+        self.hide_all_ghosts = False  # Hide all ghosts during intro
+
+        if benchmark_games:
+            self._start_game()
+
+    @property
+    def hide_player1(self):
+        return self.simulation.hide_player1
+
+    @hide_player1.setter
+    def hide_player1(self, value):
+        self.simulation.hide_player1 = value
+
+    @property
+    def hide_all_ghosts(self):
+        return self.simulation.hide_all_ghosts
+
+    @hide_all_ghosts.setter
+    def hide_all_ghosts(self, value):
+        self.simulation.hide_all_ghosts = value
+
     def test_ghost_flee_behavior(self):
         print("=== Testing Ghost Flee Behavior ===")
 
@@ -187,7 +270,7 @@ class PacmanGame:
         if not self.debug_mode:
             return
 
-        font = pygame.font.Font(None, 24)
+        font = get_debug_font(24)
 
         # Position in top-right corner
         info_x = SCREEN_WIDTH - 250
@@ -215,7 +298,7 @@ class PacmanGame:
         y_offset += 25
 
         # Controls
-        small_font = pygame.font.Font(None, 18)
+        small_font = get_debug_font(18)
         controls = ["F9: Next Algo", "F10: Prev Algo", "F11: Benchmark"]
         for control in controls:
             text = small_font.render(control, True, (150, 150, 150))
@@ -231,8 +314,8 @@ class PacmanGame:
         # ...existing debug info code...
 
         # Add algorithm switching instructions
-        font = pygame.font.Font(None, 24)
-        debug_panel_height = 200  # Increase height for new info
+        font = get_debug_font(24)
+        debug_panel_height = 230  # Increase height for new info
         debug_panel_width = 350
         debug_x = 10
         debug_y = SCREEN_HEIGHT - self.ui.bottom_bar.bar_height - debug_panel_height - 10
@@ -256,7 +339,7 @@ class PacmanGame:
         # ...existing player and ghost status...
 
         # Extended instructions
-        small_font = pygame.font.Font(None, 18)
+        small_font = get_debug_font(18)
         instructions = [
             "F1: Test Ghost Flee",
             "F2: Test Ghost Hunt",
@@ -267,7 +350,9 @@ class PacmanGame:
             "F9: Next Algorithm",
             "F10: Prev Algorithm",
             "F11: Run Benchmark",
-            "F12: Save Results",
+            "F12: Profile 5 Seconds",
+            "T: Export Trace",
+            "G: Fast Forward",
         ]
 
         for instruction in instructions:
@@ -346,8 +431,10 @@ class PacmanGame:
             # Algorithm switching
             "next_algorithm": self._next_algorithm,
             "prev_algorithm": self._prev_algorithm,
-            "run_benchmark": lambda: print("Benchmark not implemented yet"),
-            "save_results": lambda: print("Save results not implemented yet"),
+            "run_benchmark": self._run_benchmark,
+            "profile_capture": self.profile_capture.start,
+            "export_trace": tracer.export,
+            "fast_forward": self._cycle_fast_forward,
         }
 
         # Use input handler to process all events
@@ -359,6 +446,7 @@ class PacmanGame:
 
     def _power_player2(self):
         self.player2.power_timer = 300
+        self.input_recorder.record_event(self.simulation, "power_player2", 300)
         print("Player 2 powered up!")
 
     def _reset_positions(self):
@@ -377,19 +465,23 @@ class PacmanGame:
 
     def _toggle_debug(self):
         self.debug_mode = not self.debug_mode
+        self.profiler.set_enabled(self.debug_mode)
         print(f"Debug mode: {'ON' if self.debug_mode else 'OFF'}")
 
     def _toggle_hide_player1(self):
         self.hide_player1 = not self.hide_player1
+        self.input_recorder.record_event(self.simulation, "hide_player1", self.hide_player1)
         print(f"Hide Player 1: {'ON' if self.hide_player1 else 'OFF'}")
 
     def _toggle_hide_ghosts(self):
         self.hide_all_ghosts = not self.hide_all_ghosts
+        self.input_recorder.record_event(self.simulation, "hide_all_ghosts", self.hide_all_ghosts)
         print(f"Hide All Ghosts: {'ON' if self.hide_all_ghosts else 'OFF'}")
 
     def _next_algorithm(self):
         new_algorithm = self.algorithm_switcher.next_algorithm()
         self.player2.change_algorithm(new_algorithm)
+        self.input_recorder.record_event(self.simulation, "algorithm", new_algorithm)
         if new_algorithm == "four_corner_problem":
             print("Starting Four Corners mode!")
             self.player2.ai_state.four_corners_start_time = pygame.time.get_ticks()
@@ -398,14 +490,67 @@ class PacmanGame:
     def _prev_algorithm(self):
         new_algorithm = self.algorithm_switcher.previous_algorithm()
         self.player2.change_algorithm(new_algorithm)
+        self.input_recorder.record_event(self.simulation, "algorithm", new_algorithm)
         if new_algorithm == "four_corner_problem":
             print("Starting Four Corners mode!")
             self.player2.ai_state.four_corners_start_time = pygame.time.get_ticks()
         print(f"Switched to: {new_algorithm}")
 
+    def _run_benchmark(self):
+        if self.benchmark_mode:
+            print("Benchmark already running")
+            return
+        self.benchmark_mode = True
+        sweep = BenchmarkSweep(benchmark=self.benchmark_runner)
+        # The sweep fans out to worker processes; this thread only waits on them so the window stays responsive
+        threading.Thread(target=self._run_benchmark_sweep, args=(sweep,), daemon=True).start()
+
+    def _run_benchmark_sweep(self, sweep):
+        try:
+            sweep.run()
+            self.benchmark_runner.summarize_results()
+            self.benchmark_runner.export_summary(sweep.summary_basename())
+        finally:
+            self.benchmark_mode = False
+
+    def _cycle_fast_forward(self):
+        levels = FAST_FORWARD_LEVELS
+        index = levels.index(self.fast_forward) if self.fast_forward in levels else 0
+        self._set_fast_forward(levels[(index + 1) % len(levels)])
+
+    def _set_fast_forward(self, level):
+        self.fast_forward = level
+        if level != 1 and self.game_benchmark is None:
+            path = os.path.join(BENCHMARK_OUTPUT_DIR, f"fast_forward_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            self.game_benchmark = GameBenchmarkRecorder(self.benchmark_runner, sink=BenchmarkResultSink(path, flush_every=1))
+            self.simulation.add_observer(self.game_benchmark)
+        elif level == 1 and self.game_benchmark is not None:
+            self._stop_game_benchmark()
+        print(f"Fast-forward: {'off' if level == 1 else 'uncapped' if level == 0 else f'{level}x'}")
+
+    def _stop_game_benchmark(self):
+        # A game that was only partly fast-forwarded would skew the numbers, so it is dropped
+        self.game_benchmark.discard()
+        self.simulation.remove_observer(self.game_benchmark)
+        self.game_benchmark.sink.close()
+        if self.game_benchmark.completed:
+            self.benchmark_runner.summarize_results(self.game_benchmark.sink.path)
+            print(f"Fast-forward results in {self.game_benchmark.sink.path}")
+        self.game_benchmark = None
+
+    def _next_benchmark_game(self):
+        self.benchmark_games_left -= 1
+        if self.benchmark_games_left > 0:
+            self.restart_game()
+        else:
+            self.running = False
+
     def _start_game(self):
         self.state_manager.change_state(GameState.PLAYING)
+        if self.record_replays and self.simulation.tick_count == 0 and not self.input_recorder.is_recording():
+            self.input_recorder.start(self.simulation)
         self._start_music()
+        self.memory_tracker.snapshot("game_start")
 
     def _toggle_pause(self):
         if self.state_manager.is_state(GameState.PLAYING):
@@ -447,41 +592,22 @@ class PacmanGame:
                 self.inky_ghost.can_chase = False
             return
 
-        # Update players
-        players = [self.player1, self.player2]
-        for player in players:
-            if not player.is_dead():
-                if player == self.player1 and not self.hide_player1:
-                    player.update(self.maze)
-                elif player == self.player2:
-                    human_pos = self.player1.get_position() if not self.player1.is_dead() else None
-                    ghost_pos = [self.inky_ghost.get_position()] if not self.inky_ghost.is_dead() else []
-                    player.update(self.maze, human_pos, ghost_pos)
-
-        # Update Inky Ghost
-        alive_positions = [p.get_position() if not p.is_dead() else None for p in players]
-        player_power_status = [p.is_powered_up() if not p.is_dead() else False for p in players]
-        if not self.hide_all_ghosts:
-            self.inky_ghost.update(self.maze, alive_positions, player_power_status)
-
-        # Handle collisions
-        collision_results = self.collision_system.check_ghost_collisions(players, self.inky_ghost)
-        self.collision_system.handle_collision_results(collision_results)
-
-        # Check win conditions
-        self._check_win_conditions()
-
-    def _check_win_conditions(self):
-        if self.maze.all_pellets_collected():
-            self.state_manager.change_state(GameState.GAME_OVER)
-            return
-
-        if self.player1.is_dead() and self.player2.is_dead():
-            print("Both players died! Game Over!")
-            self.state_manager.change_state(GameState.GAME_OVER)
-            return
+        started = tracer.begin()
+        self.simulation.tick()
+        if started:
+            tracer.end("update", started, "game", {'tick': self.simulation.tick_count})
 
-    def _render_gameplay(self):
+        if self.benchmark_games_left:
+            if self.state_manager.is_state(GameState.GAME_OVER):
+                self._next_benchmark_game()
+            elif self.simulation.tick_count >= self.max_game_ticks:
+                # Stalemate: record it as it stands instead of waiting forever
+                if self.game_benchmark is not None:
+                    self.game_benchmark.finish(self.simulation)
+                self.input_recorder.stop(self.simulation)
+                self._next_benchmark_game()
+
+    def _render_gameplay(self, alpha=1.0):
         # Get game area for maze rendering
         game_area = self.ui.get_game_area()
 
@@ -500,6 +626,8 @@ class PacmanGame:
         maze_x = (game_area['width'] - scaled_width) // 2
         maze_y = (game_area['height'] - scaled_height) // 2
 
+        profiler = self.profiler
+
         # Create a surface for the entire game area
         game_surface = pygame.Surface((game_area['width'], game_area['height']))
         game_surface.fill(BLACK)  # Fill with black background
@@ -508,19 +636,28 @@ class PacmanGame:
         maze_surface = pygame.Surface((maze_width, maze_height))
 
         # Render maze on the maze surface
-        self.maze.render(maze_surface)
+        started = profiler.begin()
+        self.maze.render_background(maze_surface)
+        profiler.end("background", started)
+
+        started = profiler.begin()
+        self.maze.render_layout(maze_surface)
+        profiler.end("maze", started)
 
         # Render players on the maze surface
+        started = profiler.begin()
         if not self.player1.is_dead() and not self.hide_player1:
-            self.player1.render(maze_surface, self.debug_mode)
+            self.player1.render(maze_surface, self.debug_mode, alpha)
         if not self.player2.is_dead():
-            self.player2.render(maze_surface, self.debug_mode)
+            self.player2.render(maze_surface, self.debug_mode, alpha)
 
         # Render ghost on the maze surface
         if not self.hide_all_ghosts:
-            self.inky_ghost.render(maze_surface, self.maze, self.debug_mode)
+            self.inky_ghost.render(maze_surface, self.maze, self.debug_mode, alpha)
+        profiler.end("entities", started)
 
         # Scale and center the maze surface if needed
+        started = profiler.begin()
         if scale < 1.0:
             scaled_maze_surface = pygame.transform.scale(maze_surface, (scaled_width, scaled_height))
             game_surface.blit(scaled_maze_surface, (maze_x, maze_y))
@@ -529,6 +666,7 @@ class PacmanGame:
 
         # Blit game surface to main screen at the correct position
         self.screen.blit(game_surface, (game_area['x'], game_area['y']))
+        profiler.end("compose", started)
 
         if self.player2.ai_state.is_through_four_corners:
             font = pygame.font.Font(None, 24)
@@ -542,9 +680,11 @@ class PacmanGame:
             self.screen.blit(text_surface, text_rect)
 
         # FIXED: Always render UI bars for gameplay
+        started = profiler.begin()
         self.ui.render_gameplay_ui(self.screen, self.player1, self.player2, self.maze, "PLAYING")
+        profiler.end("ui", started)
 
-    def render(self):
+    def render(self, alpha=1.0):
         self.screen.fill(BLACK)
 
         if self.state_manager.current_state in [GameState.PLAYING, GameState.PAUSED]:
@@ -556,7 +696,7 @@ class PacmanGame:
             self.ui.bottom_bar.render(self.screen, "START")
 
         elif self.state_manager.current_state in [GameState.PLAYING, GameState.PAUSED]:
-            self._render_gameplay()
+            self._render_gameplay(alpha)
 
             # Add debug info rendering
             self.render_debug_info(self.screen)
@@ -567,13 +707,26 @@ class PacmanGame:
                 self.ui.bottom_bar.render(self.screen, "PAUSED")
 
         elif self.state_manager.is_state(GameState.GAME_OVER):
-            self._render_gameplay()
+            self._render_gameplay(alpha)
             winner = self._determine_winner()
             self.ui.render_game_over(self.screen, winner, self.player1.score, self.player2.score)
             # FIXED: Show bottom bar in game over state
             self.ui.bottom_bar.render(self.screen, "GAME_OVER")
 
+        self.render_profiler_overlay(self.screen)
+
+        started = self.profiler.begin()
         pygame.display.flip()
+        self.profiler.end("flip", started)
+
+    def render_profiler_overlay(self, screen):
+        if not self.profiler.enabled:
+            return
+        # Right-hand side, under the algorithm info panel
+        width, height = 240, 90
+        x = SCREEN_WIDTH - width - 10
+        y = 120
+        self.profiler.draw(screen, x, y, width, height)
 
     def _determine_winner(self):
         if self.player1.is_dead() and self.player2.is_dead():
@@ -595,38 +748,13 @@ class PacmanGame:
         self.music.stop()
         self.music_started = False
 
-        self.maze = Maze()
-
-        # Use defined positions for restart
-        player1_pos = POSITIONS['PLAYER1_START']
-        player2_pos = POSITIONS['PLAYER2_START']
-        ghost_pos = POSITIONS['INKY_GHOST_START']
-
-        # Reset Player 1
-        self.player1.reset_position(player1_pos[0], player1_pos[1])
-        self.player1.score = 0
-        self.player1.health = 3
-        self.player1.is_invincible = False
-        self.player1.invincibility_timer = 0
-        self.player1.invincibility_blink_timer = 0
-
-        # Reset Player 2
-        self.player2.reset_position(player2_pos[0], player2_pos[1])
-        self.player2.score = 0
-        self.player2.health = 3
-        self.player2.is_invincible = False
-        self.player2.invincibility_timer = 0
-        self.player2.invincibility_blink_timer = 0
-
-        # Reset Ghost
-        self.inky_ghost.reset_position(ghost_pos[0], ghost_pos[1])
-        self.inky_ghost.can_chase = True
-        total_food = len(self.maze.pellets) + len(self.maze.power_pellets)
-        self.inky_ghost.set_total_food_count(total_food)
-
-        self.state_manager.change_state(GameState.PLAYING)
+        self.input_recorder.stop(self.simulation)
+        self.simulation.reset()
+        if self.record_replays:
+            self.input_recorder.start(self.simulation)
         self.game_over_timer = 0
         self._start_music()
+        self.memory_tracker.snapshot("restart")
 
     def run(self):
         # -- Intro scene --
@@ -642,19 +770,102 @@ class PacmanGame:
             pygame.display.flip()
             intro_done = self.intro.is_complete()
 
+        sim_dt = 1.0 / SIM_TICK_RATE
+        accumulator = 0.0
         while self.running:
+            uncapped = self.fast_forward == 0 and self.state_manager.is_state(GameState.PLAYING)
+            # Clamp so one long stall doesn't queue up seconds of catch-up ticks
+            frame_time = min((self.clock.tick() if uncapped else self.clock.tick(FPS)) / 1000, MAX_FRAME_TIME)
+            started = self.profiler.begin()
+            trace_started = tracer.begin()
             self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
+            tracer.end("handle_events", trace_started)
+            self.profiler.end("events", started)
+
+            if uncapped:
+                # Tick flat out for a slice, then come back up for events (and maybe a frame)
+                deadline = time.perf_counter() + FAST_FORWARD_SLICE
+                while self.running and self.fast_forward == 0 and time.perf_counter() < deadline:
+                    self.update()
+                accumulator = 0.0
+                self.render_alpha = 1.0
+            else:
+                accumulator += frame_time * self.fast_forward
+                while accumulator >= sim_dt:
+                    self.update()
+                    accumulator -= sim_dt
+                # update() skips the simulation while paused or over, so there is nothing to blend towards
+                self.render_alpha = accumulator / sim_dt if self.state_manager.is_state(GameState.PLAYING) else 1.0
+
+            self.frame_count += 1
+            if self.fast_forward == 1 or (self.render_every and self.frame_count % self.render_every == 0):
+                trace_started = tracer.begin()
+                self.render(self.render_alpha)
+                tracer.end("render", trace_started)
+            self.profiler.end_frame()
+            self.profile_capture.end_frame()
+            self.memory_tracker.maybe_snapshot()
 
         self.music.stop()
+        self.input_recorder.stop(self.simulation)
+        if self.game_benchmark is not None:
+            self._stop_game_benchmark()
+        self.memory_tracker.stop()
         pygame.quit()
         sys.exit()
 
 
+def _fast_forward_level(value):
+    """argparse type for --fast-forward: a positive multiplier, or 'max' (0) for uncapped."""
+    if value == "max":
+        return 0
+    try:
+        level = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive whole number or 'max', got {value!r}")
+    if level < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive whole number or 'max', got {value!r}")
+    return level
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aria Quest: Space Union")
+    parser.add_argument("--memory-diagnostics", action="store_true", help="Report tracemalloc growth at startup, game start/restart and periodically")
+    parser.add_argument("--memory-interval", type=float, default=5.0, help="Minutes between periodic memory snapshots")
+    parser.add_argument("--seed", type=int, help="Seed for the first game (later restarts pick new seeds)")
+    parser.add_argument("--fast-forward", type=_fast_forward_level, default=1, help="Speed multiplier, or 'max' for uncapped ticks (also G in game)")
+    parser.add_argument("--render-every", type=int, default=10, help="While fast-forwarding, draw one frame in N (0: never)")
+    parser.add_argument("--ai-only", action="store_true", help="Hide player 1 so the AI plays the ghost alone")
+    parser.add_argument("--games", type=int, default=0, help="Play this many games back to back, recording each as a benchmark run, then quit")
+    parser.add_argument("--max-game-ticks", type=int, default=20000, help="With --games, end a game that runs this long")
+    parser.add_argument("--record", action="store_true", help="Record every game to replays/ for python -m game.replay")
+    parser.add_argument(
+        "--mcts-think-ms", type=float, default=0, help="Give MCTS this much wall-clock time per decision instead of a fixed simulation count (games stop replaying exactly)"
+    )
+    parser.add_argument("--weights", help="Behavior weights JSON to use instead of the defaults (e.g. from python -m game.tuning)")
+    parser.add_argument("--q-table-dir", help="Load q_learning tables from here instead of qtables/ (see python -m game.q_training --table-dir)")
+    args = parser.parse_args()
+    if args.weights:
+        load_default_params(args.weights)
+    if args.mcts_think_ms > 0:
+        MCTSBehavior.default_time_budget_ms = args.mcts_think_ms
+    if args.q_table_dir:
+        set_table_dir(args.q_table_dir)
+
     music_file = os.path.join("music", "Control_wishes.mp3")
     font_path = os.path.join("fonts", "pixelFont-7-8x14-sproutLands.ttf")
-    game = PacmanGame(music_file=music_file, volume=0.5, font_path=font_path)
+    game = PacmanGame(
+        music_file=music_file,
+        volume=0.5,
+        font_path=font_path,
+        memory_diagnostics=args.memory_diagnostics,
+        memory_interval=args.memory_interval,
+        seed=args.seed,
+        fast_forward=args.fast_forward,
+        render_every=args.render_every,
+        benchmark_games=args.games,
+        max_game_ticks=args.max_game_ticks,
+        ai_only=args.ai_only,
+        record_replays=args.record,
+    )
     game.run()
@@ -43,3 +43,30 @@ MAZE_INFO = {
     'total_size': (760, 440),  # width * cell_size, height * cell_size
     'description': 'Compact layout for 800x600 screen with 40px cells',
 }
+
+# Left-right and top-bottom reflections of MAZE_LAYOUT, used by the batch benchmark
+MIRRORED_MAZE_LAYOUT = [list(reversed(row)) for row in MAZE_LAYOUT]
+FLIPPED_MAZE_LAYOUT = [list(row) for row in reversed(MAZE_LAYOUT)]
+
+MIRRORED_POSITIONS = {
+    'PLAYER1_START': (16, 1),
+    'PLAYER2_START': (1, 9),
+    'INKY_GHOST_START': (8, 5),
+    'INKY_GHOST_SCATTER_POINT': (-1, 5),  # Left side of the maze
+    'GHOST_RESPAWN_POINT': {'INKY': (8, 5)},
+}
+
+FLIPPED_POSITIONS = {
+    'PLAYER1_START': (1, 9),
+    'PLAYER2_START': (16, 1),
+    'INKY_GHOST_START': (9, 5),
+    'INKY_GHOST_SCATTER_POINT': (18, 5),
+    'GHOST_RESPAWN_POINT': {'INKY': (9, 5)},
+}
+
+# Named layouts with their entity positions
+MAZE_LAYOUTS = {
+    'default': {'layout': MAZE_LAYOUT, 'positions': POSITIONS},
+    'mirrored': {'layout': MIRRORED_MAZE_LAYOUT, 'positions': MIRRORED_POSITIONS},
+    'flipped': {'layout': FLIPPED_MAZE_LAYOUT, 'positions': FLIPPED_POSITIONS},
+}
@@ -0,0 +1,11 @@
+"""pygame, or None where it isn't installed.
+
+The headless simulation (game/simulation.py) and the tools built on it - benchmarks, training,
+replays, the gym environment - share the entity and constants modules with the windowed game.
+Those modules import pygame from here and only touch it on drawing and input paths, so they
+still load on machines without pygame.
+"""
+try:
+    import pygame
+except ImportError:
+    pygame = None
@@ -0,0 +1,11 @@
+from entities.ai.benchmark_stats import BENCHMARK_METRICS
+from game.benchmark_runner import run_benchmark_game
+
+
+def test_nodes_expanded_counts_the_whole_game():
+    short = run_benchmark_game(("simple_astar", "default", 0, 300))
+    long = run_benchmark_game(("simple_astar", "default", 0, 5000))
+    nodes = BENCHMARK_METRICS['nodes_expanded']
+    assert 0 < nodes(short) < nodes(long)
+    # Far more than any single search on a 19x11 maze could expand
+    assert nodes(long) > 19 * 11
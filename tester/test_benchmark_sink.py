@@ -0,0 +1,29 @@
+import json
+from entities.ai.algorithm_switcher import BenchmarkResultSink, iter_results
+
+
+def test_sink_recovers_from_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with BenchmarkResultSink(path, flush_every=2) as sink:
+        for seed in range(3):
+            sink.append({'algorithm': "simple_bfs", 'seed': seed})
+
+    # A crash mid-write leaves the last line without its end or newline
+    with open(path, 'a') as f:
+        f.write('{"algorithm": "simple_bfs", "se')
+
+    with BenchmarkResultSink(path, flush_every=1) as sink:
+        sink.append({'algorithm': "simple_bfs", 'seed': 3})
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert json.loads(lines[-1]) == {'algorithm': "simple_bfs", 'seed': 3}
+    assert [record['seed'] for record in iter_results(path)] == [0, 1, 2, 3]
+
+
+def test_sink_flushes_pending_records_on_close(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    sink = BenchmarkResultSink(path, flush_every=50)
+    sink.append({'seed': 1})
+    sink.close()
+    assert [record['seed'] for record in iter_results(path)] == [1]
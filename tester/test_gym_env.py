@@ -0,0 +1,48 @@
+import numpy as np
+from game.gym_env import ACTIONS, PLAYER1, PLAYER2, GHOST, PELLETS, POWER_PELLETS, WALLS, PacmanEnv
+
+
+def grid_from_sim(sim):
+    """The observation grid rebuilt from scratch, to check the in-place updates against."""
+    maze = sim.maze
+    grid = np.zeros((6, maze.height, maze.width), dtype=np.uint8)
+    for y in range(maze.height):
+        for x in range(maze.width):
+            grid[WALLS, y, x] = maze.is_wall(x, y)
+    for x, y in maze.pellets:
+        grid[PELLETS, y, x] = 1
+    for x, y in maze.power_pellets:
+        grid[POWER_PELLETS, y, x] = 1
+    for channel, entity in ((PLAYER1, sim.player1), (PLAYER2, sim.player2)):
+        if not entity.is_dead():
+            grid[channel, entity.grid_y, entity.grid_x] = 1
+    grid[GHOST, sim.inky_ghost.grid_y, sim.inky_ghost.grid_x] = 1
+    return grid
+
+
+def test_observation_tracks_the_simulation():
+    env = PacmanEnv(ticks_per_step=4, max_ticks=2000)
+    observation, info = env.reset(seed=1)
+    np.testing.assert_array_equal(observation['grid'], grid_from_sim(env.sim))
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        observation, reward, terminated, truncated, info = env.step(int(rng.integers(len(ACTIONS))))
+        np.testing.assert_array_equal(observation['grid'], grid_from_sim(env.sim))
+        assert observation['state'][0] == env.sim.player1.health
+        assert observation['state'][1] == env.sim.player2.health
+        if terminated or truncated:
+            assert info['result'] is not None
+            break
+
+
+def test_reset_with_a_seed_repeats_the_episode():
+    env = PacmanEnv(ticks_per_step=4)
+    episodes = []
+    for _ in range(2):
+        env.reset(seed=7)
+        rewards = [env.step(step % len(ACTIONS))[1] for step in range(150)]
+        episodes.append((rewards, env.observation['grid'].copy(), env.observation['state'].copy()))
+    assert episodes[0][0] == episodes[1][0]
+    np.testing.assert_array_equal(episodes[0][1], episodes[1][1])
+    np.testing.assert_array_equal(episodes[0][2], episodes[1][2])
@@ -0,0 +1,9 @@
+from entities.ai.pathfinding_benchmark import benchmark_pathfinding
+
+
+def test_every_algorithm_runs_on_the_default_maze():
+    results = benchmark_pathfinding(repetitions=1, warmup=0)
+    assert results
+    for algorithm, samples in results.items():
+        assert len(samples['time_ns']) == 1, algorithm
+        assert samples['nodes_expanded'][0] > 0, algorithm
@@ -0,0 +1,31 @@
+import random
+from constants import DIRECTIONS
+from game.replay import InputRecorder, load_replay, replay, state_digest
+from game.simulation import SimulationCore
+
+TICKS = 600
+
+
+def play(sim, ticks, input_seed=5):
+    """Tick with player 1 steered by a seeded random walk, so its input matters too."""
+    rng = random.Random(input_seed)
+    for tick in range(ticks):
+        direction = rng.choice(list(DIRECTIONS)) if tick % 7 == 0 else None
+        if not sim.tick(direction):
+            break
+
+
+def test_replay_reaches_the_recorded_digest(tmp_path):
+    sim = SimulationCore.create_headless(ai_type="reflex_agent", hide_player1=False, seed=9)
+    recorder = InputRecorder(output_dir=str(tmp_path))
+    sim.add_observer(recorder)
+    recorder.start(sim)
+    play(sim, TICKS)
+    recorder.record_event(sim, "algorithm", "smart_hunter")
+    sim.player2.change_algorithm("smart_hunter")
+    play(sim, TICKS, input_seed=6)
+    path = recorder.stop(sim) if recorder.is_recording() else recorder.last_path
+
+    recording = load_replay(path)
+    assert recording['digest'] == state_digest(sim)
+    assert state_digest(replay(recording)) == recording['digest']
@@ -0,0 +1,33 @@
+import random
+import pytest
+from constants import DIRECTIONS
+from game.simulation import SimulationCore
+from game.state_trace import FIELD_NAMES, STATE_FIELDS, StateTraceReader, StateTraceWriter
+
+
+def test_state_trace_round_trip(tmp_path):
+    sim = SimulationCore.create_headless(ai_type="reflex_agent", hide_player1=False, seed=3)
+    path = str(tmp_path / "game.trace")
+    writer = StateTraceWriter(path, sim, keyframe_interval=16)
+    sim.add_observer(writer)
+
+    # Record 0 is the state before the first tick, record N the state after tick N
+    expected = {0: (tuple(getter(sim) for _, _, getter in STATE_FIELDS), sorted(sim.maze.pellets | sim.maze.power_pellets))}
+    rng = random.Random(5)
+    for tick in range(1, 300):
+        direction = rng.choice(list(DIRECTIONS)) if tick % 7 == 0 else None
+        if not sim.tick(direction):
+            break
+        expected[sim.tick_count] = (tuple(getter(sim) for _, _, getter in STATE_FIELDS), sorted(sim.maze.pellets | sim.maze.power_pellets))
+    writer.close()
+
+    with StateTraceReader(path) as reader:
+        assert len(reader) == len(expected)
+        for tick in (0, 1, 15, 16, 17, 100, len(expected) - 1):
+            state = reader.state_at(tick)
+            values, pellets = expected[tick]
+            for name, value in zip(FIELD_NAMES, values):
+                assert state[name] == pytest.approx(value), (tick, name)
+            assert sorted(state['pellets']) == pellets
+        with pytest.raises(IndexError):
+            reader.state_at(len(expected))